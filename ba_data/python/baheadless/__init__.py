@@ -0,0 +1,212 @@
+# Released under the MIT License. See LICENSE for details.
+#
+"""Runs game logic without the engine.
+
+Provides pure python stand-ins for the native _babase and _bascenev1
+modules, so activities, actors and characters can be created and
+ticked on a plain python install (a CI box, a profiler) as fast as
+python allows. Time only moves when advance() is called.
+
+Usage::
+
+    import baheadless
+    baheadless.install()  # Before anything imports babase.
+
+    import bascenev1 as bs
+    from bascenev1lib.actor.spaz import Spaz
+
+    activity = baheadless.new_activity(bs.Activity)
+    with activity.context:
+        spaz = Spaz()
+    baheadless.advance(10.0)
+    print(baheadless.counters)
+
+Or run a script with it: ``python -m baheadless script.py``.
+"""
+
+from __future__ import annotations
+
+import sys
+import importlib.abc
+import importlib.util
+from typing import TYPE_CHECKING
+
+from baheadless._engine import counters, clock, pop_context
+
+if TYPE_CHECKING:
+    from typing import Any, Sequence
+
+# Native module name -> our stand-in's module (or None for a module
+# that's nothing but stubs).
+_STAND_INS: dict[str, str | None] = {
+    '_babase': 'baheadless._babase',
+    '_bascenev1': 'baheadless._bascenev1',
+    '_baplus': 'baheadless._baplus',
+    '_baclassic': None,
+    '_bauiv1': None,
+    '_batemplatefs': None,
+}
+
+
+class _StandInFinder(importlib.abc.MetaPathFinder, importlib.abc.Loader):
+    """Serves our stand-ins under the native modules' names."""
+
+    def find_spec(
+        self, fullname: str, path: Sequence[str] | None, target: Any = None
+    ) -> Any:
+        """Claim the native modules we stand in for."""
+        del path, target
+        if fullname not in _STAND_INS:
+            return None
+        source = _STAND_INS[fullname]
+        if source is not None:
+            spec = importlib.util.find_spec(source)
+            assert spec is not None and spec.origin is not None
+            return importlib.util.spec_from_file_location(
+                fullname, spec.origin
+            )
+        return importlib.util.spec_from_loader(fullname, self)
+
+    def create_module(self, spec: Any) -> None:
+        """Use the default module creation."""
+        del spec
+
+    def exec_module(self, module: Any) -> None:
+        """Fill a stubs-only module."""
+        from baheadless._engine import make_module_getattr
+
+        module.__getattr__ = make_module_getattr(module.__name__)
+
+
+_finder: _StandInFinder | None = None
+
+
+def install() -> None:
+    """Serve the headless stand-ins in place of the native modules.
+
+    Must be called before babase or anything using it gets imported.
+    Does nothing if already installed.
+    """
+    global _finder  # pylint: disable=global-statement
+    if _finder is not None:
+        return
+    if '_babase' in sys.modules:
+        raise RuntimeError('The native modules are already imported.')
+    _finder = _StandInFinder()
+    sys.meta_path.insert(0, _finder)
+
+
+def is_installed() -> bool:
+    """Whether the headless stand-ins are in use."""
+    return _finder is not None
+
+
+def advance(seconds: float, step: float | None = None) -> int:
+    """Move the clock forward, firing every timer that comes due.
+
+    With a ``step``, time moves in increments of that size, like frames
+    would. Returns the amount of timer calls made.
+    """
+    if step is None:
+        return clock.advance(seconds)
+    fired = 0
+    remaining = seconds
+    while remaining > 1e-9:
+        chunk = min(step, remaining)
+        fired += clock.advance(chunk)
+        remaining -= chunk
+    return fired
+
+
+def now() -> float:
+    """Return the current (virtual) app time."""
+    return clock.now
+
+
+def reset_counters() -> None:
+    """Zero every counter."""
+    counters.clear()
+
+
+_launched = False
+
+
+def launch() -> None:
+    """Do the parts of app launch game logic relies on.
+
+    Registers the builtin spaz appearances and gives launch-time app
+    timers (mods setting up their rosters and such) a second to run.
+    Called by new_activity(); safe to call more than once.
+    """
+    global _launched  # pylint: disable=global-statement
+    if _launched:
+        return
+    _launched = True
+    from bascenev1lib.actor import spazappearance
+
+    spazappearance.register_appearances()
+    clock.advance(1.0)
+
+
+class HeadlessSession:
+    """The bare minimum of a bascenev1.Session activities run in."""
+
+    def __init__(self) -> None:
+        import bascenev1 as bs
+        import _bascenev1
+
+        self.sessionteams: list = []
+        self.sessionplayers: list = []
+        self.stats = bs.Stats()
+        self.use_teams = False
+        self.use_team_colors = False
+        self.tournament_id = None
+        self.campaign = None
+        # Registering switches to our context; switch back when done.
+        self._sessiondata = _bascenev1.register_session(self)
+        try:
+            self.sessionglobalsnode = _bascenev1.newnode('sessionglobals')
+        finally:
+            pop_context()
+
+    @property
+    def context(self) -> Any:
+        """A context-ref pointing at this session."""
+        return self._sessiondata.context()
+
+    def end_activity(self, *args: Any, **kwargs: Any) -> None:
+        """Activities ending themselves is a no-op headless."""
+        del args, kwargs
+
+    def transitioning_out_activity_was_freed(self, *args: Any) -> None:
+        """Nothing to do headless."""
+        del args
+
+    def handlemessage(self, msg: Any) -> Any:
+        """Sessions don't handle anything headless."""
+        del msg
+
+
+def new_activity(
+    activity_type: type,
+    settings: dict | None = None,
+    session: HeadlessSession | None = None,
+) -> Any:
+    """Create an activity and bring it to the point where it's running.
+
+    A HeadlessSession is made for it unless one is passed. Keep a
+    reference to the returned activity for as long as it should live.
+    """
+    import _bascenev1
+
+    launch()
+    if session is None:
+        session = HeadlessSession()
+    with session.context:
+        activity = _bascenev1.newactivity(activity_type, settings)
+    # Activities only hold their session weakly.
+    activity._headless_session_ref = session
+    with activity.context:
+        activity.transition_in(None)
+        activity.begin(session)
+    return activity
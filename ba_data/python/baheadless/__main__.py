@@ -0,0 +1,29 @@
+# Released under the MIT License. See LICENSE for details.
+#
+"""Run a python script (or command) with the headless stand-ins installed."""
+
+from __future__ import annotations
+
+import sys
+import runpy
+
+import baheadless
+
+
+def main() -> None:
+    """Run the script given on the command line."""
+    if len(sys.argv) < 2 or (sys.argv[1] == '-c' and len(sys.argv) < 3):
+        print('usage: python -m baheadless (script.py | -c command) [args...]')
+        raise SystemExit(2)
+    baheadless.install()
+    if sys.argv[1] == '-c':
+        command = sys.argv[2]
+        sys.argv = ['-c'] + sys.argv[3:]
+        exec(compile(command, '<string>', 'exec'), {'__name__': '__main__'})
+        return
+    sys.argv = sys.argv[1:]
+    runpy.run_path(sys.argv[0], run_name='__main__')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,463 @@
+# Released under the MIT License. See LICENSE for details.
+#
+"""Headless stand-in for the native _babase module.
+
+Gets imported under the name '_babase' by baheadless.install(); names
+not implemented here resolve to do-nothing stubs.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import json
+import math
+from typing import TYPE_CHECKING
+
+from baheadless import _engine
+from baheadless._engine import (
+    clock,
+    counters,
+    current_context,
+    push_context,
+    pop_context,
+)
+
+if TYPE_CHECKING:
+    from typing import Any, Callable, Sequence
+
+__getattr__ = _engine.make_module_getattr('_babase')
+
+# Set by babase when it's done importing.
+app: Any = None
+
+
+class Vec3:
+    """A 3 component vector."""
+
+    __slots__ = ('x', 'y', 'z')
+
+    def __init__(self, *args: Any) -> None:
+        if len(args) == 1:
+            if isinstance(args[0], (int, float)):
+                args = (args[0],) * 3
+            else:
+                args = tuple(args[0])
+        if len(args) == 0:
+            args = (0.0, 0.0, 0.0)
+        if len(args) != 3:
+            raise TypeError('Vec3 takes 0, 1 or 3 values.')
+        self.x, self.y, self.z = (float(a) for a in args)
+
+    def __len__(self) -> int:
+        return 3
+
+    def __iter__(self) -> Any:
+        return iter((self.x, self.y, self.z))
+
+    def __getitem__(self, index: Any) -> Any:
+        return (self.x, self.y, self.z)[index]
+
+    def __setitem__(self, index: int, value: float) -> None:
+        setattr(self, ('x', 'y', 'z')[index], float(value))
+
+    def __repr__(self) -> str:
+        return f'Vec3({self.x}, {self.y}, {self.z})'
+
+    def __eq__(self, other: object) -> bool:
+        try:
+            return tuple(self) == tuple(other)  # type: ignore
+        except TypeError:
+            return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash((self.x, self.y, self.z))
+
+    def __add__(self, other: Any) -> Vec3:
+        return Vec3(self.x + other[0], self.y + other[1], self.z + other[2])
+
+    __radd__ = __add__
+
+    def __sub__(self, other: Any) -> Vec3:
+        return Vec3(self.x - other[0], self.y - other[1], self.z - other[2])
+
+    def __rsub__(self, other: Any) -> Vec3:
+        return Vec3(other[0] - self.x, other[1] - self.y, other[2] - self.z)
+
+    def __mul__(self, other: Any) -> Vec3:
+        if isinstance(other, (int, float)):
+            return Vec3(self.x * other, self.y * other, self.z * other)
+        return Vec3(self.x * other[0], self.y * other[1], self.z * other[2])
+
+    __rmul__ = __mul__
+
+    def __neg__(self) -> Vec3:
+        return Vec3(-self.x, -self.y, -self.z)
+
+    def length(self) -> float:
+        """Return the length of the vector."""
+        return math.sqrt(self.x * self.x + self.y * self.y + self.z * self.z)
+
+    def normalized(self) -> Vec3:
+        """Return a normalized version of the vector."""
+        length = self.length()
+        if length == 0.0:
+            return Vec3(0.0, 0.0, 0.0)
+        return self * (1.0 / length)
+
+    def dot(self, other: Sequence[float]) -> float:
+        """Return the dot product with another vector."""
+        return self.x * other[0] + self.y * other[1] + self.z * other[2]
+
+    def cross(self, other: Sequence[float]) -> Vec3:
+        """Return the cross product with another vector."""
+        return Vec3(
+            self.y * other[2] - self.z * other[1],
+            self.z * other[0] - self.x * other[2],
+            self.x * other[1] - self.y * other[0],
+        )
+
+
+class ContextRef:
+    """Points at the context engine calls run in."""
+
+    def __init__(self) -> None:
+        self._context = current_context()
+
+    @classmethod
+    def empty(cls) -> ContextRef:
+        """Return a ContextRef pointing at no context."""
+        ref = cls.__new__(cls)
+        ref._context = _engine.EMPTY_CONTEXT
+        return ref
+
+    def is_empty(self) -> bool:
+        """Whether we point at no context."""
+        return self._context is _engine.EMPTY_CONTEXT
+
+    def is_expired(self) -> bool:
+        """Whether the thing we point at has died."""
+        return self._context.expired
+
+    def __enter__(self) -> ContextRef:
+        push_context(self._context)
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        pop_context()
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ContextRef):
+            return NotImplemented
+        return (
+            self._context.activity is other._context.activity
+            and self._context.session is other._context.session
+        )
+
+    def __hash__(self) -> int:
+        return id(self._context)
+
+
+class ContextCall:
+    """Wraps a call to run in the context it was created in."""
+
+    def __init__(self, call: Callable) -> None:
+        self._call = call
+        self._context = current_context()
+
+    def __call__(self, *args: Any) -> Any:
+        if self._context.expired:
+            return None
+        push_context(self._context)
+        try:
+            return self._call(*args)
+        finally:
+            pop_context()
+
+
+class Env:
+    """Unchanging values for the current running app instance."""
+
+    def __init__(self) -> None:
+        root = os.path.dirname(
+            os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        )
+        home = os.path.join(os.path.expanduser('~'), '.ballisticakit-headless')
+        self.android = False
+        self.api_version = 8
+        self.arcade = False
+        self.build_number = 0
+        self.config_file_path = os.path.join(home, 'config.json')
+        self.data_directory = os.path.dirname(root)
+        self.debug = False
+        self.demo = False
+        self.device_name = 'headless'
+        self.engine_build_number = 0
+        self.engine_version = '0.0.0'
+        self.gui = False
+        self.headless = True
+        self.python_directory_app = root
+        self.python_directory_app_site = None
+        self.python_directory_user = None
+        self.supports_soft_quit = False
+        self.test = True
+        self.tv = False
+        self.version = '0.0.0'
+        self.vr = False
+        self.cache_directory = home
+        self.config_directory = home
+        self.python_directory_user_site = None
+
+
+def env() -> dict:
+    """Return the legacy environment dict."""
+    environ = dict(vars(Env()))
+    environ.setdefault('locale', 'en_US')
+    environ.setdefault('platform', sys.platform)
+    environ.setdefault('subplatform', '')
+    return environ
+
+
+def pre_env() -> dict:
+    """Return the early-boot environment dict."""
+    return env()
+
+
+def apptime() -> float:
+    """Return the current app time in seconds."""
+    return clock.now
+
+
+def apptimer(time: float, call: Callable[[], Any]) -> None:
+    """Schedule a call to run after some app time."""
+    clock.schedule(time, call, scene=False)
+
+
+class AppTimer(_engine.TimerBase):
+    """Timer running on app time."""
+
+    def __init__(
+        self, time: float, call: Callable[[], Any], repeat: bool = False
+    ) -> None:
+        super().__init__(time, call, repeat, scene=False)
+
+
+displaytime = apptime
+displaytimer = apptimer
+DisplayTimer = AppTimer
+
+
+def pushcall(
+    call: Callable,
+    from_other_thread: bool = False,
+    suppress_other_thread_warning: bool = False,
+    other_thread_use_fg_context: bool = False,
+    raw: bool = False,
+) -> None:
+    """Push a call to run 'soon'; that is, next time the clock moves."""
+    del from_other_thread, suppress_other_thread_warning
+    del other_thread_use_fg_context, raw
+    clock.schedule(0.0, call, scene=False)
+
+
+def in_logic_thread() -> bool:
+    """Whether we're in the logic thread (headless is all logic thread)."""
+    return True
+
+
+def app_is_active() -> bool:
+    """Whether the app is front and center."""
+    return True
+
+
+def appname() -> str:
+    """Return the app's name."""
+    return 'BallisticaKit'
+
+
+def appnameupper() -> str:
+    """Return the app's name in caps."""
+    return 'BALLISTICAKIT'
+
+
+def safecolor(
+    color: Sequence[float], target_intensity: float = 0.6
+) -> tuple[float, ...]:
+    """Return a color that's visible enough against the background."""
+    color = tuple(color)
+    intensity = sum(color[:3]) / 3.0 or 0.0001
+    if intensity < target_intensity:
+        scale = target_intensity / intensity
+        color = tuple(min(c * scale, 1.0) for c in color[:3]) + color[3:]
+    return color
+
+
+def screenmessage(
+    message: Any,
+    color: Sequence[float] | None = None,
+    log: bool = False,
+) -> None:
+    """Count (and optionally print) an on-screen message."""
+    del color
+    counters['screenmessage'] += 1
+    if log:
+        print(evaluate_lstr(message) if not isinstance(message, str) else message)
+
+
+def evaluate_lstr(value: str) -> str:
+    """Turn a Lstr's json into plain text (just its value or key)."""
+    try:
+        data = json.loads(value)
+    except (TypeError, ValueError):
+        return str(value)
+
+    def _flatten(entry: Any) -> str:
+        if isinstance(entry, str):
+            return entry
+        text = entry.get('v') or entry.get('r') or entry.get('t', [''])[-1]
+        for key, sub in entry.get('s', ()):
+            text = text.replace(key, _flatten(sub))
+        return str(text)
+
+    return _flatten(data)
+
+
+_done_once: set[Any] = set()
+
+
+def do_once() -> bool:
+    """Return True the first time it's called from a given location."""
+    frame = sys._getframe(1)  # pylint: disable=protected-access
+    key = (frame.f_code.co_filename, frame.f_lineno)
+    if key in _done_once:
+        return False
+    _done_once.add(key)
+    return True
+
+
+class SimpleSound:
+    """A sound that isn't tied to a scene."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def play(self) -> None:
+        """Play the sound (count it)."""
+        counters['sound'] += 1
+
+
+def getsimplesound(name: str) -> SimpleSound:
+    """Return a simple sound by name."""
+    return SimpleSound(name)
+
+
+def charstr(char_id: Any) -> str:
+    """Return a unicode string for a special char."""
+    del char_id
+    return ''
+
+
+def get_string_width(string: str, suppress_warning: bool = False) -> float:
+    """Return a rough width for a string."""
+    del suppress_warning
+    return len(string) * 20.0
+
+
+def get_string_height(string: str, suppress_warning: bool = False) -> float:
+    """Return a rough height for a string."""
+    del suppress_warning
+    return (string.count('\n') + 1) * 20.0
+
+
+def shutdown_suppress_count() -> int:
+    """Return the amount of active shutdown suppressions."""
+    return 0
+
+
+def exec_arg() -> str | None:
+    """Return the -exec argument passed to the app."""
+    return None
+
+
+def lifecyclelog(message: str) -> None:
+    """Log a lifecycle event (nowhere)."""
+    del message
+
+
+def workspaces_in_use() -> bool:
+    """Whether workspaces are in use."""
+    return False
+
+
+def has_user_run_commands() -> bool:
+    """Whether the user has run commands."""
+    return False
+
+
+def get_volatile_data_directory() -> str:
+    """Return a directory for throwaway data."""
+    return Env().cache_directory
+
+
+def get_appconfig_builtin_keys() -> list[str]:
+    """Return the app config keys the engine knows about."""
+    return []
+
+
+def resolve_appconfig_value(key: str) -> Any:
+    """Return the app config value for a key."""
+    del key
+    return None
+
+
+def get_appconfig_default_value(key: str) -> Any:
+    """Return the default app config value for a key."""
+    del key
+    return None
+
+
+def user_agent_string() -> str:
+    """Return the user agent string."""
+    return 'BallisticaKit headless'
+
+
+def can_display_full_unicode() -> bool:
+    """Whether full unicode can be displayed."""
+    return True
+
+
+def print_context() -> None:
+    """Print info about the current context."""
+    print(current_context())
+
+
+def reached_end_of_babase() -> None:
+    """Called by babase once it's done importing."""
+
+
+def setup_sigint() -> None:
+    """Set up ctrl-c handling (we leave python's as is)."""
+
+
+def is_log_full() -> bool:
+    """Whether the log is full."""
+    return False
+
+
+def emit_log(name: str, level: str, timestamp: float, message: str) -> None:
+    """Send a log message to the engine (nowhere)."""
+    del name, level, timestamp, message
+
+
+def asset_loads_allowed() -> bool:
+    """Whether assets can be loaded right now."""
+    return True
+
+
+def hastouchscreen() -> bool:
+    """Whether there's a touchscreen."""
+    return False
+
+
+
+_REACHED_END_OF_MODULE = True
@@ -0,0 +1,36 @@
+# Released under the MIT License. See LICENSE for details.
+#
+"""Headless stand-in for the native _baplus module.
+
+There's no master server headless, so remotely tuned values are always
+their defaults; everything else resolves to do-nothing stubs.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from baheadless import _engine
+
+if TYPE_CHECKING:
+    from typing import Any
+
+__getattr__ = _engine.make_module_getattr('_baplus')
+
+
+def get_v1_account_misc_read_val(name: str, default_value: Any) -> Any:
+    """Return the default; nothing is tuned remotely headless."""
+    del name
+    return default_value
+
+
+def get_v1_account_misc_read_val_2(name: str, default_value: Any) -> Any:
+    """Return the default; nothing is tuned remotely headless."""
+    del name
+    return default_value
+
+
+def get_v1_account_misc_val(name: str, default_value: Any) -> Any:
+    """Return the default; nothing is tuned remotely headless."""
+    del name
+    return default_value
@@ -0,0 +1,626 @@
+# Released under the MIT License. See LICENSE for details.
+#
+"""Headless stand-in for the native _bascenev1 module.
+
+Gets imported under the name '_bascenev1' by baheadless.install();
+names not implemented here resolve to do-nothing stubs.
+
+Nodes are plain attribute bags. Attributes fed through connectattr()
+are pulled from their source whenever they're read, and 'math',
+'combine', 'animcurve' and 'globals' nodes compute their outputs, so
+positions, animations and the like behave. There is no physics: nodes
+only move when something sets their position (or a 'stand' message
+does), and an 'impulse' message only reports its magnitude as damage.
+Every message is counted.
+"""
+
+from __future__ import annotations
+
+import weakref
+import logging
+from typing import TYPE_CHECKING
+
+from baheadless import _engine
+from baheadless._engine import (
+    Context,
+    clock,
+    counters,
+    current_context,
+    push_context,
+    pop_context,
+)
+
+if TYPE_CHECKING:
+    from typing import Any, Callable, Sequence
+
+__getattr__ = _engine.make_module_getattr('_bascenev1')
+
+_ZERO3 = (0.0, 0.0, 0.0)
+
+# Values unset node attributes read as; anything not listed reads as
+# 0.0 (most attributes are numbers or flags) unless its name says
+# otherwise (see _default_for()).
+_DEFAULTS: dict[str, Any] = {
+    'position': _ZERO3,
+    'velocity': _ZERO3,
+    'position_center': _ZERO3,
+    'position_forward': _ZERO3,
+    'punch_position': _ZERO3,
+    'punch_velocity': _ZERO3,
+    'color': (1.0, 1.0, 1.0),
+    'highlight': (1.0, 1.0, 1.0),
+    'name': '',
+    'text': '',
+    'counter_text': '',
+    'hold_node': None,
+    'source_player': None,
+    'materials': (),
+    'roller_materials': (),
+    'extras_material': (),
+    'punch_materials': (),
+    'pickup_materials': (),
+    'exists': True,
+    'size': 3,
+    'scale': 1.0,
+    'opacity': 1.0,
+    'intensity': 1.0,
+}
+
+
+def _default_for(attr: str) -> Any:
+    value = _DEFAULTS.get(attr)
+    if value is not None or attr in _DEFAULTS:
+        return value
+    if attr.endswith(('_texture', '_mesh', '_node', '_sound')):
+        return None
+    if attr.endswith(('_materials', '_material')):
+        return ()
+    if attr.endswith(('_position', '_velocity', '_offset')):
+        return _ZERO3
+    return 0.0
+
+
+class _Scene:
+    """Every node living in one activity or session."""
+
+    def __init__(self) -> None:
+        # (a dict as an ordered set; nodes come and go a lot)
+        self.nodes: dict[Node, None] = {}
+        self.globalsnode: Node | None = None
+        self.base_time = clock.now
+
+
+def _current_scene(doraise: bool = True) -> _Scene | None:
+    scene = current_context().scene
+    if scene is None and doraise:
+        raise _context_error()
+    return scene
+
+
+def _context_error() -> Exception:
+    import babase
+
+    return babase.ContextError('No activity or session context.')
+
+
+class Node:
+    """A headless scene node."""
+
+    def __init__(
+        self,
+        nodetype: str,
+        owner: Node | None,
+        attrs: dict | None,
+        name: str | None,
+        delegate: Any,
+    ) -> None:
+        object.__setattr__(self, '_type', nodetype)
+        object.__setattr__(self, '_name', name or '')
+        object.__setattr__(self, '_attrs', {})
+        object.__setattr__(self, '_inputs', {})
+        object.__setattr__(self, '_owned', [])
+        object.__setattr__(self, '_death_actions', [])
+        object.__setattr__(self, '_alive', True)
+        object.__setattr__(
+            self,
+            '_delegate',
+            None if delegate is None else weakref.ref(delegate),
+        )
+        object.__setattr__(self, '_scene', _current_scene())
+        self._scene.nodes[self] = None
+        if owner is not None:
+            if owner:
+                owner._owned.append(self)
+            else:
+                # Owned by something already dead; die right away.
+                object.__setattr__(self, '_alive', False)
+        if attrs:
+            self._attrs.update(attrs)
+
+    # Engine-ish api.
+
+    def exists(self) -> bool:
+        """Whether the node is still alive."""
+        return self._alive
+
+    def __bool__(self) -> bool:
+        return self._alive
+
+    def getnodetype(self) -> str:
+        """Return the node's type."""
+        return self._type
+
+    def getname(self) -> str:
+        """Return the node's name."""
+        return self._name
+
+    def getdelegate(self, type: Any, doraise: bool = False) -> Any:
+        """Return the node's delegate if it's of the given type."""
+        # pylint: disable=redefined-builtin
+        delegate = None if self._delegate is None else self._delegate()
+        if delegate is not None and isinstance(delegate, type):
+            return delegate
+        if doraise:
+            import babase
+
+            raise babase.DelegateNotFoundError()
+        return None
+
+    def delete(self, ignore_missing: bool = True) -> None:
+        """Kill the node (and everything it owns)."""
+        if not self._alive:
+            if not ignore_missing:
+                import babase
+
+                raise babase.NodeNotFoundError()
+            return
+        object.__setattr__(self, '_alive', False)
+        counters[f'node_deleted:{self._type}'] += 1
+        for owned in self._owned:
+            owned.delete()
+        self._owned.clear()
+        for action in self._death_actions:
+            try:
+                action()
+            except Exception:
+                logging.exception('Error in headless node death action.')
+        self._death_actions.clear()
+        self._scene.nodes.pop(self, None)
+
+    def add_death_action(self, call: Callable[[], Any]) -> None:
+        """Run a call when the node dies."""
+        self._death_actions.append(call)
+
+    def connectattr(self, srcattr: str, dstnode: Node, dstattr: str) -> None:
+        """Feed one of our attributes into another node's."""
+        dstnode._inputs[dstattr] = (weakref.ref(self), srcattr)
+
+    def handlemessage(self, *args: Any) -> None:
+        """Handle a message (only 'impulse' and 'stand' do anything)."""
+        if not args:
+            return
+        if not isinstance(args[0], str):
+            # A python message object meant for our delegate.
+            delegate = None if self._delegate is None else self._delegate()
+            if delegate is not None:
+                delegate.handlemessage(args[0])
+            return
+        counters[f'message:{args[0]}'] += 1
+        if args[0] == 'impulse' and len(args) >= 8:
+            # No physics to work out the real thing; the damage an
+            # impulse does is just its magnitude.
+            self._attrs['damage'] = float(args[7])
+        elif args[0] == 'stand' and len(args) >= 4:
+            self._attrs['position'] = (
+                float(args[1]),
+                float(args[2]),
+                float(args[3]),
+            )
+
+    # Attributes.
+
+    def __getattr__(self, attr: str) -> Any:
+        if attr.startswith('__'):
+            raise AttributeError(attr)
+        source = self._inputs.get(attr)
+        if source is not None:
+            node = source[0]()
+            if node is not None and node._alive:
+                return node._output(source[1])
+        return self._value(attr)
+
+    def __setattr__(self, attr: str, value: Any) -> None:
+        self._attrs[attr] = value
+
+    def _value(self, attr: str) -> Any:
+        try:
+            return self._attrs[attr]
+        except KeyError:
+            return _default_for(attr)
+
+    def _output(self, attr: str) -> Any:
+        nodetype = self._type
+        if nodetype == 'math' and attr == 'output':
+            return _math(
+                getattr(self, 'operation') or 'add',
+                getattr(self, 'input1'),
+                getattr(self, 'input2'),
+            )
+        if nodetype == 'combine' and attr == 'output':
+            size = int(self._value('size'))
+            return tuple(getattr(self, f'input{i}') for i in range(size))
+        if nodetype == 'animcurve' and attr == 'out':
+            return _curve_value(self)
+        if nodetype in ('globals', 'sessionglobals') and attr == 'time':
+            return int((clock.now - self._scene.base_time) * 1000)
+        return getattr(self, attr)
+
+    def __repr__(self) -> str:
+        state = '' if self._alive else ' (dead)'
+        return f'<headless {self._type} node {self._name!r}{state}>'
+
+
+def _math(operation: str, in1: Any, in2: Any) -> Any:
+    vals1 = tuple(in1) if isinstance(in1, (tuple, list)) else (in1,)
+    vals2 = tuple(in2) if isinstance(in2, (tuple, list)) else (in2,)
+    if operation == 'add':
+        return tuple(a + b for a, b in zip(vals1, vals2))
+    if operation == 'subtract':
+        return tuple(a - b for a, b in zip(vals1, vals2))
+    if operation == 'multiply':
+        return tuple(a * b for a, b in zip(vals1, vals2))
+    if operation == 'divide':
+        return tuple(a / b if b else 0.0 for a, b in zip(vals1, vals2))
+    return vals1
+
+
+def _curve_value(curve: Node) -> float:
+    times = list(curve._value('times') or ())
+    values = list(curve._value('values') or ())
+    if not times or not values:
+        return 0.0
+    now = int(getattr(curve, 'in')) - int(curve._value('offset'))
+    if curve._value('loop') and times[-1] > 0:
+        now %= times[-1]
+    if now <= times[0]:
+        return values[0]
+    for i in range(1, len(times)):
+        if now <= times[i]:
+            span = times[i] - times[i - 1]
+            frac = (now - times[i - 1]) / span if span else 1.0
+            return values[i - 1] + (values[i] - values[i - 1]) * frac
+    return values[-1]
+
+
+def newnode(
+    type: str,
+    owner: Any = None,
+    attrs: dict | None = None,
+    name: str | None = None,
+    delegate: Any = None,
+) -> Node:
+    """Add a node of the given type to the game."""
+    # pylint: disable=redefined-builtin
+    counters[f'node:{type}'] += 1
+    if owner is not None and not isinstance(owner, Node):
+        owner = getattr(owner, 'node', None)
+    node = Node(type, owner, attrs, name, delegate)
+    if type in ('globals', 'sessionglobals'):
+        node._scene.globalsnode = node
+    return node
+
+
+def getnodes() -> list[Node]:
+    """Return all nodes in the current scene."""
+    scene = _current_scene()
+    assert scene is not None
+    return [node for node in scene.nodes if node._alive]
+
+
+def printnodes() -> None:
+    """Print info about all nodes in the current scene."""
+    for node in getnodes():
+        print(node)
+
+
+def time() -> float:
+    """Return the current scene time in seconds."""
+    scene = _current_scene()
+    assert scene is not None
+    return clock.now - scene.base_time
+
+
+basetime = time
+
+
+def timer(time: float, call: Callable[[], Any], repeat: bool = False) -> None:
+    """Schedule a call to run after some scene time."""
+    # pylint: disable=redefined-outer-name
+    _current_scene()
+    clock.schedule(time, call, repeat)
+
+
+basetimer = timer
+
+
+class Timer(_engine.TimerBase):
+    """Timer running on scene time."""
+
+    def __init__(
+        self, time: float, call: Callable[[], Any], repeat: bool = False
+    ) -> None:
+        # pylint: disable=redefined-outer-name
+        _current_scene()
+        super().__init__(time, call, repeat)
+
+
+BaseTimer = Timer
+
+
+class _Asset:
+    """A media handle; nothing is actually loaded."""
+
+    kind = 'asset'
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        counters[f'load:{self.kind}'] += 1
+
+    def __repr__(self) -> str:
+        return f'<headless {self.kind} {self.name!r}>'
+
+
+class Texture(_Asset):
+    """A texture handle."""
+
+    kind = 'texture'
+
+
+class Mesh(_Asset):
+    """A mesh handle."""
+
+    kind = 'mesh'
+
+
+class CollisionMesh(_Asset):
+    """A collision mesh handle."""
+
+    kind = 'collisionmesh'
+
+
+class Data(_Asset):
+    """A data handle."""
+
+    kind = 'data'
+
+    def getvalue(self) -> Any:
+        """Return the data's value."""
+        return {}
+
+
+class Sound(_Asset):
+    """A sound handle."""
+
+    kind = 'sound'
+
+    def play(
+        self,
+        volume: float = 1.0,
+        position: Sequence[float] | None = None,
+        host_only: bool = False,
+    ) -> None:
+        """Play the sound (count it)."""
+        del volume, position, host_only
+        counters['sound'] += 1
+
+
+def gettexture(name: str) -> Texture:
+    """Return a texture handle."""
+    return Texture(name)
+
+
+def getmesh(name: str) -> Mesh:
+    """Return a mesh handle."""
+    return Mesh(name)
+
+
+def getcollisionmesh(name: str) -> CollisionMesh:
+    """Return a collision mesh handle."""
+    return CollisionMesh(name)
+
+
+def getdata(name: str) -> Data:
+    """Return a data handle."""
+    return Data(name)
+
+
+def getsound(name: str) -> Sound:
+    """Return a sound handle."""
+    return Sound(name)
+
+
+class Material:
+    """A material; actions are stored but never triggered."""
+
+    def __init__(self, label: str | None = None) -> None:
+        self.label = label
+        self.actions: list[tuple[Any, Any]] = []
+
+    def add_actions(self, actions: Any, conditions: Any = None) -> None:
+        """Add actions to the material."""
+        self.actions.append((conditions, actions))
+
+
+def emitfx(**kwargs: Any) -> None:
+    """Count a particle effect."""
+    counters['emitfx'] += 1
+    counters['emitfx_count'] += int(kwargs.get('count', 1))
+
+
+def camerashake(intensity: float = 1.0) -> None:
+    """Count a camera shake."""
+    del intensity
+    counters['camerashake'] += 1
+
+
+def set_map_bounds(bounds: Any) -> None:
+    """Set map bounds (ignored)."""
+    del bounds
+
+
+def broadcastmessage(message: Any, *args: Any, **kwargs: Any) -> None:
+    """Count an on-screen message."""
+    del message, args, kwargs
+    counters['broadcastmessage'] += 1
+
+
+def get_collision_info(*args: Any) -> Any:
+    """Return collision info; there are no collisions headless."""
+    import babase
+
+    del args
+    raise babase.NotFoundError('No collision headless.')
+
+
+# Activities and sessions.
+
+
+class ActivityData:
+    """Engine side data of an activity."""
+
+    def __init__(self, activity: Any, session: Any) -> None:
+        self._activity = weakref.ref(activity)
+        self.scene = _Scene()
+        self._context = Context(activity, session, self.scene)
+        self._expired = False
+
+    def context(self) -> Any:
+        """Return a ContextRef for the activity."""
+        import babase
+
+        with _ContextSwap(self._context):
+            return babase.ContextRef()
+
+    def exists(self) -> bool:
+        """Whether the activity is still around."""
+        return not self._expired
+
+    def start(self) -> None:
+        """Start the activity's clock (it's already running)."""
+
+    def make_foreground(self) -> None:
+        """Make the activity the foreground one."""
+        global _foreground_activity  # pylint: disable=global-statement
+        _foreground_activity = self._activity
+
+    def expire(self) -> None:
+        """Kill every node the activity still has."""
+        self._expired = True
+        for node in list(self.scene.nodes):
+            node.delete()
+
+
+class SessionData:
+    """Engine side data of a session."""
+
+    def __init__(self, session: Any) -> None:
+        self.scene = _Scene()
+        self._context = Context(session=session, scene=self.scene)
+
+    def context(self) -> Any:
+        """Return a ContextRef for the session."""
+        import babase
+
+        with _ContextSwap(self._context):
+            return babase.ContextRef()
+
+    def exists(self) -> bool:
+        """Whether the session is still around."""
+        return True
+
+
+class _ContextSwap:
+    def __init__(self, context: Context) -> None:
+        self._context = context
+
+    def __enter__(self) -> None:
+        push_context(self._context)
+
+    def __exit__(self, *args: Any) -> None:
+        pop_context()
+
+
+_foreground_activity: Callable[[], Any] | None = None
+
+
+def register_activity(activity: Any) -> ActivityData:
+    """Create engine data for a new activity and switch to its context.
+
+    The context stays pushed until newactivity() is done constructing.
+    """
+    data = ActivityData(activity, current_context().session)
+    push_context(data._context)
+    return data
+
+
+def register_session(session: Any) -> SessionData:
+    """Create engine data for a new session and switch to its context."""
+    data = SessionData(session)
+    push_context(data._context)
+    return data
+
+
+def newactivity(activity_type: type, settings: dict | None = None) -> Any:
+    """Instantiate an activity in the current session."""
+    depth = len(_engine._context_stack)  # pylint: disable=protected-access
+    try:
+        return activity_type({} if settings is None else settings)
+    finally:
+        while len(_engine._context_stack) > depth:
+            pop_context()
+
+
+def getactivity(doraise: bool = True) -> Any:
+    """Return the current activity."""
+    activity = current_context().activity
+    if activity is None and doraise:
+        import babase
+
+        raise babase.ActivityNotFoundError()
+    return activity
+
+
+def getsession(doraise: bool = True) -> Any:
+    """Return the current session."""
+    session = current_context().session
+    if session is None and doraise:
+        import babase
+
+        raise babase.SessionNotFoundError()
+    return session
+
+
+def get_foreground_host_activity() -> Any:
+    """Return the foreground activity, if any."""
+    return None if _foreground_activity is None else _foreground_activity()
+
+
+def get_foreground_host_session() -> Any:
+    """Return the foreground session, if any."""
+    activity = get_foreground_host_activity()
+    return None if activity is None else activity.session
+
+
+def is_in_replay() -> bool:
+    """Whether we're in a replay."""
+    return False
+
+
+def have_touchscreen_input() -> bool:
+    """Whether there's touchscreen input."""
+    return False
+
+
+def get_random_names() -> list[str]:
+    """Return random player names."""
+    return ['Player']
@@ -0,0 +1,243 @@
+# Released under the MIT License. See LICENSE for details.
+#
+"""Engine state shared by the headless stand-in modules."""
+
+from __future__ import annotations
+
+import heapq
+import logging
+import weakref
+import itertools
+from collections import Counter
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import Any, Callable
+
+
+# Counts of everything that would have hit the renderer/audio/etc.
+# ('emitfx', 'sound', 'node:spaz', 'message:impulse', ...).
+counters: Counter[str] = Counter()
+
+
+class Stub:
+    """Stands in for any engine object we don't implement.
+
+    Accepts any call or attribute access and evaluates to nothing.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        del args, kwargs
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return Stub()
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return Stub()
+
+    def __bool__(self) -> bool:
+        return False
+
+    def __iter__(self) -> Any:
+        return iter(())
+
+    def __len__(self) -> int:
+        return 0
+
+    def __enter__(self) -> Any:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        pass
+
+    def __int__(self) -> int:
+        return 0
+
+    def __float__(self) -> float:
+        return 0.0
+
+    def __str__(self) -> str:
+        return ''
+
+
+def make_module_getattr(modname: str) -> Callable[[str], Any]:
+    """Make a module ``__getattr__`` handing out stubs for unknown names."""
+
+    def __getattr__(name: str) -> Any:
+        if name.startswith('_'):
+            raise AttributeError(name)
+        counters[f'stub:{modname}.{name}'] += 1
+        return type(name, (Stub,), {'__module__': modname})
+
+    return __getattr__
+
+
+class Context:
+    """What an engine call runs in: an activity, a session or nothing."""
+
+    def __init__(
+        self, activity: Any = None, session: Any = None, scene: Any = None
+    ) -> None:
+        self._activity = None if activity is None else weakref.ref(activity)
+        self._session = None if session is None else weakref.ref(session)
+        self.scene = scene
+
+    @property
+    def activity(self) -> Any:
+        """The activity we point at, if any (and still around)."""
+        return None if self._activity is None else self._activity()
+
+    @property
+    def session(self) -> Any:
+        """The session we point at, if any (and still around)."""
+        return None if self._session is None else self._session()
+
+    @property
+    def expired(self) -> bool:
+        """Whether the thing we point at has died."""
+        if self._activity is not None:
+            activity = self._activity()
+            return activity is None or activity.expired
+        if self._session is not None:
+            return self._session() is None
+        return False
+
+
+EMPTY_CONTEXT = Context()
+_context_stack: list[Context] = [EMPTY_CONTEXT]
+
+
+def current_context() -> Context:
+    """Return the context engine calls currently run in."""
+    return _context_stack[-1]
+
+
+def push_context(context: Context) -> None:
+    """Make ``context`` current until the matching pop_context()."""
+    _context_stack.append(context)
+
+
+def pop_context() -> None:
+    """Go back to the previous context."""
+    assert len(_context_stack) > 1
+    _context_stack.pop()
+
+
+class _Scheduled:
+    """A call waiting on the clock."""
+
+    def __init__(
+        self,
+        call: Callable[[], Any],
+        interval: float,
+        repeat: bool,
+        context: Context,
+        scene: bool,
+    ) -> None:
+        self.call = call
+        self.interval = interval
+        self.repeat = repeat
+        self.context = context
+        self.scene = scene
+        self.active = True
+
+
+class Clock:
+    """The virtual clock every timer and time() call runs off.
+
+    Nothing happens on its own; time only moves (and timers only fire)
+    when advance() is called.
+    """
+
+    def __init__(self) -> None:
+        self.now = 0.0
+        self._queue: list[tuple[float, int, _Scheduled]] = []
+        self._counter = itertools.count()
+
+    def schedule(
+        self,
+        interval: float,
+        call: Callable[[], Any],
+        repeat: bool = False,
+        scene: bool = True,
+    ) -> _Scheduled:
+        """Run ``call`` ``interval`` seconds from now.
+
+        Scene timers run in (and die with) the current context;
+        others run in the empty context.
+        """
+        entry = _Scheduled(
+            call,
+            max(interval, 0.0),
+            repeat,
+            current_context() if scene else EMPTY_CONTEXT,
+            scene,
+        )
+        self._push(self.now + entry.interval, entry)
+        return entry
+
+    def _push(self, when: float, entry: _Scheduled) -> None:
+        heapq.heappush(self._queue, (when, next(self._counter), entry))
+
+    def advance(self, seconds: float) -> int:
+        """Move time forward, firing everything that comes due.
+
+        Returns the amount of calls made.
+        """
+        end = self.now + seconds
+        fired = 0
+        queue = self._queue
+        while queue and queue[0][0] <= end:
+            when, _, entry = heapq.heappop(queue)
+            if not entry.active:
+                continue
+            if entry.scene and entry.context.expired:
+                entry.active = False
+                continue
+            self.now = max(self.now, when)
+            if entry.repeat:
+                # Never let a zero-interval repeat spin forever.
+                self._push(when + max(entry.interval, 0.001), entry)
+            else:
+                entry.active = False
+            push_context(entry.context)
+            try:
+                entry.call()
+            except Exception:
+                logging.exception('Error in headless timer call.')
+            finally:
+                pop_context()
+            fired += 1
+        self.now = end
+        return fired
+
+    def pending(self) -> int:
+        """Return the amount of timers waiting to fire."""
+        return sum(1 for _, _, entry in self._queue if entry.active)
+
+
+clock = Clock()
+
+
+class TimerBase:
+    """A timer that stops firing once it's no longer referenced."""
+
+    def __init__(
+        self,
+        time: float,
+        call: Callable[[], Any],
+        repeat: bool = False,
+        scene: bool = True,
+    ) -> None:
+        ref = weakref.ref(self)
+
+        def _fire() -> None:
+            if ref() is not None:
+                call()
+
+        self._entry = clock.schedule(time, _fire, repeat, scene)
+
+    def __del__(self) -> None:
+        self._entry.active = False
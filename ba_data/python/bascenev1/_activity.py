@@ -117,6 +117,11 @@ class Activity(DependencyComponent, Generic[PlayerT, TeamT]):
     """Is it ok to show an ad after this activity ends before showing
        the next activity?"""
 
+    compact_health_hud = False
+    """If True, spazzes show their hp/shield/armor/energy readout
+       through a single text node instead of one per layer
+       (cheaper for activities with lots of spazzes around)."""
+
     def __init__(self, settings: dict):
         """Creates an Activity in the current bascenev1.Session.
 
@@ -3,6 +3,7 @@
 """Map related functionality."""
 from __future__ import annotations
 
+import math
 import random
 from typing import TYPE_CHECKING, override
 
@@ -12,10 +13,16 @@ import _bascenev1
 from bascenev1._actor import Actor
 
 if TYPE_CHECKING:
-    from typing import Sequence, Any
+    from typing import Sequence, Any, Callable
 
     import bascenev1
 
+    # Takes x, z and running; returns whether that's near an edge.
+    EdgeTest = Callable[[float, float, bool], bool]
+
+# Compiled edge tests per map class (None for maps doing their own).
+_edge_tests: dict[type[Map], EdgeTest | None] = {}
+
 
 def get_filtered_map_name(name: str) -> str:
     """Filter a map name to account for name changes, etc.
@@ -67,6 +74,14 @@ class Map(Actor):
     name = 'Map'
     _playtypes: list[str] = []
 
+    edge_boxes: tuple[str, ...] = ()
+    """Names of the boxes in defs that make up the safe part of the map
+    (on the x/z plane); points outside all of them are near an edge."""
+
+    edge_bitmap_cell: float | None = None
+    """If set, the map's edge test gets rasterised over its map_bounds
+    into cells this size, making it a lookup however complex its shape."""
+
     @classmethod
     def preload(cls) -> None:
         """Preload map media.
@@ -80,6 +95,7 @@ class Map(Actor):
         activity = _bascenev1.getactivity()
         if cls not in activity.preloads:
             activity.preloads[cls] = cls.on_preload()
+        cls.get_edge_test()
 
     @classmethod
     def get_play_types(cls) -> list[str]:
@@ -122,6 +138,7 @@ class Map(Actor):
         # (whether valid or not) should be set to something meaningful
         # by child classes.
         self.node: _bascenev1.Node | None = None
+        self._edge_test = type(self).get_edge_test()
 
         # Make our class' preload-data available to us
         # (and instruct the user if we weren't preloaded properly).
@@ -232,9 +249,69 @@ class Map(Actor):
         are approaching a cliff or wall. If this returns True they will
         generally not walk/run any farther away from the origin.
         If 'running' is True, the buffer should be a bit larger.
+
+        Maps describe their edges through edge_boxes or by overriding
+        compile_edge_test() rather than by overriding this.
+        """
+        return self.is_xz_near_edge(point[0], point[2], running)
+
+    def is_xz_near_edge(
+        self, x: float, z: float, running: bool = False
+    ) -> bool:
+        """Like is_point_near_edge(), but for a point's x and z values.
+
+        Goes straight to the map's compiled edge test, making it the
+        cheapest way to ask.
         """
-        del point, running  # Unused.
-        return False
+        test = self._edge_test
+        if test is None:
+            return self.is_point_near_edge(babase.Vec3(x, 0.0, z), running)
+        return test(x, z, running)
+
+    @classmethod
+    def compile_edge_test(cls) -> EdgeTest:
+        """Build the function is_point_near_edge() uses for this map.
+
+        It gets called with x, z and running. The default one tests
+        against the map's edge_boxes; maps with other edge shapes can
+        override this to return their own. Called once per map class.
+        """
+        bounds = []
+        for name in cls.edge_boxes:
+            box = cls.defs.boxes[name]
+            half_x = abs(box[6]) * 0.5
+            half_z = abs(box[8]) * 0.5
+            bounds.append(
+                (
+                    box[0] - half_x,
+                    box[0] + half_x,
+                    box[2] - half_z,
+                    box[2] + half_z,
+                )
+            )
+        return _make_box_edge_test(bounds)
+
+    @classmethod
+    def get_edge_test(cls) -> EdgeTest | None:
+        """Return this map's compiled edge test.
+
+        Compiles it (and rasterises it, with edge_bitmap_cell set) the
+        first time around. Returns None for maps that override
+        is_point_near_edge() instead.
+        """
+        try:
+            return _edge_tests[cls]
+        except KeyError:
+            pass
+        test: EdgeTest | None = None
+        if cls.is_point_near_edge is Map.is_point_near_edge:
+            test = cls.compile_edge_test()
+            if cls.edge_bitmap_cell:
+                test = _rasterize_edge_test(
+                    test, cls.defs.boxes['map_bounds'], cls.edge_bitmap_cell
+                )
+        _edge_tests[cls] = test
+        return test
 
     def get_def_bound_box(
         self, name: str
@@ -370,6 +447,75 @@ class Map(Actor):
         return None
 
 
+def _never_near_edge(x: float, z: float, running: bool) -> bool:
+    del x, z, running  # Unused.
+    return False
+
+
+def _make_box_edge_test(
+    bounds: list[tuple[float, float, float, float]],
+) -> EdgeTest:
+    """Make an edge test for points outside all of the given
+    (min-x, max-x, min-z, max-z) boxes.
+    """
+    if not bounds:
+        return _never_near_edge
+    if len(bounds) == 1:
+        ((min_x, max_x, min_z, max_z),) = bounds
+
+        def _outside_box(x: float, z: float, running: bool) -> bool:
+            del running  # Unused.
+            return x < min_x or x > max_x or z < min_z or z > max_z
+
+        return _outside_box
+
+    boxes = tuple(bounds)
+
+    def _outside_boxes(x: float, z: float, running: bool) -> bool:
+        del running  # Unused.
+        for min_x, max_x, min_z, max_z in boxes:
+            if min_x <= x <= max_x and min_z <= z <= max_z:
+                return False
+        return True
+
+    return _outside_boxes
+
+
+def _rasterize_edge_test(
+    test: EdgeTest, map_bounds: Sequence[float], cell: float
+) -> EdgeTest:
+    """Sample an edge test at the middle of each cell of the map's
+    bounds, walking and running; return a test looking points up in
+    those samples. Points out of bounds are near an edge.
+    """
+    min_x = map_bounds[0] - abs(map_bounds[6]) * 0.5
+    min_z = map_bounds[2] - abs(map_bounds[8]) * 0.5
+    columns = max(1, math.ceil(abs(map_bounds[6]) / cell))
+    rows = max(1, math.ceil(abs(map_bounds[8]) / cell))
+    bitmaps = tuple(
+        bytes(
+            test(
+                min_x + (column + 0.5) * cell,
+                min_z + (row + 0.5) * cell,
+                running,
+            )
+            for row in range(rows)
+            for column in range(columns)
+        )
+        for running in (False, True)
+    )
+    scale = 1.0 / cell
+
+    def _lookup(x: float, z: float, running: bool) -> bool:
+        column = (x - min_x) * scale
+        row = (z - min_z) * scale
+        if column < 0.0 or row < 0.0 or column >= columns or row >= rows:
+            return True
+        return bitmaps[running][int(row) * columns + int(column)] == 1
+
+    return _lookup
+
+
 def register_map(maptype: type[Map]) -> None:
     """Register a map class with the game."""
     assert babase.app.classic is not None
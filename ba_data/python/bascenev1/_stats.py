@@ -196,7 +196,7 @@ class PlayerRecord:
             scale2: float,
             sound2: bascenev1.Sound | None,
         ) -> None:
-            from bascenev1lib.actor.popuptext import PopupText
+            from bascenev1lib.actor.popuptext import PopupTextPool
 
             # Only award this if they're still alive and we can get
             # a current position for them.
@@ -218,7 +218,7 @@ class PlayerRecord:
             )
             activity = self.getactivity()
             if activity is not None:
-                PopupText(
+                PopupTextPool.get().show(
                     babase.Lstr(
                         value=(('+' + str(score2) + ' ') if showpoints2 else '')
                         + '${N}',
@@ -227,7 +227,8 @@ class PlayerRecord:
                     color=color2,
                     scale=scale2,
                     position=our_pos,
-                ).autoretain()
+                    rate_limited=False,
+                )
             if sound2:
                 sound2.play()
 
@@ -361,7 +362,7 @@ class Stats:
         # pylint: disable=cyclic-import
         # pylint: disable=too-many-branches
         # pylint: disable=too-many-locals
-        from bascenev1lib.actor.popuptext import PopupText
+        from bascenev1lib.actor.popuptext import PopupTextPool
 
         from bascenev1._gameactivity import GameActivity
 
@@ -422,12 +423,13 @@ class Stats:
                         sval = babase.Lstr(
                             value='+${A}', subs=[('${A}', str(points))]
                         )
-                    PopupText(
+                    PopupTextPool.get().show(
                         sval,
                         color=display_color,
                         scale=1.2 * scale,
                         position=display_pos,
-                    ).autoretain()
+                        rate_limited=False,
+                    )
 
         # Tally kills.
         if kill:
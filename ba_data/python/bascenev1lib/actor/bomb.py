@@ -7,7 +7,9 @@
 
 from __future__ import annotations
 
+import bisect
 import random
+from collections import deque
 from typing import TYPE_CHECKING, TypeVar, override
 
 import bascenev1 as bs
@@ -325,6 +327,119 @@ class ExplodeHitMessage:
     """Tell an object it was hit by an explosion."""
 
 
+class BlastFXBudget:
+    """Keeps the particles and lights of blasts in an activity in check.
+
+    category: Gameplay Classes
+
+    Counts the particles blasts emitted over the last WINDOW seconds
+    and the blast lights currently up. Near the budget for the graphics
+    quality (or for servers, which only pass effects on to clients),
+    particle counts get cut down, optional effects (thin smoke, TNT
+    splinters, extra sparks, scorch marks) get skipped and no new
+    lights are made. Use BlastFXBudget.get() to return the
+    budget for the current activity.
+    """
+
+    WINDOW = 1.0
+    """How many seconds emitted particles count against the budget."""
+
+    BUDGETS: dict[str, tuple[int, int]] = {
+        'Low': (300, 4),
+        'Medium': (600, 8),
+        'High': (1200, 16),
+        'Higher': (2000, 24),
+        'server': (400, 6),
+    }
+    """Particles per WINDOW and live lights allowed, per graphics
+    quality; 'server' applies when running headless."""
+
+    _STORENAME = bs.storagename()
+
+    def __init__(self) -> None:
+        """Instantiate a budget; use get() instead."""
+        if bs.app.env.headless:
+            quality = 'server'
+        else:
+            quality = bs.app.config.resolve('Graphics Quality')
+        if quality not in self.BUDGETS:
+            quality = 'High'
+        self.quality: str = quality
+        self.max_particles, self.max_lights = self.BUDGETS[quality]
+
+        self.skipped_emits = 0
+        self.scaled_emits = 0
+        self.skipped_lights = 0
+
+        # (emit time, count) oldest first, and sorted light expire times.
+        self._particles: deque[tuple[float, int]] = deque()
+        self._particle_load = 0
+        self._lights: list[float] = []
+
+    @classmethod
+    def get(cls) -> BlastFXBudget:
+        """Get/create a shared bascenev1lib.actor.bomb.BlastFXBudget object."""
+        activity = bs.getactivity()
+        budget = activity.customdata.get(cls._STORENAME)
+        if budget is None:
+            budget = activity.customdata[cls._STORENAME] = BlastFXBudget()
+        assert isinstance(budget, BlastFXBudget)
+        return budget
+
+    def _prune(self) -> None:
+        now = bs.time()
+        particles = self._particles
+        while particles and particles[0][0] <= now - self.WINDOW:
+            self._particle_load -= particles.popleft()[1]
+        del self._lights[: bisect.bisect_right(self._lights, now)]
+
+    def allow_optional(self) -> bool:
+        """Whether there's room for effects we can do without."""
+        self._prune()
+        return self._particle_load < self.max_particles
+
+    def emitfx(self, optional: bool = False, **kwargs: Any) -> None:
+        """Call bs.emitfx() with the count cut to what the budget has left.
+
+        Emits always put out at least one particle, except optional
+        ones, which get skipped entirely once the budget is used up.
+        """
+        if optional and not self.allow_optional():
+            self.skipped_emits += 1
+            return
+        self._prune()
+        count = kwargs.get('count')
+        if count is not None:
+            room = self.max_particles - self._particle_load
+            if count > room:
+                count = kwargs['count'] = max(1, room)
+                self.scaled_emits += 1
+            self._particles.append((bs.time(), count))
+            self._particle_load += count
+        bs.emitfx(**kwargs)
+
+    def add_light(self, lifetime: float) -> bool:
+        """Reserve a light for ``lifetime`` seconds, if there's room."""
+        self._prune()
+        if len(self._lights) >= self.max_lights:
+            self.skipped_lights += 1
+            return False
+        bisect.insort(self._lights, bs.time() + lifetime)
+        return True
+
+    def get_stats(self) -> dict[str, Any]:
+        """Return what the budget is at and what it has cut so far."""
+        self._prune()
+        return {
+            'quality': self.quality,
+            'particles': self._particle_load,
+            'lights': len(self._lights),
+            'skipped_emits': self.skipped_emits,
+            'scaled_emits': self.scaled_emits,
+            'skipped_lights': self.skipped_lights,
+        }
+
+
 class Blast(bs.Actor):
     """An explosion, as generated by a bomb or some other object.
 
@@ -351,6 +466,7 @@ class Blast(bs.Actor):
 
         shared = SharedObjects.get()
         factory = BombFactory.get()
+        fxbudget = BlastFXBudget.get()
 
         self.blast_type = blast_type
         self._source_player = source_player
@@ -390,21 +506,22 @@ class Blast(bs.Actor):
         bs.timer(1.0, explosion.delete)
 
         if self.blast_type != 'ice':
-            bs.emitfx(
+            fxbudget.emitfx(
+                optional=True,
                 position=position,
                 velocity=velocity,
                 count=int(1.0 + random.random() * 4),
                 emit_type='tendrils',
                 tendril_type='thin_smoke',
             )
-        bs.emitfx(
+        fxbudget.emitfx(
             position=position,
             velocity=velocity,
             count=int(4.0 + random.random() * 4),
             emit_type='tendrils',
             tendril_type='ice' if self.blast_type == 'ice' else 'smoke',
         )
-        bs.emitfx(
+        fxbudget.emitfx(
             position=position,
             emit_type='distortion',
             spread=1.0 if self.blast_type == 'tnt' else 2.0,
@@ -414,7 +531,7 @@ class Blast(bs.Actor):
         if self.blast_type == 'ice':
 
             def emit() -> None:
-                bs.emitfx(
+                fxbudget.emitfx(
                     position=position,
                     velocity=velocity,
                     count=30,
@@ -430,14 +547,14 @@ class Blast(bs.Actor):
         elif self.blast_type == 'sticky':
 
             def emit() -> None:
-                bs.emitfx(
+                fxbudget.emitfx(
                     position=position,
                     velocity=velocity,
                     count=int(4.0 + random.random() * 8),
                     spread=0.7,
                     chunk_type='slime',
                 )
-                bs.emitfx(
+                fxbudget.emitfx(
                     position=position,
                     velocity=velocity,
                     count=int(4.0 + random.random() * 8),
@@ -445,7 +562,7 @@ class Blast(bs.Actor):
                     spread=0.7,
                     chunk_type='slime',
                 )
-                bs.emitfx(
+                fxbudget.emitfx(
                     position=position,
                     velocity=velocity,
                     count=15,
@@ -453,7 +570,7 @@ class Blast(bs.Actor):
                     chunk_type='slime',
                     emit_type='stickers',
                 )
-                bs.emitfx(
+                fxbudget.emitfx(
                     position=position,
                     velocity=velocity,
                     count=20,
@@ -461,7 +578,7 @@ class Blast(bs.Actor):
                     chunk_type='spark',
                     emit_type='stickers',
                 )
-                bs.emitfx(
+                fxbudget.emitfx(
                     position=position,
                     velocity=velocity,
                     count=int(6.0 + random.random() * 12),
@@ -476,21 +593,21 @@ class Blast(bs.Actor):
         elif self.blast_type == 'impact':
 
             def emit() -> None:
-                bs.emitfx(
+                fxbudget.emitfx(
                     position=position,
                     velocity=velocity,
                     count=int(4.0 + random.random() * 8),
                     scale=0.8,
                     chunk_type='metal',
                 )
-                bs.emitfx(
+                fxbudget.emitfx(
                     position=position,
                     velocity=velocity,
                     count=int(4.0 + random.random() * 8),
                     scale=0.4,
                     chunk_type='metal',
                 )
-                bs.emitfx(
+                fxbudget.emitfx(
                     position=position,
                     velocity=velocity,
                     count=20,
@@ -498,7 +615,7 @@ class Blast(bs.Actor):
                     chunk_type='spark',
                     emit_type='stickers',
                 )
-                bs.emitfx(
+                fxbudget.emitfx(
                     position=position,
                     velocity=velocity,
                     count=int(8.0 + random.random() * 15),
@@ -514,20 +631,20 @@ class Blast(bs.Actor):
 
             def emit() -> None:
                 if self.blast_type != 'tnt':
-                    bs.emitfx(
+                    fxbudget.emitfx(
                         position=position,
                         velocity=velocity,
                         count=int(4.0 + random.random() * 8),
                         chunk_type='rock',
                     )
-                    bs.emitfx(
+                    fxbudget.emitfx(
                         position=position,
                         velocity=velocity,
                         count=int(4.0 + random.random() * 8),
                         scale=0.5,
                         chunk_type='rock',
                     )
-                bs.emitfx(
+                fxbudget.emitfx(
                     position=position,
                     velocity=velocity,
                     count=30,
@@ -535,7 +652,7 @@ class Blast(bs.Actor):
                     chunk_type='spark',
                     emit_type='stickers',
                 )
-                bs.emitfx(
+                fxbudget.emitfx(
                     position=position,
                     velocity=velocity,
                     count=int(18.0 + random.random() * 20),
@@ -548,7 +665,8 @@ class Blast(bs.Actor):
                 if self.blast_type == 'tnt':
 
                     def emit_splinters() -> None:
-                        bs.emitfx(
+                        fxbudget.emitfx(
+                            optional=True,
                             position=position,
                             velocity=velocity,
                             count=int(20.0 + random.random() * 25),
@@ -563,7 +681,8 @@ class Blast(bs.Actor):
                 if self.blast_type == 'tnt' or random.random() < 0.1:
 
                     def emit_extra_sparks() -> None:
-                        bs.emitfx(
+                        fxbudget.emitfx(
+                            optional=True,
                             position=position,
                             velocity=velocity,
                             count=int(10.0 + random.random() * 20),
@@ -577,16 +696,6 @@ class Blast(bs.Actor):
             # It looks better if we delay a bit.
             bs.timer(0.05, emit)
 
-        lcolor = (0.6, 0.6, 1.0) if self.blast_type == 'ice' else (1, 0.3, 0.1)
-        light = bs.newnode(
-            'light',
-            attrs={
-                'position': position,
-                'volume_intensity_scale': 10.0,
-                'color': lcolor,
-            },
-        )
-
         scl = random.uniform(0.6, 0.9)
         scorch_radius = light_radius = self.radius
         if self.blast_type == 'tnt':
@@ -594,54 +703,68 @@ class Blast(bs.Actor):
             scorch_radius *= 1.15
             scl *= 3.0
 
-        iscale = 1.6
-        bs.animate(
-            light,
-            'intensity',
-            {
-                0: 2.0 * iscale,
-                scl * 0.02: 0.1 * iscale,
-                scl * 0.025: 0.2 * iscale,
-                scl * 0.05: 17.0 * iscale,
-                scl * 0.06: 5.0 * iscale,
-                scl * 0.08: 4.0 * iscale,
-                scl * 0.2: 0.6 * iscale,
-                scl * 2.0: 0.00 * iscale,
-                scl * 3.0: 0.0,
-            },
-        )
-        bs.animate(
-            light,
-            'radius',
-            {
-                0: light_radius * 0.2,
-                scl * 0.05: light_radius * 0.55,
-                scl * 0.1: light_radius * 0.3,
-                scl * 0.3: light_radius * 0.15,
-                scl * 1.0: light_radius * 0.05,
-            },
-        )
-        bs.timer(scl * 3.0, light.delete)
+        if fxbudget.add_light(scl * 3.0):
+            lcolor = (
+                (0.6, 0.6, 1.0) if self.blast_type == 'ice' else (1, 0.3, 0.1)
+            )
+            light = bs.newnode(
+                'light',
+                attrs={
+                    'position': position,
+                    'volume_intensity_scale': 10.0,
+                    'color': lcolor,
+                },
+            )
 
-        # Make a scorch that fades over time.
-        scorch = bs.newnode(
-            'scorch',
-            attrs={
-                'position': position,
-                'size': scorch_radius * 0.5,
-                'big': (self.blast_type == 'tnt'),
-            },
-        )
-        if self.blast_type == 'ice':
-            scorch.color = (1, 1, 1.5)
+            iscale = 1.6
+            bs.animate(
+                light,
+                'intensity',
+                {
+                    0: 2.0 * iscale,
+                    scl * 0.02: 0.1 * iscale,
+                    scl * 0.025: 0.2 * iscale,
+                    scl * 0.05: 17.0 * iscale,
+                    scl * 0.06: 5.0 * iscale,
+                    scl * 0.08: 4.0 * iscale,
+                    scl * 0.2: 0.6 * iscale,
+                    scl * 2.0: 0.00 * iscale,
+                    scl * 3.0: 0.0,
+                },
+            )
+            bs.animate(
+                light,
+                'radius',
+                {
+                    0: light_radius * 0.2,
+                    scl * 0.05: light_radius * 0.55,
+                    scl * 0.1: light_radius * 0.3,
+                    scl * 0.3: light_radius * 0.15,
+                    scl * 1.0: light_radius * 0.05,
+                },
+            )
+            bs.timer(scl * 3.0, light.delete)
+
+        # Make a scorch that fades over time (unless we're swamped).
+        if fxbudget.allow_optional():
+            scorch = bs.newnode(
+                'scorch',
+                attrs={
+                    'position': position,
+                    'size': scorch_radius * 0.5,
+                    'big': (self.blast_type == 'tnt'),
+                },
+            )
+            if self.blast_type == 'ice':
+                scorch.color = (1, 1, 1.5)
 
-        bs.animate(scorch, 'presence', {3.000: 1, 13.000: 0})
-        bs.timer(13.0, scorch.delete)
+            bs.animate(scorch, 'presence', {3.000: 1, 13.000: 0})
+            bs.timer(13.0, scorch.delete)
 
+        lpos = position
         if self.blast_type == 'ice':
-            factory.hiss_sound.play(position=light.position)
+            factory.hiss_sound.play(position=lpos)
 
-        lpos = light.position
         factory.random_explode_sound().play(position=lpos)
         factory.debris_fall_sound.play(position=lpos)
 
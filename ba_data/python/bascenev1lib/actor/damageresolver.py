@@ -0,0 +1,132 @@
+# Released under the MIT License. See LICENSE for details.
+#
+"""Resolves damage through a spaz' armor, shield and hitpoint layers."""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import TYPE_CHECKING, NamedTuple
+
+import bascenev1 as bs
+
+if TYPE_CHECKING:
+    from bascenev1lib.actor.spaz import Spaz
+
+
+ARMOR_ABSORB_RATIO = 0.5
+"""How much armor one point of absorbed damage costs
+   (so 50 armor is basically 100 hp)."""
+
+
+class DamageLogEntry(NamedTuple):
+    """One resolved hit, as kept by a DamageResolver's log."""
+
+    time: float
+    victim: str
+    hit_type: str
+    damage: float
+    armor_damage: int
+    shield_damage: float
+    hp_damage: float
+
+
+def absorb(
+    damage: float, armor: int, shield: float, hitpoints: float
+) -> tuple[int, float, float]:
+    """Run damage through armor, then shields, then hitpoints.
+
+    Returns the new (armor, shield, hitpoints) values.
+    """
+    remaining = damage
+
+    # Armor absorbs damage first, at a discount.
+    if armor > 0 and remaining > 0:
+        absorbed = min(remaining, armor * 2)
+        armor -= int(absorbed * ARMOR_ABSORB_RATIO)
+        remaining -= absorbed
+
+    # Shield absorbs next.
+    if shield > 0 and remaining > 0:
+        absorbed = min(shield, remaining)
+        shield -= absorbed
+        remaining -= absorbed
+
+    # HP absorbs last.
+    if remaining > 0:
+        hitpoints -= remaining
+
+    return armor, shield, hitpoints
+
+
+class DamageResolver:
+    """Applies damage to spazzes' hp layers.
+
+    Category: **Gameplay Classes**
+
+    Every damage source (punches, blasts, flat damage like B9000's
+    drain) goes through here, so the layer math lives in one place.
+    Hits are resolved one at a time as they come in; a blast's victims
+    each work out their damage from the engine's impulse and react to
+    it (death, flashing, popups) right away, so there is no batch of
+    them to resolve together. The layers themselves stay plain
+    attributes on the spaz, where huds and skills read them.
+    Can optionally keep a bounded log of recent hits for balancing.
+    Use DamageResolver.get() to return the resolver for the current
+    activity.
+    """
+
+    _STORENAME = bs.storagename()
+
+    def __init__(self) -> None:
+        """Instantiate a resolver; use get() instead."""
+        self._log: deque[DamageLogEntry] | None = None
+
+    @classmethod
+    def get(cls) -> DamageResolver:
+        """Get/create a shared DamageResolver object."""
+        activity = bs.getactivity()
+        resolver = activity.customdata.get(cls._STORENAME)
+        if resolver is None:
+            resolver = activity.customdata[cls._STORENAME] = DamageResolver()
+        assert isinstance(resolver, DamageResolver)
+        return resolver
+
+    def enable_log(self, size: int = 256) -> None:
+        """Start keeping the last ``size`` resolved hits."""
+        self._log = deque(self._log or (), maxlen=size)
+
+    def disable_log(self) -> None:
+        """Stop logging and drop whatever was logged."""
+        self._log = None
+
+    def get_log(self) -> list[DamageLogEntry]:
+        """Return logged hits, oldest first."""
+        return list(self._log) if self._log is not None else []
+
+    def apply(
+        self, spaz: Spaz, damage: float, hit_type: str = 'generic'
+    ) -> float:
+        """Apply damage to a spaz' layers; returns the hitpoints lost."""
+        armor = spaz.armorHP
+        shield = spaz.shieldHP
+        hitpoints = spaz.hitpoints
+        new_armor, new_shield, new_hitpoints = absorb(
+            damage, armor, shield, hitpoints
+        )
+        spaz.armorHP = new_armor
+        spaz.shieldHP = new_shield
+        spaz.hitpoints = new_hitpoints
+
+        if self._log is not None:
+            self._log.append(
+                DamageLogEntry(
+                    time=bs.time(),
+                    victim=type(spaz).__name__,
+                    hit_type=hit_type,
+                    damage=damage,
+                    armor_damage=armor - new_armor,
+                    shield_damage=shield - new_shield,
+                    hp_damage=hitpoints - new_hitpoints,
+                )
+            )
+        return hitpoints - new_hitpoints
@@ -0,0 +1,124 @@
+# Released under the MIT License. See LICENSE for details.
+#
+"""Defines the heal-over-time effect a spaz gets from healing sources."""
+
+from __future__ import annotations
+
+import weakref
+from typing import TYPE_CHECKING
+
+import bascenev1 as bs
+
+from bascenev1lib.actor.popuptext import PopupTextPool
+
+if TYPE_CHECKING:
+    from bascenev1lib.actor.spaz import Spaz
+
+
+class _HealStream:
+    """One heal applied to the effect, healing a bit every tick."""
+
+    def __init__(self, per_tick: int, remaining: int, ticks: int):
+        self.per_tick = per_tick
+        self.remaining = remaining
+        self.ticks = ticks
+
+
+class HealOverTime:
+    """Heals a spaz gradually, merging every heal it receives.
+
+    Category: **Gameplay Classes**
+
+    Overlapping heals run off one timer as a single combined rate, and
+    what was healed is shown as one popup number per POPUP_INTERVAL
+    instead of one popup per tick; so the amount of nodes this costs
+    depends on how many spazzes are being healed, not on how often.
+    """
+
+    TICK = 0.1
+    """How often heals are applied, in seconds."""
+
+    POPUP_INTERVAL = 0.5
+    """How often the healed amount is shown, in seconds."""
+
+    def __init__(self, spaz: Spaz):
+        self._spaz = weakref.ref(spaz)
+        self._streams: list[_HealStream] = []
+        self._timer: bs.Timer | None = None
+        self._ticks_per_popup = max(1, round(self.POPUP_INTERVAL / self.TICK))
+        self._tick_count = 0
+        self._unshown = 0.0
+
+    @property
+    def active(self) -> bool:
+        """Whether we're currently healing anything."""
+        return bool(self._streams)
+
+    def add(self, amount: int, duration: float) -> None:
+        """Heal ``amount`` hitpoints spread over ``duration`` seconds."""
+        ticks = max(1, int(duration / self.TICK))
+        self._streams.append(
+            _HealStream(max(1, amount // ticks), amount, ticks)
+        )
+        if self._timer is None:
+            self._tick_count = 0
+            self._timer = bs.Timer(
+                self.TICK, bs.WeakCall(self._tick), repeat=True
+            )
+            self._tick()
+
+    def stop(self) -> None:
+        """Drop every running heal without showing what's left."""
+        self._streams = []
+        self._timer = None
+        self._unshown = 0.0
+
+    def _tick(self) -> None:
+        spaz = self._spaz()
+        if spaz is None or not spaz.is_alive():
+            self.stop()
+            return
+
+        amount = 0
+        for stream in self._streams:
+            step = min(stream.per_tick, stream.remaining)
+            stream.remaining -= step
+            stream.ticks -= 1
+            amount += step
+        self._streams = [
+            s for s in self._streams if s.remaining > 0 and s.ticks > 0
+        ]
+
+        if amount:
+            old = spaz.hitpoints
+            spaz.hitpoints = min(
+                spaz.hitpoints + amount * spaz.impact_scale,
+                spaz.hitpoints_max,
+            )
+            self._unshown += max(0.0, spaz.hitpoints - old)
+
+        self._tick_count += 1
+        if not self._streams:
+            self._timer = None
+            self._show(spaz, final=True)
+        elif self._tick_count % self._ticks_per_popup == 0:
+            self._show(spaz)
+
+    def _show(self, spaz: Spaz, final: bool = False) -> None:
+        shown = int(self._unshown / 10)
+        if shown <= 0:
+            # Carry small amounts over to the next popup (and let the
+            # last popup's leftovers go; they're under a single point).
+            if final:
+                self._unshown = 0.0
+            return
+        self._unshown -= shown * 10
+        if final:
+            self._unshown = 0.0
+        PopupTextPool.get().show(
+            text=f'+{shown}',
+            position=spaz.node.position,
+            color=(0.2, 1.0, 0.2),
+            scale=0.9,
+            random_offset=0.5,
+        )
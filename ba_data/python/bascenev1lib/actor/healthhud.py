@@ -0,0 +1,259 @@
+# Released under the MIT License. See LICENSE for details.
+#
+"""Defines the in-world health readout shown next to spazzes."""
+
+from __future__ import annotations
+
+import weakref
+from typing import TYPE_CHECKING
+
+import bascenev1 as bs
+
+if TYPE_CHECKING:
+    from typing import Sequence
+
+    from bascenev1lib.actor.spaz import Spaz
+
+
+class _HUDLayer:
+    """One value of the readout (hp, shield, armor or energy)."""
+
+    def __init__(
+        self,
+        color: Sequence[float],
+        char_width: float,
+        prefix: str,
+        measure_prefix: bool,
+    ):
+        self.color = color
+        self.char_width = char_width
+        self.prefix = prefix
+        self.measure_prefix = measure_prefix
+        self.text: bs.Node | None = None
+        self.offset: bs.Node | None = None
+
+        # What we last pushed to our nodes.
+        self.value: int | None = None
+        self.width = 0.0
+        self.x: float | None = None
+
+
+class HealthHUD:
+    """Shows a spaz' hitpoints, shields, armor and energy in-world.
+
+    Category: **Gameplay Classes**
+
+    Keeps track of what it last rendered and only touches its nodes
+    when a displayed value or position actually changes. Only holds a
+    weak reference to its spaz, so the two don't keep each other
+    alive. Nodes for a layer are only created the first time that
+    layer has something to show, so characters without armor never
+    pay for armor nodes.
+    """
+
+    def __init__(self, spaz: Spaz):
+        self._spaz = weakref.ref(spaz)
+        self._hp = _HUDLayer(
+            spaz.HEALTH_UI_HP_COLOR, spaz.HEALTH_UI_CHAR_WIDTH_HP, 'x', True
+        )
+        self._shield = _HUDLayer(
+            spaz.HEALTH_UI_SHIELD_COLOR,
+            spaz.HEALTH_UI_CHAR_WIDTH_SHIELD,
+            '| ',
+            False,
+        )
+        self._armor = _HUDLayer(
+            spaz.HEALTH_UI_ARMOR_COLOR,
+            spaz.HEALTH_UI_CHAR_WIDTH_ARMOR,
+            '| ',
+            False,
+        )
+        self._energy = _HUDLayer(
+            spaz.HEALTH_UI_ENERGY_COLOR,
+            spaz.HEALTH_UI_CHAR_WIDTH_ENERGY,
+            '| ',
+            False,
+        )
+        self._layers = (self._hp, self._shield, self._armor, self._energy)
+        self._enabled = True
+
+    def update(self) -> None:
+        """Bring the readout up to date with our spaz' values."""
+        spaz = self._spaz()
+        if not self._enabled or spaz is None or not spaz.node:
+            return
+        energy = spaz.shield_hitpoints
+        x = spaz.HEALTH_UI_BASE_X_OFFSET
+        x = self._update_layer(spaz, self._hp, True, spaz.hitpoints, x)
+        x = self._update_layer(
+            spaz, self._shield, spaz.shieldHP > 0, spaz.shieldHP, x
+        )
+        x = self._update_layer(
+            spaz, self._armor, spaz.armorHP > 0, spaz.armorHP, x
+        )
+        self._update_layer(
+            spaz,
+            self._energy,
+            energy is not None and energy > 0,
+            energy or 0,
+            x,
+        )
+
+    def delete(self) -> None:
+        """Remove the readout for good."""
+        self._enabled = False
+        for layer in self._layers:
+            if layer.text:
+                layer.text.delete()
+            if layer.offset:
+                layer.offset.delete()
+            layer.text = layer.offset = None
+
+    def _update_layer(
+        self,
+        spaz: Spaz,
+        layer: _HUDLayer,
+        visible: bool,
+        raw_value: float,
+        x: float,
+    ) -> float:
+        if not visible:
+            if layer.value is not None:
+                assert layer.text
+                layer.text.text = ''
+                layer.value = None
+            return x
+
+        if layer.text is None:
+            self._create_nodes(spaz, layer)
+        assert layer.text and layer.offset
+
+        value = int(raw_value / 10)
+        if value != layer.value:
+            layer.value = value
+            layer.text.text = f'{layer.prefix}{value}'
+            chars = len(str(value))
+            if layer.measure_prefix:
+                chars += len(layer.prefix)
+            layer.width = chars * layer.char_width
+
+        if x != layer.x:
+            layer.x = x
+            layer.offset.input2 = (x, spaz.HEALTH_UI_Y_OFFSET, 0)
+
+        return x + layer.width + spaz.HEALTH_UI_SPACING_SMALL
+
+    def _create_nodes(self, spaz: Spaz, layer: _HUDLayer) -> None:
+        layer.text = bs.newnode(
+            'text',
+            owner=spaz.node,
+            attrs={
+                'text': '',
+                'in_world': True,
+                'scale': spaz.HEALTH_UI_SCALE,
+                'shadow': 0.5,
+                'flatness': 1.0,
+                'h_align': 'left',
+                'v_align': 'center',
+                'color': layer.color,
+                'opacity': spaz.HEALTH_UI_TRANSPARANCY,
+            },
+        )
+        layer.offset = bs.newnode(
+            'math', owner=spaz.node, attrs={'operation': 'add'}
+        )
+        spaz.node.connectattr('position', layer.offset, 'input1')
+        layer.offset.connectattr('output', layer.text, 'position')
+
+
+class CompactHealthHUD:
+    """A cheaper HealthHUD drawing every layer with a single text node.
+
+    Category: **Gameplay Classes**
+
+    Uses one text node and one offset node no matter how many layers
+    are shown. Text nodes only take a single color, so the readout is
+    tinted after the outermost layer that's still up (armor, then
+    shields, then hitpoints).
+    """
+
+    def __init__(self, spaz: Spaz):
+        self._spaz = weakref.ref(spaz)
+        self._text: bs.Node | None = None
+        self._offset: bs.Node | None = None
+        self._values: tuple[int, int, int, int] | None = None
+        self._enabled = True
+
+    def update(self) -> None:
+        """Bring the readout up to date with our spaz' values."""
+        spaz = self._spaz()
+        if not self._enabled or spaz is None or not spaz.node:
+            return
+        energy = spaz.shield_hitpoints
+        values = (
+            int(spaz.hitpoints / 10),
+            int(spaz.shieldHP / 10) if spaz.shieldHP > 0 else -1,
+            int(spaz.armorHP / 10) if spaz.armorHP > 0 else -1,
+            int(energy / 10) if energy is not None and energy > 0 else -1,
+        )
+        if values == self._values:
+            return
+        self._values = values
+
+        if self._text is None:
+            self._create_nodes(spaz)
+        assert self._text
+
+        hp, shield, armor, energy_val = values
+        segments = [f'x{hp}']
+        color = spaz.HEALTH_UI_HP_COLOR
+        if shield >= 0:
+            segments.append(str(shield))
+            color = spaz.HEALTH_UI_SHIELD_COLOR
+        if armor >= 0:
+            segments.append(str(armor))
+            color = spaz.HEALTH_UI_ARMOR_COLOR
+        if energy_val >= 0:
+            segments.append(str(energy_val))
+        self._text.text = ' | '.join(segments)
+        self._text.color = color
+
+    def delete(self) -> None:
+        """Remove the readout for good."""
+        self._enabled = False
+        if self._text:
+            self._text.delete()
+        if self._offset:
+            self._offset.delete()
+        self._text = self._offset = None
+
+    def _create_nodes(self, spaz: Spaz) -> None:
+        self._text = bs.newnode(
+            'text',
+            owner=spaz.node,
+            attrs={
+                'text': '',
+                'in_world': True,
+                'scale': spaz.HEALTH_UI_SCALE,
+                'shadow': 0.5,
+                'flatness': 1.0,
+                'h_align': 'left',
+                'v_align': 'center',
+                'color': spaz.HEALTH_UI_HP_COLOR,
+                'opacity': spaz.HEALTH_UI_TRANSPARANCY,
+            },
+        )
+        self._offset = bs.newnode(
+            'math',
+            owner=spaz.node,
+            attrs={
+                'operation': 'add',
+                'input2': (
+                    spaz.HEALTH_UI_BASE_X_OFFSET,
+                    spaz.HEALTH_UI_Y_OFFSET,
+                    0,
+                ),
+            },
+        )
+        spaz.node.connectattr('position', self._offset, 'input1')
+        self._offset.connectattr('output', self._text, 'position')
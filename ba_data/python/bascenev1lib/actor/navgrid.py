@@ -0,0 +1,406 @@
+# Released under the MIT License. See LICENSE for details.
+#
+"""Walkable grids and flow fields bots use to find their way around."""
+
+from __future__ import annotations
+
+import os
+import json
+import math
+import heapq
+import base64
+import hashlib
+import logging
+from array import array
+from typing import TYPE_CHECKING
+
+import bascenev1 as bs
+
+if TYPE_CHECKING:
+    from typing import Any, Callable, Iterable, Sequence
+
+CELL_SIZE = 1.0
+"""Default size of a nav grid cell on the x and z axes."""
+
+# Bump this when the way grids are built changes, so caches get redone.
+_CACHE_VERSION = 1
+
+# Points from a map's defs that are known to be on walkable ground.
+_SEED_POINTS = ('spawn', 'ffa_spawn', 'flag', 'powerup_spawn')
+
+_DIAGONAL = math.sqrt(2.0)
+
+# Grids already built, by cache key.
+_grids: dict[str, NavGrid] = {}
+
+
+class NavGrid:
+    """Which parts of a map bots can walk on, as a grid of cells.
+
+    Category: **Gameplay Classes**
+
+    Built from the map's edge test (see bascenev1.Map.get_edge_test()),
+    keeping only ground connected to the map's spawn and flag points.
+    Where collision queries are available, a probe can rule out more
+    cells (walls, pits) when building. Use NavGrid.get() to have grids
+    cached per map, in memory and on disk.
+    """
+
+    def __init__(
+        self,
+        origin: tuple[float, float],
+        cell_size: float,
+        columns: int,
+        rows: int,
+        walkable: bytes,
+    ) -> None:
+        self.origin = origin
+        self.cell_size = cell_size
+        self.columns = columns
+        self.rows = rows
+        self.walkable = walkable
+        self._scale = 1.0 / cell_size
+
+    @classmethod
+    def get(
+        cls,
+        bsmap: bs.Map,
+        probe: Callable[[float, float], bool] | None = None,
+    ) -> NavGrid:
+        """Return the grid for a map, building it if need be.
+
+        Grids get cached per map (name and layout) in memory and in the
+        app's cache directory, so building happens once per map and
+        install. Maps with edge code of their own only get cached in
+        memory, since the cache key can't tell when that code changes.
+        ``probe`` only matters when the grid gets built; a grid built
+        with one (by a tool with collision queries) is what later gets
+        loaded from the cache.
+        """
+        maptype = type(bsmap)
+        key = _cache_key(maptype)
+        grid = _grids.get(key)
+        if grid is not None:
+            return grid
+        path = None if _has_custom_edges(maptype) else _cache_path(key)
+        if path is not None and os.path.exists(path):
+            try:
+                with open(path, encoding='utf-8') as infile:
+                    grid = cls.from_dict(json.load(infile))
+            except Exception:
+                logging.exception('Error reading nav grid cache %s.', path)
+        if grid is None:
+            grid = cls.build(bsmap, probe)
+            if path is not None:
+                try:
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    with open(path, 'w', encoding='utf-8') as outfile:
+                        json.dump(grid.to_dict(), outfile)
+                except Exception:
+                    logging.exception(
+                        'Error writing nav grid cache %s.', path
+                    )
+        _grids[key] = grid
+        return grid
+
+    @classmethod
+    def build(
+        cls,
+        bsmap: bs.Map,
+        probe: Callable[[float, float], bool] | None = None,
+        cell_size: float = CELL_SIZE,
+    ) -> NavGrid:
+        """Build a map's grid (uncached).
+
+        Cells are walkable if their middle isn't near one of the map's
+        edges and (with a ``probe``) if probe(x, z) returns True.
+        """
+        bounds = bsmap.get_def_bound_box('map_bounds')
+        if bounds is None:
+            bounds = (-30, -10, -30, 30, 100, 30)
+        origin = (bounds[0], bounds[2])
+        columns = max(1, math.ceil((bounds[3] - bounds[0]) / cell_size))
+        rows = max(1, math.ceil((bounds[5] - bounds[2]) / cell_size))
+        open_cells = bytearray(columns * rows)
+        for row in range(rows):
+            z = origin[1] + (row + 0.5) * cell_size
+            for column in range(columns):
+                x = origin[0] + (column + 0.5) * cell_size
+                if not bsmap.is_xz_near_edge(x, z) and (
+                    probe is None or probe(x, z)
+                ):
+                    open_cells[row * columns + column] = 1
+        grid = cls(origin, cell_size, columns, rows, bytes(open_cells))
+
+        # Only keep ground we can get to from where things spawn.
+        seeds = []
+        for name, point in bsmap.defs.points.items():
+            if name.startswith(_SEED_POINTS):
+                index = grid.cell_at(point[0], point[2])
+                if index != -1 and open_cells[index]:
+                    seeds.append(index)
+        if not seeds:
+            return grid
+        reached = bytearray(len(open_cells))
+        stack = seeds
+        for index in seeds:
+            reached[index] = 1
+        while stack:
+            index = stack.pop()
+            for neighbor, _cost in grid.neighbors(index):
+                if not reached[neighbor]:
+                    reached[neighbor] = 1
+                    stack.append(neighbor)
+        grid.walkable = bytes(reached)
+        return grid
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the grid as json-able data."""
+        return {
+            'version': _CACHE_VERSION,
+            'origin': list(self.origin),
+            'cell_size': self.cell_size,
+            'columns': self.columns,
+            'rows': self.rows,
+            'walkable': base64.b64encode(self.walkable).decode(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> NavGrid | None:
+        """Make a grid out of to_dict() data (None if it's outdated)."""
+        if data.get('version') != _CACHE_VERSION:
+            return None
+        return cls(
+            (data['origin'][0], data['origin'][1]),
+            data['cell_size'],
+            data['columns'],
+            data['rows'],
+            base64.b64decode(data['walkable']),
+        )
+
+    def cell_at(self, x: float, z: float) -> int:
+        """Return the index of the cell at x/z (-1 if off the grid)."""
+        column = (x - self.origin[0]) * self._scale
+        row = (z - self.origin[1]) * self._scale
+        if column < 0.0 or row < 0.0:
+            return -1
+        column_i = int(column)
+        row_i = int(row)
+        if column_i >= self.columns or row_i >= self.rows:
+            return -1
+        return row_i * self.columns + column_i
+
+    def is_walkable(self, x: float, z: float) -> bool:
+        """Return whether the ground at x/z can be walked on."""
+        index = self.cell_at(x, z)
+        return index != -1 and self.walkable[index] == 1
+
+    def is_line_walkable(
+        self, x0: float, z0: float, x1: float, z1: float
+    ) -> bool:
+        """Return whether walking straight from one point to another
+        stays on walkable ground (checked every half cell).
+        """
+        length = math.hypot(x1 - x0, z1 - z0)
+        steps = max(1, int(length * self._scale * 2.0))
+        step_x = (x1 - x0) / steps
+        step_z = (z1 - z0) / steps
+        for step in range(1, steps + 1):
+            if not self.is_walkable(x0 + step_x * step, z0 + step_z * step):
+                return False
+        return True
+
+    def neighbors(self, index: int) -> list[tuple[int, float]]:
+        """Return the walkable cells next to a cell, with the cost of
+        moving to each. Diagonal moves never cut unwalkable corners.
+        """
+        columns = self.columns
+        walkable = self.walkable
+        row, column = divmod(index, columns)
+        west = column > 0 and walkable[index - 1] == 1
+        east = column < columns - 1 and walkable[index + 1] == 1
+        north = row > 0 and walkable[index - columns] == 1
+        south = row < self.rows - 1 and walkable[index + columns] == 1
+        result = []
+        if west:
+            result.append((index - 1, 1.0))
+        if east:
+            result.append((index + 1, 1.0))
+        if north:
+            result.append((index - columns, 1.0))
+            if west and walkable[index - columns - 1]:
+                result.append((index - columns - 1, _DIAGONAL))
+            if east and walkable[index - columns + 1]:
+                result.append((index - columns + 1, _DIAGONAL))
+        if south:
+            result.append((index + columns, 1.0))
+            if west and walkable[index + columns - 1]:
+                result.append((index + columns - 1, _DIAGONAL))
+            if east and walkable[index + columns + 1]:
+                result.append((index + columns + 1, _DIAGONAL))
+        return result
+
+
+class FlowField:
+    """Ways toward the nearest of a bunch of targets over a NavGrid.
+
+    Category: **Gameplay Classes**
+
+    One of these serves every bot of a bs.SpazBotSet: a single path
+    search from all the targets at once tells any bot on the grid which
+    way to go, instead of each bot working it out alone. The search is
+    spread over several advance() calls, and the previous field keeps
+    being used until the new one is done. Targets are grouped into
+    clusters of cells, so it only gets redone when players change
+    clusters, not every time they move.
+    """
+
+    cluster_cells = 3
+    """Width (in cells) of the clusters targets get grouped into."""
+
+    lookahead = 12.0
+    """How far ahead steer() checks the straight way for being walkable."""
+
+    def __init__(self, grid: NavGrid) -> None:
+        self.grid = grid
+        self._clusters: frozenset[int] = frozenset()
+        self._dist: array | None = None
+        self._pending: array | None = None
+        self._queue: list[tuple[float, int]] = []
+
+    def set_targets(self, points: Iterable[Sequence[float]]) -> None:
+        """Set the (x, z) points to lead to; restarts the search if
+        they've moved to other clusters.
+        """
+        grid = self.grid
+        cells = []
+        clusters = set()
+        for point in points:
+            index = grid.cell_at(point[0], point[1])
+            if index == -1 or not grid.walkable[index]:
+                continue
+            row, column = divmod(index, grid.columns)
+            cells.append(index)
+            clusters.add(
+                (row // self.cluster_cells) * grid.columns
+                + column // self.cluster_cells
+            )
+        frozen = frozenset(clusters)
+        if frozen == self._clusters:
+            return
+        self._clusters = frozen
+        if not cells:
+            self._dist = None
+            self._pending = None
+            self._queue = []
+            return
+        self._pending = array('d', [math.inf]) * len(grid.walkable)
+        self._queue = []
+        for index in cells:
+            self._pending[index] = 0.0
+            self._queue.append((0.0, index))
+        heapq.heapify(self._queue)
+
+    def advance(self, max_cells: int = 400) -> bool:
+        """Carry on with the search for up to ``max_cells`` cells.
+
+        Returns whether there's nothing left to do.
+        """
+        pending = self._pending
+        if pending is None:
+            return True
+        queue = self._queue
+        neighbors = self.grid.neighbors
+        done = 0
+        while queue and done < max_cells:
+            dist, index = heapq.heappop(queue)
+            if dist > pending[index]:
+                continue
+            done += 1
+            for neighbor, cost in neighbors(index):
+                new_dist = dist + cost
+                if new_dist < pending[neighbor]:
+                    pending[neighbor] = new_dist
+                    heapq.heappush(queue, (new_dist, neighbor))
+        if queue:
+            return False
+        self._dist = pending
+        self._pending = None
+        return True
+
+    def direction(self, x: float, z: float) -> tuple[float, float] | None:
+        """Return the (x, z) unit direction to go from x/z, or None if
+        there's no path from there (or we're already there).
+        """
+        dist = self._dist
+        grid = self.grid
+        index = grid.cell_at(x, z)
+        if dist is None or index == -1 or not 0.0 < dist[index] < math.inf:
+            return None
+        # Head for whichever neighbor is closest to a target.
+        best = index
+        for neighbor, _cost in grid.neighbors(index):
+            if dist[neighbor] < dist[best]:
+                best = neighbor
+        if best == index:
+            return None
+        row, column = divmod(index, grid.columns)
+        best_row, best_column = divmod(best, grid.columns)
+        dir_x = float(best_column - column)
+        dir_z = float(best_row - row)
+        length = math.hypot(dir_x, dir_z)
+        return dir_x / length, dir_z / length
+
+    def steer(
+        self, x: float, z: float, dir_x: float, dir_z: float, dist: float
+    ) -> tuple[float, float]:
+        """Return the way to go from x/z toward something ``dist`` away
+        in direction dir_x/dir_z: straight there if that stays on
+        walkable ground (or if the field can't get us there either),
+        or else along the field.
+        """
+        grid = self.grid
+        if not grid.is_walkable(x + dir_x * dist, z + dir_z * dist):
+            return dir_x, dir_z
+        ahead = min(dist, self.lookahead)
+        if grid.is_line_walkable(x, z, x + dir_x * ahead, z + dir_z * ahead):
+            return dir_x, dir_z
+        flow = self.direction(x, z)
+        if flow is None:
+            return dir_x, dir_z
+        return flow
+
+
+def _cache_key(maptype: type[bs.Map]) -> str:
+    """Identify a map's layout, so changed maps get new grids."""
+    defs = maptype.defs
+    layout = repr(
+        (
+            _CACHE_VERSION,
+            CELL_SIZE,
+            maptype.edge_boxes,
+            sorted(defs.boxes.items()) if defs is not None else None,
+            sorted(defs.points.items()) if defs is not None else None,
+        )
+    )
+    digest = hashlib.sha1(layout.encode()).hexdigest()[:12]
+    safe_name = ''.join(c if c.isalnum() else '_' for c in maptype.name)
+    return f'{safe_name}_{digest}'
+
+
+def _has_custom_edges(maptype: type[bs.Map]) -> bool:
+    """Return whether a map works out its edges with its own code."""
+    return (
+        maptype.compile_edge_test.__func__
+        is not bs.Map.compile_edge_test.__func__
+        or maptype.is_point_near_edge is not bs.Map.is_point_near_edge
+        or maptype.is_xz_near_edge is not bs.Map.is_xz_near_edge
+    )
+
+
+def _cache_path(key: str) -> str | None:
+    try:
+        cache_dir = bs.app.env.cache_directory
+    except Exception:
+        return None
+    return os.path.join(cache_dir, 'navgrids', f'{key}.json')
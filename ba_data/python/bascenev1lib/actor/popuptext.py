@@ -5,6 +5,7 @@
 from __future__ import annotations
 
 import random
+from collections import deque
 from typing import TYPE_CHECKING, override
 
 import bascenev1 as bs
@@ -13,6 +14,82 @@ if TYPE_CHECKING:
     from typing import Any, Sequence
 
 
+POPUP_LIFESPAN = 1.5
+"""How long popup texts stay up, in seconds."""
+
+
+def _rgba(color: Sequence[float]) -> tuple[float, float, float, float]:
+    if len(color) == 3:
+        return (color[0], color[1], color[2], 1.0)
+    return (color[0], color[1], color[2], color[3])
+
+
+def _jitter(
+    position: Sequence[float], offset: Sequence[float], random_offset: float
+) -> tuple[float, float, float]:
+    return (
+        position[0] + offset[0] + random_offset * (0.5 - random.random()),
+        position[1] + offset[1] + random_offset * (0.5 - random.random()),
+        position[2] + offset[2] + random_offset * (0.5 - random.random()),
+    )
+
+
+def _popup_keys(
+    pos: Sequence[float], color: Sequence[float], scale: float
+) -> tuple[dict[float, float], ...]:
+    """Return the keys of a popup's curves.
+
+    In order: text scale, height, then color r, g, b and opacity.
+    """
+    lifespan = POPUP_LIFESPAN
+
+    # scale up
+    scale_keys = {
+        0: 0.0,
+        lifespan * 0.11: 0.020 * 0.7 * scale,
+        lifespan * 0.16: 0.013 * 0.7 * scale,
+        lifespan * 0.25: 0.014 * 0.7 * scale,
+    }
+
+    # translate upward
+    height_keys = {0: pos[1] + 1.5, lifespan: pos[1] + 2.0}
+
+    # flash our color and fade our opacity in/out
+    color_keys = tuple(
+        {
+            0.13 * lifespan: color[i],
+            0.18 * lifespan: 4.0 * color[i],
+            0.22 * lifespan: color[i],
+        }
+        for i in range(3)
+    )
+    opacity_keys = {
+        0: 0,
+        0.1 * lifespan: color[3],
+        0.7 * lifespan: color[3],
+        lifespan: 0,
+    }
+    return (scale_keys, height_keys, *color_keys, opacity_keys)
+
+
+def _animate_popup(
+    node: bs.Node,
+    tcombine: bs.Node,
+    combine: bs.Node,
+    pos: Sequence[float],
+    color: Sequence[float],
+    scale: float,
+) -> None:
+    """Start the pop-up animation on a popup's nodes."""
+    scale_keys, height_keys, *combine_keys = _popup_keys(pos, color, scale)
+    bs.animate(node, 'scale', scale_keys)
+    tcombine.input0 = pos[0]
+    tcombine.input2 = pos[2]
+    bs.animate(tcombine, 'input1', height_keys)
+    for i, keys in enumerate(combine_keys):
+        bs.animate(combine, 'input' + str(i), keys)
+
+
 class PopupText(bs.Actor):
     """Text that pops up above a position to denote something special.
 
@@ -35,13 +112,8 @@ class PopupText(bs.Actor):
         overlapping too much.
         """
         super().__init__()
-        if len(color) == 3:
-            color = (color[0], color[1], color[2], 1.0)
-        pos = (
-            position[0] + offset[0] + random_offset * (0.5 - random.random()),
-            position[1] + offset[1] + random_offset * (0.5 - random.random()),
-            position[2] + offset[2] + random_offset * (0.5 - random.random()),
-        )
+        color = _rgba(color)
+        pos = _jitter(position, offset, random_offset)
 
         self.node = bs.newnode(
             'text',
@@ -55,63 +127,16 @@ class PopupText(bs.Actor):
             delegate=self,
         )
 
-        lifespan = 1.5
-
-        # scale up
-        bs.animate(
-            self.node,
-            'scale',
-            {
-                0: 0.0,
-                lifespan * 0.11: 0.020 * 0.7 * scale,
-                lifespan * 0.16: 0.013 * 0.7 * scale,
-                lifespan * 0.25: 0.014 * 0.7 * scale,
-            },
-        )
-
-        # translate upward
+        lifespan = POPUP_LIFESPAN
         self._tcombine = bs.newnode(
-            'combine',
-            owner=self.node,
-            attrs={'input0': pos[0], 'input2': pos[2], 'size': 3},
-        )
-        bs.animate(
-            self._tcombine, 'input1', {0: pos[1] + 1.5, lifespan: pos[1] + 2.0}
+            'combine', owner=self.node, attrs={'size': 3}
         )
         self._tcombine.connectattr('output', self.node, 'position')
-
-        # fade our opacity in/out
-        self._combine = bs.newnode(
-            'combine',
-            owner=self.node,
-            attrs={
-                'input0': color[0],
-                'input1': color[1],
-                'input2': color[2],
-                'size': 4,
-            },
-        )
-        for i in range(4):
-            bs.animate(
-                self._combine,
-                'input' + str(i),
-                {
-                    0.13 * lifespan: color[i],
-                    0.18 * lifespan: 4.0 * color[i],
-                    0.22 * lifespan: color[i],
-                },
-            )
-        bs.animate(
-            self._combine,
-            'input3',
-            {
-                0: 0,
-                0.1 * lifespan: color[3],
-                0.7 * lifespan: color[3],
-                lifespan: 0,
-            },
-        )
+        self._combine = bs.newnode('combine', owner=self.node, attrs={'size': 4})
         self._combine.connectattr('output', self.node, 'color')
+        _animate_popup(
+            self.node, self._tcombine, self._combine, pos, color, scale
+        )
 
         # kill ourself
         self._die_timer = bs.Timer(
@@ -126,3 +151,175 @@ class PopupText(bs.Actor):
                 self.node.delete()
         else:
             super().handlemessage(msg)
+
+
+class _PoolSlot:
+    """One reusable set of popup nodes.
+
+    Its animation curves stay connected for good; showing a popup
+    just gives them new keys.
+    """
+
+    def __init__(self) -> None:
+        self.node = bs.newnode(
+            'text',
+            attrs={
+                'text': '',
+                'in_world': True,
+                'shadow': 1.0,
+                'flatness': 1.0,
+                'h_align': 'center',
+                'scale': 0.0,
+            },
+        )
+        self.tcombine = bs.newnode('combine', owner=self.node, attrs={'size': 3})
+        self.tcombine.connectattr('output', self.node, 'position')
+        self.combine = bs.newnode('combine', owner=self.node, attrs={'size': 4})
+        self.combine.connectattr('output', self.node, 'color')
+        globalsnode = bs.getactivity().globalsnode
+        targets = [(self.node, 'scale'), (self.tcombine, 'input1')]
+        targets += [(self.combine, 'input' + str(i)) for i in range(4)]
+        self.curves: list[bs.Node] = []
+        for target, attr in targets:
+            curve = bs.newnode(
+                'animcurve',
+                owner=self.node,
+                attrs={'times': [0], 'values': [0.0]},
+            )
+            globalsnode.connectattr('time', curve, 'in')
+            curve.connectattr('out', target, attr)
+            self.curves.append(curve)
+        self.expires_at = 0.0
+        self.generation = 0
+
+    def animate(
+        self, pos: Sequence[float], color: Sequence[float], scale: float
+    ) -> None:
+        """Restart the pop-up animation with new values."""
+        self.tcombine.input0 = pos[0]
+        self.tcombine.input2 = pos[2]
+        offset = int(bs.time() * 1000.0)
+        for curve, keys in zip(self.curves, _popup_keys(pos, color, scale)):
+            items = sorted(keys.items())
+            curve.times = [int(1000 * time) for time, _ in items]
+            curve.values = [value for _, value in items]
+            curve.offset = offset
+
+
+class PooledPopup:
+    """A popup shown through a PopupTextPool.
+
+    category: Gameplay Classes
+
+    Only stays valid until its slot gets reused; pass it back to
+    PopupTextPool.show() as ``reuse`` to update it in place.
+    """
+
+    def __init__(self, slot: _PoolSlot):
+        self._slot = slot
+        self._generation = slot.generation
+
+    @property
+    def valid(self) -> bool:
+        """Whether we still own our slot."""
+        return (
+            self._slot.generation == self._generation
+            and bool(self._slot.node)
+            and self._slot.expires_at > bs.time()
+        )
+
+
+class PopupTextPool:
+    """Shows popup texts using a bounded set of recycled nodes.
+
+    category: Gameplay Classes
+
+    Works like PopupText, but instead of creating and deleting nodes
+    for every popup, up to MAX_SLOTS sets of nodes are kept around and
+    reused round-robin; when all of them are in use the oldest popup
+    gets replaced. Their animation curves are kept too and just get
+    new keys. On top of that no more than MAX_PER_SECOND popups are
+    shown per second; anything past that is dropped, unless it's
+    shown with ``rate_limited=False``. Use PopupTextPool.get() to
+    return the pool for the current activity.
+    """
+
+    MAX_SLOTS = 24
+    """How many popups can be up at once."""
+
+    MAX_PER_SECOND = 30
+    """How many popups can be shown per second."""
+
+    _STORENAME = bs.storagename()
+
+    def __init__(self) -> None:
+        """Instantiate a pool; use get() instead."""
+        # Least recently used first.
+        self._slots: deque[_PoolSlot] = deque()
+        self._recent: deque[float] = deque()
+
+    @classmethod
+    def get(cls) -> PopupTextPool:
+        """Get/create a shared PopupTextPool object."""
+        activity = bs.getactivity()
+        pool = activity.customdata.get(cls._STORENAME)
+        if pool is None:
+            pool = activity.customdata[cls._STORENAME] = PopupTextPool()
+        assert isinstance(pool, PopupTextPool)
+        return pool
+
+    def show(
+        self,
+        text: str | bs.Lstr,
+        position: Sequence[float] = (0.0, 0.0, 0.0),
+        color: Sequence[float] = (1.0, 1.0, 1.0, 1.0),
+        random_offset: float = 0.5,
+        offset: Sequence[float] = (0.0, 0.0, 0.0),
+        scale: float = 1.0,
+        reuse: PooledPopup | None = None,
+        rate_limited: bool = True,
+    ) -> PooledPopup | None:
+        """Show a popup; takes the same values as PopupText.
+
+        If ``reuse`` is a popup that is still up, it gets replaced
+        in place instead of showing a second one. Returns None if the
+        popup was dropped by the rate limit; pass ``rate_limited=False``
+        for popups that must always show (they still count toward it).
+        """
+        now = bs.time()
+        recent = self._recent
+        while recent and recent[0] <= now - 1.0:
+            recent.popleft()
+        if rate_limited and len(recent) >= self.MAX_PER_SECOND:
+            return None
+        recent.append(now)
+
+        slot = self._take_slot(now, reuse)
+        slot.generation += 1
+        slot.expires_at = now + POPUP_LIFESPAN
+        self._slots.append(slot)
+
+        slot.node.text = text
+        slot.animate(
+            _jitter(position, offset, random_offset), _rgba(color), scale
+        )
+        return PooledPopup(slot)
+
+    def _take_slot(self, now: float, reuse: PooledPopup | None) -> _PoolSlot:
+        # pylint: disable=protected-access
+        slots = self._slots
+        if reuse is not None and reuse.valid:
+            slots.remove(reuse._slot)
+            return reuse._slot
+
+        # Drop slots whose nodes died along with their scene.
+        while slots and not slots[0].node:
+            slots.popleft()
+
+        # Grow until we're full, unless the oldest slot is free anyway;
+        # once full, the oldest popup gets evicted.
+        if slots and (
+            slots[0].expires_at <= now or len(slots) >= self.MAX_SLOTS
+        ):
+            return slots.popleft()
+        return _PoolSlot()
@@ -5,6 +5,7 @@
 
 from __future__ import annotations
 
+import copy
 import random
 import logging
 from typing import TYPE_CHECKING, override
@@ -15,7 +16,11 @@ from bascenev1lib.actor.bomb import Bomb, Blast
 from bascenev1lib.actor.powerupbox import PowerupBoxFactory, PowerupBox
 from bascenev1lib.actor.spazfactory import SpazFactory
 from bascenev1lib.gameutils import SharedObjects
-from bascenev1lib.actor.popuptext import PopupText
+from bascenev1lib.actor.popuptext import PopupTextPool, PooledPopup
+from bascenev1lib.actor.healthhud import HealthHUD, CompactHealthHUD
+from bascenev1lib.actor.healovertime import HealOverTime
+from bascenev1lib.actor.ticker import ActorTicker
+from bascenev1lib.actor.damageresolver import DamageResolver
 
 
 if TYPE_CHECKING:
@@ -29,6 +34,12 @@ DAMAGE_STACK_TIME = 1.0
 BASE_PUNCH_POWER_SCALE = 1.2
 BASE_PUNCH_COOLDOWN = 400
 
+# Values Spaz._capture_state() keeps; anything else lives with one node.
+_PLAIN_TYPES = (bool, int, float, str, tuple, type(None))
+
+# Stands in for the other values Spaz._capture_state() saw.
+_KEPT = object()
+
 
 class PickupMessage:
     """We wanna pick something up."""
@@ -153,42 +164,43 @@ class Spaz(bs.Actor):
         media = factory.get_media(character)
         punchmats = (factory.punch_material, shared.attack_material)
         pickupmats = (factory.pickup_material, shared.pickup_material)
+        # Kept around so a recycled spaz can get a node just like this one
+        # (see _revive()).
+        self._node_attrs: dict[str, Any] = {
+            'color': color,
+            'behavior_version': 0 if demo_mode else 1,
+            'demo_mode': demo_mode,
+            'highlight': highlight,
+            'jump_sounds': media['jump_sounds'],
+            'attack_sounds': media['attack_sounds'],
+            'impact_sounds': media['impact_sounds'],
+            'death_sounds': media['death_sounds'],
+            'pickup_sounds': media['pickup_sounds'],
+            'fall_sounds': media['fall_sounds'],
+            'color_texture': media['color_texture'],
+            'color_mask_texture': media['color_mask_texture'],
+            'head_mesh': media['head_mesh'],
+            'torso_mesh': media['torso_mesh'],
+            'pelvis_mesh': media['pelvis_mesh'],
+            'upper_arm_mesh': media['upper_arm_mesh'],
+            'forearm_mesh': media['forearm_mesh'],
+            'hand_mesh': media['hand_mesh'],
+            'upper_leg_mesh': media['upper_leg_mesh'],
+            'lower_leg_mesh': media['lower_leg_mesh'],
+            'toes_mesh': media['toes_mesh'],
+            'style': factory.get_style(character),
+            'fly': self.fly,
+            'hockey': self._hockey,
+            'materials': materials,
+            'roller_materials': roller_materials,
+            'extras_material': extras_material,
+            'punch_materials': punchmats,
+            'pickup_materials': pickupmats,
+            'invincible': start_invincible,
+            'source_player': source_player,
+        }
         self.node: bs.Node = bs.newnode(
-            type='spaz',
-            delegate=self,
-            attrs={
-                'color': color,
-                'behavior_version': 0 if demo_mode else 1,
-                'demo_mode': demo_mode,
-                'highlight': highlight,
-                'jump_sounds': media['jump_sounds'],
-                'attack_sounds': media['attack_sounds'],
-                'impact_sounds': media['impact_sounds'],
-                'death_sounds': media['death_sounds'],
-                'pickup_sounds': media['pickup_sounds'],
-                'fall_sounds': media['fall_sounds'],
-                'color_texture': media['color_texture'],
-                'color_mask_texture': media['color_mask_texture'],
-                'head_mesh': media['head_mesh'],
-                'torso_mesh': media['torso_mesh'],
-                'pelvis_mesh': media['pelvis_mesh'],
-                'upper_arm_mesh': media['upper_arm_mesh'],
-                'forearm_mesh': media['forearm_mesh'],
-                'hand_mesh': media['hand_mesh'],
-                'upper_leg_mesh': media['upper_leg_mesh'],
-                'lower_leg_mesh': media['lower_leg_mesh'],
-                'toes_mesh': media['toes_mesh'],
-                'style': factory.get_style(character),
-                'fly': self.fly,
-                'hockey': self._hockey,
-                'materials': materials,
-                'roller_materials': roller_materials,
-                'extras_material': extras_material,
-                'punch_materials': punchmats,
-                'pickup_materials': pickupmats,
-                'invincible': start_invincible,
-                'source_player': source_player,
-            },
+            type='spaz', delegate=self, attrs=self._node_attrs
         )
         self.shield: bs.Node | None = None
 
@@ -267,92 +279,15 @@ class Spaz(bs.Actor):
             self.team = bs.Team()
 
              
-        self._hp_text = bs.newnode(
-            'text',
-            owner=self.node,
-            attrs={
-                'text': '',
-                'in_world': True,
-                'scale': self.HEALTH_UI_SCALE,
-                'shadow': 0.5,
-                'flatness': 1.0,
-                'h_align': 'left',
-                'v_align': 'center',
-                'color': self.HEALTH_UI_HP_COLOR,
-                'opacity': self.HEALTH_UI_TRANSPARANCY 
-            }
-        )
-
-        self._shield_text = bs.newnode(
-            'text',
-            owner=self.node,
-            attrs={
-                'text': '',
-                'in_world': True,
-                'scale': self.HEALTH_UI_SCALE,
-                'shadow': 0.5,
-                'flatness': 1.0,
-                'h_align': 'left',
-                'v_align': 'center',
-                'color': self.HEALTH_UI_SHIELD_COLOR,
-                'opacity': self.HEALTH_UI_TRANSPARANCY 
-            }
-        )
-
-        self._armor_text = bs.newnode(
-            'text',
-            owner=self.node,
-            attrs={
-                'text': '',
-                'in_world': True,
-                'scale': self.HEALTH_UI_SCALE,
-                'shadow': 0.5,
-                'flatness': 1.0,
-                'h_align': 'left',
-                'v_align': 'center',
-                'color': self.HEALTH_UI_ARMOR_COLOR,
-                'opacity': self.HEALTH_UI_TRANSPARANCY 
-            }
-        )
-        self._energy_text = bs.newnode(
-            'text',
-            owner=self.node,
-            attrs={
-                'text': '',
-                'in_world': True,
-                'scale': self.HEALTH_UI_SCALE,
-                'shadow': 0.5,
-                'flatness': 1.0,
-                'h_align': 'left',
-                'v_align': 'center',
-                'color': self.HEALTH_UI_ENERGY_COLOR,
-                'opacity': self.HEALTH_UI_TRANSPARANCY 
-            }
-        )
-        # i hate math
-        self._hp_offset = bs.newnode('math', owner=self.node, attrs={'operation': 'add'})
-        self.node.connectattr('position', self._hp_offset, 'input1')
-        self._hp_offset.input2 = (0, 0, 0.0)
-        self._hp_offset.connectattr('output', self._hp_text, 'position')
-
-        self._shield_offset = bs.newnode('math', owner=self.node, attrs={'operation': 'add'})
-        self.node.connectattr('position', self._shield_offset, 'input1')
-        self._shield_offset.input2 = (0, 0, 0.0)
-        self._shield_offset.connectattr('output', self._shield_text, 'position')
-
-        self._energy_offset = bs.newnode('math', owner=self.node, attrs={'operation': 'add'})
-        self.node.connectattr('position', self._energy_offset, 'input1')
-        self._energy_offset.input2 = (0, 0, 0.0)
-        self._energy_offset.connectattr('output', self._energy_text, 'position')
-        
-
-        self._armor_offset = bs.newnode('math', owner=self.node, attrs={'operation': 'add'})
-        self.node.connectattr('position', self._armor_offset, 'input1')
-        self._armor_offset.input2 = (0, 0, 0.0)
-        self._armor_offset.connectattr('output', self._armor_text, 'position')
+        self.health_hud: HealthHUD | CompactHealthHUD
+        if activity.compact_health_hud:
+            self.health_hud = CompactHealthHUD(self)
+        else:
+            self.health_hud = HealthHUD(self)
 
         self._damage_stack_last_time: float = -9999.9
         self._damage_stack: int = 0
+        self.damagepopup: PooledPopup | None = None
         # here are some extra hp values i want to use
         self.armorHP = 0
         self.armorHP_max = 0
@@ -365,12 +300,13 @@ class Spaz(bs.Actor):
         self.last_damage_time = bs.time()
         self.shield_regen_rate = 50
         self.shield_regen_delay = 2.5
-        self._shield_regen_timer: bs.Timer | None = None
-        self._shield_regen_timer = bs.Timer(
-            0.5, bs.WeakCall(self._shield_regen_tick), repeat=True
+        ticker = ActorTicker.get()
+        self._tick_handle = ticker.register(self.tick, 0.1)
+        self._shield_regen_handle = ticker.register(
+            self._shield_regen_tick, 0.5
         )
-        bs.timer(0.1, self.tick, repeat=True)
         self.no_more_epic_sound=False
+        self._heal_over_time: HealOverTime | None = None
 
     def tick(self):
         # simple ticks
@@ -399,113 +335,27 @@ class Spaz(bs.Actor):
         if instant:
             self.hitpoints += total_heal * self.impact_scale
 
-            PopupText(
+            PopupTextPool.get().show(
                 text=f"+{int(total_heal/10)}",
                 position=self.node.position,
                 color=(0.2, 1.0, 0.2),
                 scale=1.3,
                 random_offset=0.6,
-            ).autoretain()
-            return
-
-        tick_rate = 0.1
-        ticks = max(1, int(duration / tick_rate))
-        heal_per_tick = max(1, total_heal // ticks)
-
-        healed = 0
-
-        def heal_tick():
-            nonlocal healed
-            if not self.is_alive():
-                return
-
-            remaining = total_heal - healed
-            if remaining <= 0:
-                return
-
-            amt = min(heal_per_tick, remaining) * self.impact_scale
-            healed += amt
-            self.hitpoints = min(
-                self.hitpoints + amt,
-                self.hitpoints_max,
             )
+            return
 
-            PopupText(
-                text=f"+",
-                position=self.node.position,
-                color=(0.2, 1.0, 0.2),
-                scale=0.55,
-                random_offset=0.7,
-            ).autoretain()
-
-        for i in range(ticks):
-            bs.timer(i * tick_rate, heal_tick)
+        if self._heal_over_time is None:
+            self._heal_over_time = HealOverTime(self)
+        self._heal_over_time.add(total_heal, duration)
 
     def _update_health_text(self) -> None:
-       
-        try:
-
-            x = self.HEALTH_UI_BASE_X_OFFSET
-
-            hp_text = f"x{int(self.hitpoints/10)}"
-            self._hp_text.text = hp_text
-            hp_width = len(hp_text) * self.HEALTH_UI_CHAR_WIDTH_HP
-            self._hp_offset.input2 = (
-                x,
-                self.HEALTH_UI_Y_OFFSET,
-                0,
-            )
-            x += hp_width + self.HEALTH_UI_SPACING_SMALL
-
-            if self.shieldHP > 0:
-                shield_text = f"{int(self.shieldHP/10)}"
-                self._shield_text.text = f"| {shield_text}"
-                shield_width = len(shield_text) * self.HEALTH_UI_CHAR_WIDTH_SHIELD
-                self._shield_offset.input2 = (
-                    x,
-                    self.HEALTH_UI_Y_OFFSET,
-                    0,
-                )
-                x += shield_width + self.HEALTH_UI_SPACING_SMALL
-            else:
-                self._shield_text.text = ''
-                self.shieldHP = 0
-                
+        # the hud only knows how to draw positive layers, keep 'em sane
+        if self.shieldHP < 0:
+            self.shieldHP = 0
+        if self.armorHP < 0:
+            self.armorHP = 0
+        self.health_hud.update()
 
-            if self.armorHP > 0:
-                armor_text = f"{int(self.armorHP/10)}"
-                self._armor_text.text = f"| {armor_text}"
-                armor_width = len(armor_text) * self.HEALTH_UI_CHAR_WIDTH_ARMOR
-                self._armor_offset.input2 = (
-                    x,
-                    self.HEALTH_UI_Y_OFFSET,
-                    0,
-                )
-                x += armor_width + self.HEALTH_UI_SPACING_SMALL
-            else:
-                self._armor_text.text = ''
-                self.armorHP = 0
-
-            try:
-                if self.shield_hitpoints > 0:
-                    energy_text = f"{int(self.shield_hitpoints/10)}"
-                    self._energy_text.text = f"| {energy_text}"
-                    self._energy_offset.input2 = (
-                        x,
-                        self.HEALTH_UI_Y_OFFSET,
-                        0,
-                    )
-                else:
-                    self._energy_text.text = ''
-            except:
-                self._energy_text.text = ''
-        except bs.NodeNotFoundError:
-            if not self.exists():
-                self._armor_text.delete()
-                self._hp_text.delete()
-                self._shield_text.delete()
-                self._energy_text.delete()
-        
     def _shield_regen_tick(self) -> None:
         if not self.is_alive():
             return
@@ -523,10 +373,77 @@ class Spaz(bs.Actor):
     def exists(self) -> bool:
         return bool(self.node)
 
+    def _capture_state(self) -> dict[str, Any]:
+        """Return the values _revive() needs to make us new again.
+
+        That's our plain values (stats, cooldowns, flags, times),
+        which of our containers are empty and the names of everything
+        else we have; call this right after construction.
+        """
+        return {
+            key: (
+                value
+                if isinstance(value, _PLAIN_TYPES)
+                or (isinstance(value, (list, dict, set)) and not value)
+                else _KEPT
+            )
+            for key, value in vars(self).items()
+        }
+
+    def _revive(self, state: dict[str, Any]) -> None:
+        """Bring a dead spaz whose node is gone back as it was when new.
+
+        ``state`` is what _capture_state() returned back then. Plain
+        values and empty containers are put back as they were (which
+        also drops any timers we were holding on to), anything we
+        picked up since is dropped, and the node and health readout are
+        made anew. Our ticks keep going as they are.
+        """
+        assert not self.node and not self.expired
+        if self._heal_over_time is not None:
+            self._heal_over_time.stop()
+        values = vars(self)
+        for key in [key for key in values if key not in state]:
+            del values[key]
+        values.update(
+            {
+                key: copy.copy(value)
+                for key, value in state.items()
+                if value is not _KEPT
+            }
+        )
+        self.last_damage_time = bs.time()
+        self.shield = None
+        self.damagepopup = None
+        self.node = bs.newnode(
+            type='spaz', delegate=self, attrs=self._node_attrs
+        )
+        self.health_hud = type(self.health_hud)(self)
+        if self._node_attrs['invincible']:
+            bs.timer(
+                1.0,
+                bs.WeakCall(self._revive_invincibility_off, self.node),
+            )
+        if self.default_boxing_gloves:
+            self.equip_boxing_gloves()
+        if self.default_shields:
+            self.equip_shields()
+
+    def _revive_invincibility_off(self, node: bs.Node) -> None:
+        if node and node is self.node:
+            node.invincible = False
+
     @override
     def on_expire(self) -> None:
         super().on_expire()
 
+        # Stop our periodic updates.
+        self._tick_handle.cancel()
+        self._shield_regen_handle.cancel()
+        if self._heal_over_time is not None:
+            self._heal_over_time.stop()
+            self._heal_over_time = None
+
         # Release callbacks/refs so we don't wind up with dependency loops.
         self._dropped_bomb_callbacks = []
         self.punch_callback = None
@@ -1487,25 +1404,7 @@ class Spaz(bs.Actor):
                     self.node.hold_node = None
                 
                 # here we handle our epic new hp bars
-                remaining_damage = damage
-
-                # Armor absorbs damage first by 50% so basically 50 armor is 100 hp
-                if self.armorHP > 0 and remaining_damage > 0:
-                    absorbed = min(remaining_damage, self.armorHP * 2)
-                    armor_damage = absorbed * 0.5
-
-                    self.armorHP -= int(armor_damage)
-                    remaining_damage -= absorbed
-
-                # Shield absorbs next
-                if self.shieldHP > 0 and remaining_damage > 0:
-                    absorbed = min(self.shieldHP, remaining_damage)
-                    self.shieldHP -= absorbed
-                    remaining_damage -= absorbed
-
-                # HP absorbs last
-                if remaining_damage > 0:
-                    self.hitpoints -= remaining_damage
+                DamageResolver.get().apply(self, damage, msg.hit_type)
 
                 self.node.hurt = (
                     1.0 - float(self.hitpoints) / self.hitpoints_max
@@ -1568,11 +1467,12 @@ class Spaz(bs.Actor):
                     
                 if int(incoming_damage) != 0:
                     assert msg.force_direction is not None
-                    self.damagepopup = PopupText(
+                    self.damagepopup = PopupTextPool.get().show(
                             damage_str,
                             color=bs.safecolor(self.node.color),
                             scale=1 * 1.3 if not self.is_alive() and not self.no_more_epic_sound else 1,
-                            position = self.node.position
+                            position = self.node.position,
+                            reuse=self.damagepopup,
                             )
                     if not self.is_alive() and not self.no_more_epic_sound:
                             
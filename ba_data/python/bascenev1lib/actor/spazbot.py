@@ -5,16 +5,21 @@
 
 from __future__ import annotations
 
+import math
+import time
 import random
 import weakref
 import logging
+from array import array
+from collections import deque
 from typing import TYPE_CHECKING, override
 
 import bascenev1 as bs
 from bascenev1lib.actor.spaz import Spaz
+from bascenev1lib.actor.navgrid import NavGrid, FlowField
 
 if TYPE_CHECKING:
-    from typing import Any, Sequence, Callable
+    from typing import Any, Sequence, Callable, Iterable
     from bascenev1lib.actor.flag import Flag
 
 LITE_BOT_COLOR = (1.2, 0.9, 0.2)
@@ -70,6 +75,239 @@ class SpazBotDiedMessage:
         self.how = how
 
 
+class PlayerPointGrid:
+    """Player positions and velocities, bucketed for bots to search.
+
+    Category: **Gameplay Classes**
+
+    A bs.SpazBotSet builds one of these per update and all of its bots
+    share it, so finding a bot's target only looks at the grid cells
+    around it instead of at every player. Values are kept as plain
+    floats; bs.Vec3s only get made for the target a bot ends up with.
+    """
+
+    cell_size = 4.0
+    """Size of a grid cell on the x and z axes."""
+
+    linear_max = 8
+    """With this many points or fewer, just scan all of them."""
+
+    max_drop = 5.0
+    """Ignore points this far (or more) below the searching bot, so bots
+    don't follow players off cliffs."""
+
+    def __init__(
+        self, pts: Iterable[tuple[Sequence[float], Sequence[float]]] = ()
+    ) -> None:
+        # x, y, z, vel-x, vel-y, vel-z for every point.
+        self._data = array('d')
+        self._cells: dict[tuple[int, int], list[int]] = {}
+        self._min_cell = (0, 0)
+        self._max_cell = (0, 0)
+        for pos, vel in pts:
+            self.add(pos, vel)
+
+    def __len__(self) -> int:
+        return len(self._data) // 6
+
+    def add(self, position: Sequence[float], velocity: Sequence[float]) -> None:
+        """Add a player's position and velocity."""
+        offset = len(self._data)
+        self._data.extend(
+            (
+                position[0],
+                position[1],
+                position[2],
+                velocity[0],
+                velocity[1],
+                velocity[2],
+            )
+        )
+        cellx = math.floor(position[0] / self.cell_size)
+        cellz = math.floor(position[2] / self.cell_size)
+        if offset:
+            self._min_cell = (
+                min(self._min_cell[0], cellx),
+                min(self._min_cell[1], cellz),
+            )
+            self._max_cell = (
+                max(self._max_cell[0], cellx),
+                max(self._max_cell[1], cellz),
+            )
+        else:
+            self._min_cell = self._max_cell = (cellx, cellz)
+        self._cells.setdefault((cellx, cellz), []).append(offset)
+
+    def nearest(
+        self, position: Sequence[float]
+    ) -> tuple[bs.Vec3 | None, bs.Vec3 | None]:
+        """Return the position and velocity of the point closest to
+        ``position``, leaving out ones that are too far below it.
+
+        Both values will be None if there's no such point.
+        """
+        offset = self._find(position)
+        if offset == -1:
+            return None, None
+        data = self._data
+        return (
+            bs.Vec3(data[offset], data[offset + 1], data[offset + 2]),
+            bs.Vec3(data[offset + 3], data[offset + 4], data[offset + 5]),
+        )
+
+    def nearest_xz(
+        self, position: Sequence[float]
+    ) -> tuple[float, float, float, float] | None:
+        """Like nearest(), but as plain (x, z, vel-x, vel-z) floats."""
+        offset = self._find(position)
+        if offset == -1:
+            return None
+        data = self._data
+        return (
+            data[offset],
+            data[offset + 2],
+            data[offset + 3],
+            data[offset + 5],
+        )
+
+    def _find(self, position: Sequence[float]) -> int:
+        data = self._data
+        x, y, z = position[0], position[1], position[2]
+        min_y = y - self.max_drop
+        best = -1
+        best_dist = 0.0
+
+        if len(data) <= self.linear_max * 6:
+            for offset in range(0, len(data), 6):
+                if data[offset + 1] <= min_y:
+                    continue
+                dx = data[offset] - x
+                dy = data[offset + 1] - y
+                dz = data[offset + 2] - z
+                dist = dx * dx + dy * dy + dz * dz
+                if best == -1 or dist < best_dist:
+                    best = offset
+                    best_dist = dist
+            return best
+
+        # Search rings of cells around us, going outward until nothing
+        # further out could beat what we've got.
+        cellx = math.floor(x / self.cell_size)
+        cellz = math.floor(z / self.cell_size)
+        max_ring = max(
+            cellx - self._min_cell[0],
+            self._max_cell[0] - cellx,
+            cellz - self._min_cell[1],
+            self._max_cell[1] - cellz,
+        )
+        cells = self._cells
+        for ring in range(max_ring + 1):
+            for key in self._ring(cellx, cellz, ring):
+                bucket = cells.get(key)
+                if bucket is None:
+                    continue
+                for offset in bucket:
+                    if data[offset + 1] <= min_y:
+                        continue
+                    dx = data[offset] - x
+                    dy = data[offset + 1] - y
+                    dz = data[offset + 2] - z
+                    dist = dx * dx + dy * dy + dz * dz
+                    if best == -1 or dist < best_dist:
+                        best = offset
+                        best_dist = dist
+            # Anything in the next ring out is at least this far away.
+            reach = ring * self.cell_size
+            if best != -1 and best_dist <= reach * reach:
+                break
+        return best
+
+    @staticmethod
+    def _ring(
+        cellx: int, cellz: int, ring: int
+    ) -> Iterable[tuple[int, int]]:
+        if ring == 0:
+            return ((cellx, cellz),)
+        keys = []
+        for i in range(-ring, ring + 1):
+            keys.append((cellx + i, cellz - ring))
+            keys.append((cellx + i, cellz + ring))
+        for i in range(-ring + 1, ring):
+            keys.append((cellx - ring, cellz + i))
+            keys.append((cellx + ring, cellz + i))
+        return keys
+
+
+def _lead_targets(inputs: array) -> array:
+    """Do the targeting math for a batch of bots in one pass.
+
+    Takes (our-x, our-z, target-x, target-z, target-vel-x,
+    target-vel-z, lead-amount) per bot and returns (distance to the
+    target, distance to the led target, direction-x, direction-z) per
+    bot; all on the ground plane.
+    """
+    outputs = array('d', bytes(len(inputs) // 7 * 4 * 8))
+    sqrt = math.sqrt
+    out = 0
+    for i in range(0, len(inputs), 7):
+        our_x, our_z = inputs[i], inputs[i + 1]
+        dx = inputs[i + 2] - our_x
+        dz = inputs[i + 3] - our_z
+        dist_raw = sqrt(dx * dx + dz * dz)
+
+        # Use a point out in front of them as real target.
+        # (more out in front the farther from us they are)
+        lead = dist_raw * 0.3 * inputs[i + 6]
+        dx += inputs[i + 4] * lead
+        dz += inputs[i + 5] * lead
+        dist = sqrt(dx * dx + dz * dz)
+        outputs[out] = dist_raw
+        outputs[out + 1] = dist
+        if dist > 0.0:
+            outputs[out + 2] = dx / dist
+            outputs[out + 3] = dz / dist
+        out += 4
+    return outputs
+
+
+def update_bot_ais(bots: Sequence[SpazBot]) -> None:
+    """Update the AI of a bunch of bots in one go.
+
+    Category: **Gameplay Functions**
+
+    Does the same as calling update_ai() on each of them, but gathers
+    every bot's position and target first and does all their targeting
+    math in one pass over flat arrays; only the resulting movement and
+    button presses get handed back to the nodes.
+    """
+    batch: list[tuple[SpazBot, bool]] = []
+    inputs = array('d')
+    for bot in bots:
+        # Bots with their own update_ai() get left to it.
+        if type(bot).update_ai is not SpazBot.update_ai:
+            bot.update_ai()
+            continue
+        # pylint: disable=protected-access
+        target = bot._prepare_ai()
+        if target is None:
+            continue
+        *values, can_attack = target
+        inputs.extend(values)
+        inputs.append(bot._lead_amount)
+        batch.append((bot, can_attack))
+    if not batch:
+        return
+    outputs = _lead_targets(inputs)
+    for i, (bot, can_attack) in enumerate(batch):
+        # pylint: disable=protected-access
+        bot._steer_ai(
+            inputs[i * 7],
+            inputs[i * 7 + 1],
+            outputs[i * 4 : i * 4 + 4],
+            can_attack,
+        )
+
+
 class SpazBot(Spaz):
     """A really dumb AI version of bs.Spaz.
 
@@ -145,7 +383,17 @@ class SpazBot(Spaz):
 
         self._throw_release_time: float | None = None
         self._have_dropped_throw_bomb: bool | None = None
-        self._player_pts: list[tuple[bs.Vec3, bs.Vec3]] | None = None
+        self._target_grid: PlayerPointGrid | None = None
+        self._flow_field: FlowField | None = None
+
+        # The bot-set we're in, which wants to know when we're gone.
+        self._bot_set: weakref.ref[SpazBotSet] | None = None
+
+        # How far our target was as of our last AI update, and how many
+        # of our bot-set's visits to skip before the next one (bot-sets
+        # slow down AI updates for bots with nothing going on).
+        self._target_dist = 0.0
+        self._ai_skips_left = 0
 
         # These cooldowns didn't exist when these bots were calibrated,
         # so take them out of the equation.
@@ -164,61 +412,52 @@ class SpazBot(Spaz):
         assert mval is not None
         return mval
 
-    def _get_target_player_pt(self) -> tuple[bs.Vec3 | None, bs.Vec3 | None]:
-        """Returns the position and velocity of our target.
-
-        Both values will be None in the case of no target.
-        """
-        assert self.node
-        botpt = bs.Vec3(self.node.position)
-        closest_dist: float | None = None
-        closest_vel: bs.Vec3 | None = None
-        closest: bs.Vec3 | None = None
-        assert self._player_pts is not None
-        for plpt, plvel in self._player_pts:
-            dist = (plpt - botpt).length()
-
-            # Ignore player-points that are significantly below the bot
-            # (keeps bots from following players off cliffs).
-            if (closest_dist is None or dist < closest_dist) and (
-                plpt[1] > botpt[1] - 5.0
-            ):
-                closest_dist = dist
-                closest_vel = plvel
-                closest = plpt
-        if closest_dist is not None:
-            assert closest_vel is not None
-            assert closest is not None
-            return (
-                bs.Vec3(closest[0], closest[1], closest[2]),
-                bs.Vec3(closest_vel[0], closest_vel[1], closest_vel[2]),
-            )
-        return None, None
-
     def set_player_points(self, pts: list[tuple[bs.Vec3, bs.Vec3]]) -> None:
         """Provide the spaz-bot with the locations of its enemies."""
-        self._player_pts = pts
+        self._target_grid = PlayerPointGrid(pts)
+
+    def set_target_grid(self, grid: PlayerPointGrid) -> None:
+        """Provide the spaz-bot with a (shared) grid of its enemies."""
+        self._target_grid = grid
+
+    def set_flow_field(self, field: FlowField | None) -> None:
+        """Provide the spaz-bot with a (shared) way around the map."""
+        self._flow_field = field
 
     def update_ai(self) -> None:
         """Should be called periodically to update the spaz' AI."""
+        target = self._prepare_ai()
+        if target is None:
+            return
+        *values, can_attack = target
+        self._steer_ai(
+            values[0],
+            values[1],
+            _lead_targets(array('d', (*values, self._lead_amount))),
+            can_attack,
+        )
+
+    def _prepare_ai(
+        self,
+    ) -> tuple[float, float, float, float, float, float, bool] | None:
+        """Do the parts of an AI update that don't need a target.
+
+        Returns None if that was all there was to do, or else our
+        position, our target's position and velocity (as x and z values)
+        and whether we can attack it.
+        """
         # pylint: disable=too-many-branches
-        # pylint: disable=too-many-statements
-        # pylint: disable=too-many-locals
         if self.update_callback is not None:
             if self.update_callback(self):
                 # Bot has been handled.
-                return
+                return None
 
         if not self.node:
-            return
+            return None
 
         pos = self.node.position
-        our_pos = bs.Vec3(pos[0], 0, pos[2])
         can_attack = True
 
-        target_pt_raw: bs.Vec3 | None
-        target_vel: bs.Vec3 | None
-
         # If we're a flag-bearer, we're pretty simple-minded - just walk
         # towards the flag and try to pick it up.
         if self.target_flag:
@@ -236,7 +475,7 @@ class SpazBot(Spaz):
             # Otherwise try to go pick it up.
             elif self.target_flag.node:
                 target_pt_raw = bs.Vec3(*self.target_flag.node.position)
-                diff = target_pt_raw - our_pos
+                diff = target_pt_raw - bs.Vec3(pos[0], 0, pos[2])
                 diff = bs.Vec3(diff[0], 0, diff[2])  # Don't care about y.
                 dist = diff.length()
                 to_target = diff.normalized()
@@ -245,7 +484,7 @@ class SpazBot(Spaz):
                 if self.node.hold_node:
                     self.node.pickup_pressed = True
                     self.node.pickup_pressed = False
-                    return
+                    return None
 
                 # If we're a runner, run only when not super-near the flag.
                 if self.run and dist > 3.0:
@@ -260,7 +499,7 @@ class SpazBot(Spaz):
                 if dist < 1.25:
                     self.node.pickup_pressed = True
                     self.node.pickup_pressed = False
-            return
+            return None
 
         # Not a flag-bearer. If we're holding anything but a bomb, drop it.
         if self.node.hold_node:
@@ -268,15 +507,17 @@ class SpazBot(Spaz):
             if not holding_bomb:
                 self.node.pickup_pressed = True
                 self.node.pickup_pressed = False
-                return
+                return None
 
-        target_pt_raw, target_vel = self._get_target_player_pt()
+        # From here on only where things are on the ground plane matters.
+        assert self._target_grid is not None
+        target = self._target_grid.nearest_xz(pos)
 
-        if target_pt_raw is None:
+        if target is None:
             # Use default target if we've got one.
             if self.target_point_default is not None:
-                target_pt_raw = self.target_point_default
-                target_vel = bs.Vec3(0, 0, 0)
+                default = self.target_point_default
+                target = (default[0], default[2], 0.0, 0.0)
                 can_attack = False
 
             # With no target, we stop moving and drop whatever we're holding.
@@ -286,24 +527,30 @@ class SpazBot(Spaz):
                 if self.node.hold_node:
                     self.node.pickup_pressed = True
                     self.node.pickup_pressed = False
-                return
+                self._target_dist = math.inf
+                return None
 
-        # We don't want height to come into play.
-        target_pt_raw[1] = 0.0
-        assert target_vel is not None
-        target_vel[1] = 0.0
+        return pos[0], pos[2], *target, can_attack
 
-        dist_raw = (target_pt_raw - our_pos).length()
-
-        # Use a point out in front of them as real target.
-        # (more out in front the farther from us they are)
-        target_pt = (
-            target_pt_raw + target_vel * dist_raw * 0.3 * self._lead_amount
-        )
+    def _steer_ai(
+        self,
+        our_x: float,
+        our_z: float,
+        targeting: Sequence[float],
+        can_attack: bool,
+    ) -> None:
+        """Move and attack based on where our target is.
 
-        diff = target_pt - our_pos
-        dist = diff.length()
-        to_target = diff.normalized()
+        ``targeting`` is our distance to the target, our distance to
+        the point we're leading it to and the x and z direction to that
+        point (as worked out by _lead_targets()).
+        """
+        # pylint: disable=too-many-branches
+        # pylint: disable=too-many-statements
+        if not self.node:
+            return
+        dist_raw, dist, dir_x, dir_z = targeting
+        self._target_dist = dist_raw
 
         if self._mode == 'throw':
             # We can only throw if alive and well.
@@ -354,8 +601,8 @@ class SpazBot(Spaz):
                     else:
                         # Earlier we can hold or move backward for a whiplash.
                         speed = 0.0125
-                self.node.move_left_right = to_target.x * speed
-                self.node.move_up_down = to_target.z * -1.0 * speed
+                self.node.move_left_right = dir_x * speed
+                self.node.move_up_down = dir_z * -1.0 * speed
 
         elif self._mode == 'charge':
             if random.random() < 0.3:
@@ -374,15 +621,21 @@ class SpazBot(Spaz):
                     self._running = False
                     self.node.run = 0.0
 
-            self.node.move_left_right = to_target.x * self._charge_speed
-            self.node.move_up_down = to_target.z * -1.0 * self._charge_speed
+            # Rather than charging off a cliff, go around.
+            move_x, move_z = dir_x, dir_z
+            if self._flow_field is not None:
+                move_x, move_z = self._flow_field.steer(
+                    our_x, our_z, dir_x, dir_z, dist
+                )
+            self.node.move_left_right = move_x * self._charge_speed
+            self.node.move_up_down = move_z * -1.0 * self._charge_speed
 
         elif self._mode == 'wait':
             # Every now and then, aim towards our target.
             # Other than that, just stand there.
             if int(bs.time() * 1000.0) % 1234 < 100:
-                self.node.move_left_right = to_target.x * (400.0 / 33000)
-                self.node.move_up_down = to_target.z * (-400.0 / 33000)
+                self.node.move_left_right = dir_x * (400.0 / 33000)
+                self.node.move_up_down = dir_z * (-400.0 / 33000)
             else:
                 self.node.move_left_right = 0
                 self.node.move_up_down = 0
@@ -396,8 +649,8 @@ class SpazBot(Spaz):
             else:
                 self._running = False
                 self.node.run = 0.0
-            self.node.move_left_right = to_target.x * -1.0
-            self.node.move_up_down = to_target.z
+            self.node.move_left_right = dir_x * -1.0
+            self.node.move_up_down = dir_z
 
         # We might wanna switch states unless we're doing a throw
         # (in which case that's our sole concern).
@@ -439,7 +692,7 @@ class SpazBot(Spaz):
             elif dist < self.charge_dist_min and not self._charge_closing_in:
                 # ..unless we're near an edge, in which case we've got no
                 # choice but to charge.
-                if self.map.is_point_near_edge(our_pos, self._running):
+                if self.map.is_xz_near_edge(our_x, our_z, self._running):
                     if self._mode != 'charge':
                         self._mode = 'charge'
                         self._lead_amount = 0.2
@@ -453,7 +706,7 @@ class SpazBot(Spaz):
             elif (
                 dist < self.charge_dist_max
                 or dist > self.throw_dist_max
-                or self.map.is_point_near_edge(our_pos, self._running)
+                or self.map.is_xz_near_edge(our_x, our_z, self._running)
             ):
                 if self._mode != 'charge':
                     self._mode = 'charge'
@@ -500,11 +753,26 @@ class SpazBot(Spaz):
     @override
     def on_expire(self) -> None:
         super().on_expire()
+        self._leave_bot_set()
 
         # We're being torn down; release our callback(s) so there's
         # no chance of them keeping activities or other things alive.
         self.update_callback = None
 
+    @override
+    def _revive(self, state: dict[str, Any]) -> None:
+        super()._revive(state)
+        if self.start_cursed:
+            self._cursed = False
+            self.curse()
+
+    def _leave_bot_set(self) -> None:
+        botset = None if self._bot_set is None else self._bot_set()
+        self._bot_set = None
+        if botset is not None:
+            # pylint: disable=protected-access
+            botset._on_bot_gone(self)
+
     @override
     def handlemessage(self, msg: Any) -> Any:
         # pylint: disable=too-many-branches
@@ -540,6 +808,8 @@ class SpazBot(Spaz):
                 self.last_attacked_type = ('picked_up', 'default')
 
         elif isinstance(msg, bs.DieMessage):
+            wasdead = self._dead
+
             # Report normal deaths for scoring purposes.
             if not self._dead and not msg.immediate:
                 killerplayer: bs.Player | None
@@ -569,6 +839,8 @@ class SpazBot(Spaz):
                         SpazBotDiedMessage(self, killerplayer, msg.how)
                     )
             super().handlemessage(msg)  # Augment standard behavior.
+            if not wasdead:
+                self._leave_bot_set()
 
         # Keep track of the player who last hit us for point rewarding.
         elif isinstance(msg, bs.HitMessage):
@@ -914,26 +1186,185 @@ class ExplodeyBotShielded(ExplodeyBot):
     points_mult = 5
 
 
+class SpazBotPool:
+    """Hands out dead bots made new again instead of building new ones.
+
+    Category: **Gameplay Classes**
+
+    A bs.SpazBotSet with ``use_pool`` set gets its bots from here and
+    gives them back once they die. A dead bot only gets handed out
+    again after its node (its ragdoll) is gone; it then gets a new
+    node and its stats, timers and skills are put back to how they
+    were when it was built (see Spaz._revive()), which skips the
+    factory lookups and character setup of a new bot. Use
+    SpazBotPool.get() to return the pool for the current activity.
+    """
+
+    max_per_class = 8
+    """How many dead bots of one class are kept around."""
+
+    max_total = 32
+    """How many dead bots are kept around in all."""
+
+    _STORENAME = bs.storagename()
+
+    def __init__(self) -> None:
+        """Instantiate a pool; use get() instead."""
+        # Dead bots by the class they were asked for as (bots change
+        # their class to their character's one), oldest first.
+        self._free: dict[type[SpazBot], deque[SpazBot]] = {}
+        self._free_count = 0
+        # The class and as-new state of every bot we've built.
+        self._built: weakref.WeakKeyDictionary[
+            SpazBot, tuple[type[SpazBot], dict[str, Any]]
+        ] = weakref.WeakKeyDictionary()
+        self.hits = 0
+        """Bots handed out again."""
+        self.misses = 0
+        """Bots that had to be built."""
+        self.dropped = 0
+        """Dead bots we had no room for."""
+
+    @classmethod
+    def get(cls) -> SpazBotPool:
+        """Get/create a shared SpazBotPool object."""
+        activity = bs.getactivity()
+        pool = activity.customdata.get(cls._STORENAME)
+        if pool is None:
+            pool = activity.customdata[cls._STORENAME] = SpazBotPool()
+        assert isinstance(pool, SpazBotPool)
+        return pool
+
+    def acquire(self, bot_type: type[SpazBot]) -> SpazBot:
+        """Return a bot of the given type; a recycled one if we can."""
+        free = self._free.get(bot_type)
+        if free:
+            for bot in free:
+                if not bot.node:
+                    free.remove(bot)
+                    self._free_count -= 1
+                    # pylint: disable=protected-access
+                    bot._revive(self._built[bot][1])
+                    self.hits += 1
+                    return bot
+        self.misses += 1
+        bot = bot_type()
+        # pylint: disable=protected-access
+        self._built[bot] = (bot_type, bot._capture_state())
+        return bot
+
+    def release(self, bot: SpazBot) -> None:
+        """Take back a dead bot we handed out, if there's room for it."""
+        entry = self._built.get(bot)
+        if entry is None or bot.expired:
+            return
+        free = self._free.setdefault(entry[0], deque())
+        if (
+            len(free) >= self.max_per_class
+            or self._free_count >= self.max_total
+        ):
+            self.dropped += 1
+            del self._built[bot]
+            return
+        free.append(bot)
+        self._free_count += 1
+
+    def get_stats(self) -> dict[str, Any]:
+        """Return how well we've been doing.
+
+        That's our ``hits``, ``misses`` and ``dropped`` counts, the
+        share of bots that were recycled (``hit_rate``) and how many
+        dead bots we're holding on to (``free``).
+        """
+        handed_out = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'dropped': self.dropped,
+            'hit_rate': self.hits / handed_out if handed_out else 0.0,
+            'free': self._free_count,
+        }
+
+
 class SpazBotSet:
     """A container/controller for one or more bs.SpazBots.
 
     category: Bot Classes
     """
 
+    ai_budget_ms = 4.0
+    """How long one update may spend on bot AI; bots that don't fit
+    get updated first thing on the next one. (being wall-clock time,
+    how many bots fit depends on how fast the host is)"""
+
+    max_ai_updates = 48
+    """How many bot AI updates one update may do at most, however
+    quick they are."""
+
+    far_dist = 12.0
+    """Bots this far from their target (with nothing else going on)
+    get their AI updated at a reduced rate."""
+
+    reduced_skips = 2
+    """How many of their turns reduced rate bots sit out."""
+
+    use_navigation = True
+    """Whether charging bots path around edges through a shared
+    FlowField (instead of only heading straight at their target)."""
+
+    use_pool = False
+    """Whether bots get recycled through the activity's SpazBotPool
+    instead of being built anew for every spawn."""
+
+    max_spawns_per_frame = 2
+    """How many bots may get built in one frame; bots coming due past
+    that wait for the next frames, in the order they came due."""
+
+    spawn_frame_time = 0.016
+    """How long a frame is taken to be when spreading out spawns."""
+
+    _batch_size = 8
+
     def __init__(self) -> None:
         """Create a bot-set."""
 
         # We spread our bots out over a few lists so we can update
         # them in a staggered fashion.
         self._bot_list_count = 5
-        self._bot_add_list = 0
         self._bot_update_list = 0
         self._bot_lists: list[list[SpazBot]] = [
             [] for _ in range(self._bot_list_count)
         ]
+        # Living bots (in the order they were added) and which list
+        # each is in; bots let us know when they die.
+        self._living: dict[SpazBot, int] = {}
+        # Dead bots whose bodies may still be around (pruned once
+        # every round of updates).
+        self._dying: dict[SpazBot, None] = {}
+        # Bots that didn't fit in the last update's budget.
+        self._deferred: list[SpazBot] = []
+        self._flow_field: FlowField | None = None
+        self._flow_field_failed = False
+        self._pool: SpazBotPool | None = None
         self._spawn_sound = bs.getsound('spawn')
         self._spawning_count = 0
+        # Bots that came due but didn't fit in their frame, with when
+        # they came due.
+        self._spawn_queue: deque[
+            tuple[
+                type[SpazBot],
+                Sequence[float],
+                Callable[[SpazBot], Any] | None,
+                float,
+            ]
+        ] = deque()
+        self._spawn_queue_timer: bs.Timer | None = None
+        self._spawn_queue_peak = 0
+        self._spawn_lag_max = 0.0
+        self._frame_start = -1.0
+        self._frame_spawns = 0
         self._bot_update_timer: bs.Timer | None = None
+        self.reset_ai_stats()
         self.start_moving()
 
     def __del__(self) -> None:
@@ -954,18 +1385,81 @@ class SpazBotSet:
             spawn_time=spawn_time,
             send_spawn_message=False,
             spawn_callback=bs.Call(
-                self._spawn_bot, bot_type, pos, on_spawn_call
+                self._on_spawn_due, bot_type, pos, on_spawn_call
             ),
         )
         self._spawning_count += 1
 
+    def _on_spawn_due(
+        self,
+        bot_type: type[SpazBot],
+        pos: Sequence[float],
+        on_spawn_call: Callable[[SpazBot], Any] | None,
+    ) -> None:
+        now = bs.time()
+        if now - self._frame_start >= self.spawn_frame_time:
+            self._frame_start = now
+            self._frame_spawns = 0
+        if not self._spawn_queue and (
+            self._frame_spawns < self.max_spawns_per_frame
+        ):
+            self._frame_spawns += 1
+            self._spawn_bot(bot_type, pos, on_spawn_call)
+            return
+
+        # Wave starts have lots of bots come due at once; build them
+        # over the next few frames instead of all in this one.
+        self._spawn_queue.append((bot_type, pos, on_spawn_call, now))
+        self._spawn_queue_peak = max(
+            self._spawn_queue_peak, len(self._spawn_queue)
+        )
+        if self._spawn_queue_timer is None:
+            self._spawn_queue_timer = bs.Timer(
+                self.spawn_frame_time,
+                bs.WeakCall(self._spawn_queued),
+                repeat=True,
+            )
+
+    def _spawn_queued(self) -> None:
+        now = bs.time()
+        self._frame_start = now
+        self._frame_spawns = 0
+        queue = self._spawn_queue
+        while queue and self._frame_spawns < self.max_spawns_per_frame:
+            bot_type, pos, on_spawn_call, due = queue.popleft()
+            self._spawn_lag_max = max(self._spawn_lag_max, now - due)
+            self._frame_spawns += 1
+            self._spawn_bot(bot_type, pos, on_spawn_call)
+        if not queue:
+            self._spawn_queue_timer = None
+
+    def get_spawn_queue_depth(self) -> int:
+        """Return how many bots are due but waiting to be built."""
+        return len(self._spawn_queue)
+
+    def get_spawn_stats(self) -> dict[str, Any]:
+        """Return how our spawn spreading has been doing.
+
+        Has 'queued' (bots waiting to be built right now),
+        'peak_queued' (the most that ever waited at once) and 'max_lag'
+        (the longest, in seconds, a bot got built after it came due).
+        """
+        return {
+            'queued': len(self._spawn_queue),
+            'peak_queued': self._spawn_queue_peak,
+            'max_lag': self._spawn_lag_max,
+        }
+
     def _spawn_bot(
         self,
         bot_type: type[SpazBot],
         pos: Sequence[float],
         on_spawn_call: Callable[[SpazBot], Any] | None,
     ) -> None:
-        spaz = bot_type()
+        if self.use_pool:
+            spaz = self._get_pool().acquire(bot_type)
+        else:
+            spaz = bot_type()
         self._spawn_sound.play(position=pos)
         assert spaz.node
         spaz.node.handlemessage('flash')
@@ -978,38 +1472,48 @@ class SpazBotSet:
 
     def have_living_bots(self) -> bool:
         """Return whether any bots in the set are alive or spawning."""
-        return self._spawning_count > 0 or any(
-            any(b.is_alive() for b in l) for l in self._bot_lists
-        )
+        return self._spawning_count > 0 or bool(self._living)
 
     def get_living_bots(self) -> list[SpazBot]:
         """Get the living bots in the set."""
-        bots: list[SpazBot] = []
-        for botlist in self._bot_lists:
-            for bot in botlist:
-                if bot.is_alive():
-                    bots.append(bot)
-        return bots
+        return list(self._living)
+
+    def get_living_bot_count(self) -> int:
+        """Return how many bots in the set are alive."""
+        return len(self._living)
+
+    def _on_bot_gone(self, bot: SpazBot) -> None:
+        """Called by our bots when they die or expire."""
+        index = self._living.pop(bot, None)
+        if index is None:
+            return
+        try:
+            self._bot_lists[index].remove(bot)
+        except ValueError:
+            logging.exception('Dead bot missing from bot list %d.', index)
+        self._dying[bot] = None
+        if self._pool is not None:
+            self._pool.release(bot)
+
+    def _get_pool(self) -> SpazBotPool:
+        if self._pool is None:
+            self._pool = SpazBotPool.get()
+        return self._pool
 
     def _update(self) -> None:
         # Update one of our bot lists each time through.
-        # First off, remove no-longer-existing bots from the list.
-        try:
-            bot_list = self._bot_lists[self._bot_update_list] = [
-                b for b in self._bot_lists[self._bot_update_list] if b
-            ]
-        except Exception:
-            bot_list = []
-            logging.exception(
-                'Error updating bot list: %s',
-                self._bot_lists[self._bot_update_list],
-            )
+        # (bots take themselves out of these as they die)
+        bot_list = self._bot_lists[self._bot_update_list]
+        self._rebalance(self._bot_update_list)
         self._bot_update_list = (
             self._bot_update_list + 1
         ) % self._bot_list_count
+        if self._bot_update_list == 0 and self._dying:
+            self._dying = {bot: None for bot in self._dying if bot}
 
-        # Update our list of player points for the bots to use.
-        player_pts = []
+        # Update our grid of player points for the bots to use.
+        grid = PlayerPointGrid()
+        player_xz: list[tuple[float, float]] = []
         for player in bs.getactivity().players:
             assert isinstance(player, bs.Player)
             try:
@@ -1019,18 +1523,144 @@ class SpazBotSet:
                 if player.is_alive():
                     assert isinstance(player.actor, Spaz)
                     assert player.actor.node
-                    player_pts.append(
-                        (
-                            bs.Vec3(player.actor.node.position),
-                            bs.Vec3(player.actor.node.velocity),
-                        )
-                    )
+                    position = player.actor.node.position
+                    grid.add(position, player.actor.node.velocity)
+                    player_xz.append((position[0], position[2]))
             except Exception:
                 logging.exception('Error on bot-set _update.')
 
+        flow_field = self._get_flow_field(bot_list)
+        if flow_field is not None:
+            flow_field.set_targets(player_xz)
+            flow_field.advance()
+
+        # Whatever didn't fit last time goes first, then the bots that
+        # want full rate updates and then the rest that are due.
+        due = [b for b in self._deferred if b in self._living]
+        deferred = set(due)
+        # (grouped by type, in the order types show up)
+        urgent: dict[type[SpazBot], list[SpazBot]] = {}
+        relaxed: dict[type[SpazBot], list[SpazBot]] = {}
         for bot in bot_list:
-            bot.set_player_points(player_pts)
-            bot.update_ai()
+            # pylint: disable=protected-access
+            if bot._ai_skips_left > 0:
+                bot._ai_skips_left -= 1
+            elif bot not in deferred:
+                groups = urgent if self._wants_full_rate(bot) else relaxed
+                groups.setdefault(type(bot), []).append(bot)
+        for group in urgent.values():
+            due += group
+        for group in relaxed.values():
+            due += group
+
+        budget = self.ai_budget_ms / 1000.0
+        limit = min(len(due), self.max_ai_updates)
+        start = time.perf_counter()
+        index = 0
+        while index < limit:
+            if time.perf_counter() - start > budget:
+                break
+            # Batch up to a few bots of the same type so we can tell
+            # what each type costs.
+            bot_type = type(due[index])
+            end = index + 1
+            while (
+                end < limit
+                and end - index < self._batch_size
+                and type(due[end]) is bot_type
+            ):
+                end += 1
+            batch = due[index:end]
+            for bot in batch:
+                bot.set_target_grid(grid)
+                bot.set_flow_field(flow_field)
+            batch_start = time.perf_counter()
+            update_bot_ais(batch)
+            cost = self._ai_costs.setdefault(bot_type.__name__, [0.0, 0])
+            cost[0] += time.perf_counter() - batch_start
+            cost[1] += len(batch)
+            for bot in batch:
+                # pylint: disable=protected-access
+                bot._ai_skips_left = (
+                    0 if self._wants_full_rate(bot) else self.reduced_skips
+                )
+            index = end
+        if index < len(due):
+            self._budget_overruns += 1
+        self._ai_updates += index
+        self._deferred = due[index:]
+
+    def _get_flow_field(self, bots: list[SpazBot]) -> FlowField | None:
+        """Return our flow field, setting it up with the first bots."""
+        if (
+            self._flow_field is not None
+            or self._flow_field_failed
+            or not self.use_navigation
+            or not bots
+        ):
+            return self._flow_field
+        try:
+            self._flow_field = FlowField(NavGrid.get(bots[0].map))
+        except Exception:
+            # Bots do fine without; they just go straight for things.
+            logging.exception('Error setting up bot navigation.')
+            self._flow_field_failed = True
+        return self._flow_field
+
+    def _wants_full_rate(self, bot: SpazBot) -> bool:
+        """Whether a bot has enough going on to need every update."""
+        # pylint: disable=protected-access
+        if bot.update_callback is not None or bot.target_flag:
+            return True
+        if bot.held_count or (bot.node and bot.node.hold_node):
+            return True
+        if bot._mode in ('throw', 'flee'):
+            return True
+        if bot._target_dist < self.far_dist:
+            return True
+        return bs.time() - bot.last_attacked_time < 2.0
+
+    def _rebalance(self, index: int) -> None:
+        """Even out a list with the others as bots come and go."""
+        bot_list = self._bot_lists[index]
+        while True:
+            smallest = min(
+                range(self._bot_list_count),
+                key=lambda i: len(self._bot_lists[i]),
+            )
+            if len(bot_list) <= len(self._bot_lists[smallest]) + 1:
+                break
+            bot = bot_list.pop()
+            self._bot_lists[smallest].append(bot)
+            self._living[bot] = smallest
+
+    def reset_ai_stats(self) -> None:
+        """Start counting AI stats (see get_ai_stats()) from scratch."""
+        self._ai_stats_start = bs.time()
+        self._ai_updates = 0
+        self._budget_overruns = 0
+        self._ai_costs: dict[str, list] = {}
+
+    def get_ai_stats(self) -> dict[str, Any]:
+        """Return how our AI updates have been doing.
+
+        Has 'updates_per_second' (bot AI updates done), 'budget_overruns'
+        (updates that ran out of ai_budget_ms or max_ai_updates and
+        deferred bots to the next one)
+        and 'cost_per_class' (average microseconds an AI update took per
+        bot type name), all since the last reset_ai_stats().
+        """
+        elapsed = bs.time() - self._ai_stats_start
+        return {
+            'updates_per_second': (
+                self._ai_updates / elapsed if elapsed > 0.0 else 0.0
+            ),
+            'budget_overruns': self._budget_overruns,
+            'cost_per_class': {
+                name: total / count * 1_000_000
+                for name, (total, count) in self._ai_costs.items()
+            },
+        }
 
     def clear(self) -> None:
         """Immediately clear out any bots in the set."""
@@ -1040,10 +1670,14 @@ class SpazBotSet:
         if activity is None or activity.expired:
             return
 
-        for i, bot_list in enumerate(self._bot_lists):
-            for bot in bot_list:
-                bot.handlemessage(bs.DieMessage(immediate=True))
-            self._bot_lists[i] = []
+        bots = list(self._living) + list(self._dying)
+        for bot in bots:
+            bot.handlemessage(bs.DieMessage(immediate=True))
+        for bot_list in self._bot_lists:
+            bot_list.clear()
+        self._living.clear()
+        self._dying.clear()
+        self._deferred = []
 
     def start_moving(self) -> None:
         """Start processing bot AI updates so they start doing their thing."""
@@ -1114,5 +1748,15 @@ class SpazBotSet:
 
     def add_bot(self, bot: SpazBot) -> None:
         """Add a bs.SpazBot instance to the set."""
-        self._bot_lists[self._bot_add_list].append(bot)
-        self._bot_add_list = (self._bot_add_list + 1) % self._bot_list_count
+        if not bot.is_alive():
+            self._dying[bot] = None
+            return
+        # (recycled bots may still be around from their last life)
+        self._dying.pop(bot, None)
+        index = min(
+            range(self._bot_list_count), key=lambda i: len(self._bot_lists[i])
+        )
+        self._bot_lists[index].append(bot)
+        self._living[bot] = index
+        # pylint: disable=protected-access
+        bot._bot_set = weakref.ref(self)
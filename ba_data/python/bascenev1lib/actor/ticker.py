@@ -0,0 +1,142 @@
+# Released under the MIT License. See LICENSE for details.
+#
+"""Provides a shared ticker for periodic actor updates."""
+
+from __future__ import annotations
+
+import weakref
+import logging
+from typing import TYPE_CHECKING
+
+import bascenev1 as bs
+
+if TYPE_CHECKING:
+    from typing import Any, Callable
+
+
+class TickHandle:
+    """A registration with a bascenev1lib.actor.ticker.ActorTicker.
+
+    Category: **Gameplay Classes**
+
+    Calls stop as soon as the owning actor dies, expires or when
+    cancel() is called; whichever comes first.
+    """
+
+    def __init__(
+        self,
+        call: Callable[[], Any],
+        period: int,
+        offset: int,
+    ):
+        # Hold our actor weakly so registering never keeps it alive.
+        self._call = weakref.WeakMethod(call)  # type: ignore
+        self._actor = weakref.ref(getattr(call, '__self__'))
+        self.period = period
+        self.offset = offset
+        self.active = True
+
+    def cancel(self) -> None:
+        """Stop receiving ticks."""
+        self.active = False
+
+    def fire(self) -> bool:
+        """Run our call; returns False if we should be dropped."""
+        actor = self._actor()
+        if actor is None or getattr(actor, 'expired', False):
+            self.active = False
+            return False
+        call = self._call()
+        if call is None:
+            self.active = False
+            return False
+        call()
+        return True
+
+
+class ActorTicker:
+    """Runs periodic actor updates off a single activity timer.
+
+    Category: **Gameplay Classes**
+
+    Instead of every actor owning one or more repeating bs.Timers,
+    actors register bound methods here at the interval they want.
+    Intervals are rounded to multiples of STEP and registrations that
+    share an interval get spread out over its steps, so the work of
+    a crowd of actors doesn't all land on the same frame.
+    Use ActorTicker.get() to return the ticker for the current activity.
+    """
+
+    STEP = 0.1
+    """Resolution of the ticker in seconds."""
+
+    _STORENAME = bs.storagename()
+
+    def __init__(self) -> None:
+        """Instantiate a ticker; use get() instead."""
+        self._step_count = 0
+
+        # Per period, one list of handles per step offset.
+        self._slots: dict[int, list[list[TickHandle]]] = {}
+        self._timer = bs.Timer(self.STEP, bs.WeakCall(self._step), repeat=True)
+
+    @classmethod
+    def get(cls) -> ActorTicker:
+        """Get/create a shared bascenev1lib.actor.ticker.ActorTicker object."""
+        activity = bs.getactivity()
+        ticker = activity.customdata.get(cls._STORENAME)
+        if ticker is None:
+            ticker = activity.customdata[cls._STORENAME] = ActorTicker()
+        assert isinstance(ticker, ActorTicker)
+        return ticker
+
+    def register(
+        self,
+        call: Callable[[], Any],
+        interval: float,
+        phase: float | None = None,
+    ) -> TickHandle:
+        """Run a bound actor method every ``interval`` seconds.
+
+        ``phase`` offsets the first run in seconds; when omitted the
+        least busy offset for the interval is picked.
+        """
+        period = max(1, round(interval / self.STEP))
+        slots = self._slots.get(period)
+        if slots is None:
+            slots = self._slots[period] = [[] for _ in range(period)]
+        if phase is None:
+            offset = min(range(period), key=lambda i: len(slots[i]))
+        else:
+            offset = (self._step_count + round(phase / self.STEP)) % period
+        handle = TickHandle(call, period, offset)
+        slots[offset].append(handle)
+        return handle
+
+    def get_count(self) -> int:
+        """Return the amount of active registrations."""
+        return sum(
+            1
+            for slots in self._slots.values()
+            for slot in slots
+            for handle in slot
+            if handle.active
+        )
+
+    def _step(self) -> None:
+        step = self._step_count
+        self._step_count += 1
+        for period, slots in tuple(self._slots.items()):
+            slot = slots[step % period]
+            dropped = False
+            for handle in slot:
+                if not handle.active:
+                    dropped = True
+                    continue
+                try:
+                    if not handle.fire():
+                        dropped = True
+                except Exception:
+                    logging.exception('Error in actor tick.')
+            if dropped:
+                slot[:] = [h for h in slot if h.active]
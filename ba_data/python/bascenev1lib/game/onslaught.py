@@ -25,6 +25,7 @@ from bascenev1lib.actor.playerspaz import PlayerSpazHurtMessage
 from bascenev1lib.actor.scoreboard import Scoreboard
 from bascenev1lib.actor.controlsguide import ControlsGuide
 from bascenev1lib.actor.powerupbox import PowerupBox, PowerupBoxFactory
+from bascenev1lib.waveplanner import WavePlanner, WavePlan, PlannedSpawn
 from bascenev1lib.actor.spazbot import (
     SpazBotDiedMessage,
     SpazBotSet,
@@ -42,10 +43,6 @@ from bascenev1lib.actor.spazbot import (
     ExplodeyBot,
     BrawlerBotProShielded,
     ChargerBotProShielded,
-    BomberBotPro,
-    TriggerBotProShielded,
-    BrawlerBotPro,
-    BomberBotProShielded,
 )
 
 if TYPE_CHECKING:
@@ -164,6 +161,9 @@ class OnslaughtGame(bs.CoopGameActivity[Player, Team]):
     # Show messages when players die since it matters here.
     announce_player_deaths = True
 
+    # Waves get crowded; keep the per-spaz health readout cheap.
+    compact_health_hud = True
+
     def __init__(self, settings: dict):
         self._preset = Preset(settings.get('preset', 'training'))
         if self._preset in {
@@ -223,6 +223,20 @@ class OnslaughtGame(bs.CoopGameActivity[Player, Team]):
         self._land_mine_kills = 0
         self._tnt_kills = 0
 
+        # Endless waves get planned from a seed; pass 'wave_seed' in
+        # our settings to replay a run.
+        self._wave_planner: WavePlanner | None = None
+        if self._preset in {Preset.ENDLESS, Preset.ENDLESS_TOURNAMENT}:
+            self._wave_planner = WavePlanner(settings.get('wave_seed'))
+            self._wave_planner.prefetch(1)
+
+    @property
+    def wave_plans(self) -> list[WavePlan]:
+        """Plans of the endless waves played so far (empty otherwise)."""
+        if self._wave_planner is None:
+            return []
+        return self._wave_planner.plans
+
     @override
     def on_transition_in(self) -> None:
         super().on_transition_in()
@@ -784,151 +798,10 @@ class OnslaughtGame(bs.CoopGameActivity[Player, Team]):
         self.setup_low_life_warning_sound()
         self._update_scores()
         self._bots = SpazBotSet()
+        # Waves keep spawning the same few bot types; recycle them.
+        self._bots.use_pool = True
         bs.timer(4.0, self._start_updating_waves)
 
-    def _get_dist_grp_totals(self, grps: list[Any]) -> tuple[int, int]:
-        totalpts = 0
-        totaldudes = 0
-        for grp in grps:
-            for grpentry in grp:
-                dudes = grpentry[1]
-                totalpts += grpentry[0] * dudes
-                totaldudes += dudes
-        return totalpts, totaldudes
-
-    def _get_distribution(
-        self,
-        target_points: int,
-        min_dudes: int,
-        max_dudes: int,
-        group_count: int,
-        max_level: int,
-    ) -> list[list[tuple[int, int]]]:
-        """Calculate a distribution of bad guys given some params."""
-        max_iterations = 10 + max_dudes * 2
-
-        groups: list[list[tuple[int, int]]] = []
-        for _g in range(group_count):
-            groups.append([])
-        types = [1]
-        if max_level > 1:
-            types.append(2)
-        if max_level > 2:
-            types.append(3)
-        if max_level > 3:
-            types.append(4)
-        for iteration in range(max_iterations):
-            diff = self._add_dist_entry_if_possible(
-                groups, max_dudes, target_points, types
-            )
-
-            total_points, total_dudes = self._get_dist_grp_totals(groups)
-            full = total_points >= target_points
-
-            if full:
-                # Every so often, delete a random entry just to
-                # shake up our distribution.
-                if random.random() < 0.2 and iteration != max_iterations - 1:
-                    self._delete_random_dist_entry(groups)
-
-                # If we don't have enough dudes, kill the group with
-                # the biggest point value.
-                elif (
-                    total_dudes < min_dudes and iteration != max_iterations - 1
-                ):
-                    self._delete_biggest_dist_entry(groups)
-
-                # If we've got too many dudes, kill the group with the
-                # smallest point value.
-                elif (
-                    total_dudes > max_dudes and iteration != max_iterations - 1
-                ):
-                    self._delete_smallest_dist_entry(groups)
-
-                # Close enough.. we're done.
-                else:
-                    if diff == 0:
-                        break
-
-        return groups
-
-    def _add_dist_entry_if_possible(
-        self,
-        groups: list[list[tuple[int, int]]],
-        max_dudes: int,
-        target_points: int,
-        types: list[int],
-    ) -> int:
-        # See how much we're off our target by.
-        total_points, total_dudes = self._get_dist_grp_totals(groups)
-        diff = target_points - total_points
-        dudes_diff = max_dudes - total_dudes
-
-        # Add an entry if one will fit.
-        value = types[random.randrange(len(types))]
-        group = groups[random.randrange(len(groups))]
-        if not group:
-            max_count = random.randint(1, 6)
-        else:
-            max_count = 2 * random.randint(1, 3)
-        max_count = min(max_count, dudes_diff)
-        count = min(max_count, diff // value)
-        if count > 0:
-            group.append((value, count))
-            total_points += value * count
-            total_dudes += count
-            diff = target_points - total_points
-        return diff
-
-    def _delete_smallest_dist_entry(
-        self, groups: list[list[tuple[int, int]]]
-    ) -> None:
-        smallest_value = 9999
-        smallest_entry = None
-        smallest_entry_group = None
-        for group in groups:
-            for entry in group:
-                if entry[0] < smallest_value or smallest_entry is None:
-                    smallest_value = entry[0]
-                    smallest_entry = entry
-                    smallest_entry_group = group
-        assert smallest_entry is not None
-        assert smallest_entry_group is not None
-        smallest_entry_group.remove(smallest_entry)
-
-    def _delete_biggest_dist_entry(
-        self, groups: list[list[tuple[int, int]]]
-    ) -> None:
-        biggest_value = 9999
-        biggest_entry = None
-        biggest_entry_group = None
-        for group in groups:
-            for entry in group:
-                if entry[0] > biggest_value or biggest_entry is None:
-                    biggest_value = entry[0]
-                    biggest_entry = entry
-                    biggest_entry_group = group
-        if biggest_entry is not None:
-            assert biggest_entry_group is not None
-            biggest_entry_group.remove(biggest_entry)
-
-    def _delete_random_dist_entry(
-        self, groups: list[list[tuple[int, int]]]
-    ) -> None:
-        entry_count = 0
-        for group in groups:
-            for _ in group:
-                entry_count += 1
-        if entry_count > 1:
-            del_entry = random.randrange(entry_count)
-            entry_count = 0
-            for group in groups:
-                for entry in group:
-                    if entry_count == del_entry:
-                        group.remove(entry)
-                        break
-                    entry_count += 1
-
     @override
     def spawn_player(self, player: Player) -> bs.Actor:
         # We keep track of who got hurt each wave for score purposes.
@@ -1263,8 +1136,10 @@ class OnslaughtGame(bs.CoopGameActivity[Player, Team]):
             return
 
         self._respawn_players_for_wave()
-        if self._preset in {Preset.ENDLESS, Preset.ENDLESS_TOURNAMENT}:
-            wave = self._generate_random_wave()
+        if self._wave_planner is not None:
+            wave = self._wave_from_plan(self._wave_planner.get(self._wavenum))
+            # Plan the next one while this one's being played.
+            self._wave_planner.prefetch(self._wavenum + 1)
         else:
             wave = self._waves[self._wavenum - 1]
         self._setup_wave_spawns(wave)
@@ -1348,121 +1223,16 @@ class OnslaughtGame(bs.CoopGameActivity[Player, Team]):
             )
         )
 
-    def _bot_levels_for_wave(self) -> list[list[type[SpazBot]]]:
-        level = self._wavenum
-        bot_types = [
-            BomberBot,
-            BrawlerBot,
-            TriggerBot,
-            ChargerBot,
-            BomberBotPro,
-            BrawlerBotPro,
-            TriggerBotPro,
-            BomberBotProShielded,
-            ExplodeyBot,
-            ChargerBotProShielded,
-            StickyBot,
-            BrawlerBotProShielded,
-            TriggerBotProShielded,
-        ]
-        if level > 5:
-            bot_types += [
-                ExplodeyBot,
-                TriggerBotProShielded,
-                BrawlerBotProShielded,
-                ChargerBotProShielded,
-            ]
-        if level > 7:
-            bot_types += [
-                ExplodeyBot,
-                TriggerBotProShielded,
-                BrawlerBotProShielded,
-                ChargerBotProShielded,
-            ]
-        if level > 10:
-            bot_types += [
-                TriggerBotProShielded,
-                TriggerBotProShielded,
-                TriggerBotProShielded,
-                TriggerBotProShielded,
-            ]
-        if level > 13:
-            bot_types += [
-                TriggerBotProShielded,
-                TriggerBotProShielded,
-                TriggerBotProShielded,
-                TriggerBotProShielded,
-            ]
-        bot_levels = [
-            [b for b in bot_types if b.points_mult == 1],
-            [b for b in bot_types if b.points_mult == 2],
-            [b for b in bot_types if b.points_mult == 3],
-            [b for b in bot_types if b.points_mult == 4],
-        ]
-
-        # Make sure all lists have something in them
-        if not all(bot_levels):
-            raise RuntimeError('Got empty bot level')
-        return bot_levels
-
-    def _add_entries_for_distribution_group(
-        self,
-        group: list[tuple[int, int]],
-        bot_levels: list[list[type[SpazBot]]],
-        all_entries: list[Spawn | Spacing | Delay | None],
-    ) -> None:
-        entries: list[Spawn | Spacing | Delay | None] = []
-        for entry in group:
-            bot_level = bot_levels[entry[0] - 1]
-            bot_type = bot_level[random.randrange(len(bot_level))]
-            rval = random.random()
-            if rval < 0.5:
-                spacing = 10.0
-            elif rval < 0.9:
-                spacing = 20.0
-            else:
-                spacing = 40.0
-            split = random.random() > 0.3
-            for i in range(entry[1]):
-                if split and i % 2 == 0:
-                    entries.insert(0, Spawn(bot_type, spacing=spacing))
-                else:
-                    entries.append(Spawn(bot_type, spacing=spacing))
-        if entries:
-            all_entries += entries
-            all_entries.append(Spacing(40.0 if random.random() < 0.5 else 80.0))
-
-    def _generate_random_wave(self) -> Wave:
-        level = self._wavenum
-        bot_levels = self._bot_levels_for_wave()
-
-        target_points = level * 3 - 2
-        min_dudes = min(1 + level // 3, 10)
-        max_dudes = min(10, level + 1)
-        max_level = (
-            4 if level > 6 else (3 if level > 3 else (2 if level > 2 else 1))
-        )
-        group_count = 3
-        distribution = self._get_distribution(
-            target_points, min_dudes, max_dudes, group_count, max_level
-        )
-        all_entries: list[Spawn | Spacing | Delay | None] = []
-        for group in distribution:
-            self._add_entries_for_distribution_group(
-                group, bot_levels, all_entries
+    def _wave_from_plan(self, plan: WavePlan) -> Wave:
+        entries: list[Spawn | Spacing | Delay | None] = [
+            (
+                Spawn(entry.get_bot_type(), spacing=entry.spacing)
+                if isinstance(entry, PlannedSpawn)
+                else Spacing(entry.spacing)
             )
-        angle_rand = random.random()
-        if angle_rand > 0.75:
-            base_angle = 130.0
-        elif angle_rand > 0.5:
-            base_angle = 210.0
-        elif angle_rand > 0.25:
-            base_angle = 20.0
-        else:
-            base_angle = -30.0
-        base_angle += (0.5 - random.random()) * 20.0
-        wave = Wave(base_angle=base_angle, entries=all_entries)
-        return wave
+            for entry in plan.entries
+        ]
+        return Wave(base_angle=plan.base_angle, entries=entries)
 
     def add_bot_at_point(
         self, point: Point, spaz_type: type[SpazBot], spawn_time: float = 1.0
@@ -10,6 +10,7 @@
 
 from __future__ import annotations
 
+import math
 import random
 import logging
 from enum import Enum
@@ -46,6 +47,12 @@ from bascenev1lib.actor.spazbot import (
 if TYPE_CHECKING:
     from typing import Any
 
+    # Center and half-size of a box, that of a box it excludes (if
+    # any), and which way (left-right, up-down) to walk in it.
+    _CompiledRule = tuple[
+        tuple[float, ...], tuple[float, ...] | None, int, int
+    ]
+
 
 class Preset(Enum):
     """Play presets."""
@@ -92,6 +99,134 @@ class Wave:
     entries: list[Spawn | Spacing | None]
 
 
+# Which way (left-right, up-down) bots walk while in each of the map's
+# boxes, first match wins: bots in row 1 attempt the high road, ones in
+# rows 1 and 2 the middle road, and all of them settle for the third
+# row. Past that they default to walking right if they're still in the
+# walking area (b8 except for b9).
+_ROUTE_RULES: list[
+    tuple[str, str | None, tuple[int, ...] | None, int, int]
+] = [
+    ('b4', None, (1,), 0, 1),
+    ('b1', None, (1, 2), 0, 1),
+    ('b7', None, None, 0, 1),
+    ('b2', None, None, 0, -1),
+    ('b3', None, None, 0, -1),
+    ('b5', None, None, 0, -1),
+    ('b6', None, None, 0, 1),
+    ('b8', 'b9', None, 1, 0),
+]
+
+_bot_routes: dict[tuple[type[bs.Map], int], BotRoute] = {}
+
+
+class BotRoute:
+    """Which way bots of one row walk around a map.
+
+    Category: **Gameplay Classes**
+
+    Compiled from the map's boxes; the map's x/z plane is split into
+    cells that each list only the boxes reaching into them, so finding
+    a bot's move tests a box or two instead of going through all of
+    them. Use get_bot_route() to get the (shared) one for a map.
+    """
+
+    cell_size = 1.0
+    """Size of a cell on the x and z axes."""
+
+    def __init__(self, boxes: dict[str, Sequence[float]], row: int):
+        rules: list[_CompiledRule] = [
+            (
+                self._bounds(boxes[name]),
+                None if exclude is None else self._bounds(boxes[exclude]),
+                left_right,
+                up_down,
+            )
+            for name, exclude, rows, left_right, up_down in _ROUTE_RULES
+            if rows is None or row in rows
+        ]
+        self._scale = 1.0 / self.cell_size
+        self._min_x = min(b[0] - b[3] for b, _, _, _ in rules)
+        self._min_z = min(b[2] - b[5] for b, _, _, _ in rules)
+        max_x = max(b[0] + b[3] for b, _, _, _ in rules)
+        max_z = max(b[2] + b[5] for b, _, _, _ in rules)
+        self._columns, self._rows = self._cell(max_x, max_z)
+        self._columns += 1
+        self._rows += 1
+        cells: list[list[_CompiledRule]] = [
+            [] for _ in range(self._columns * self._rows)
+        ]
+        for rule in rules:
+            box = rule[0]
+            # Go a cell wider than the box so rounding can't leave it
+            # out of the cells points right at its edges end up in.
+            col0, row0 = self._cell(box[0] - box[3], box[2] - box[5])
+            col1, row1 = self._cell(box[0] + box[3], box[2] + box[5])
+            columns = range(max(col0 - 1, 0), min(col1 + 2, self._columns))
+            for cell_row in range(max(row0 - 1, 0), min(row1 + 2, self._rows)):
+                for column in columns:
+                    cells[cell_row * self._columns + column].append(rule)
+        self._cells = [tuple(cell) for cell in cells]
+
+    @staticmethod
+    def _bounds(box: Sequence[float]) -> tuple[float, ...]:
+        # The same values bs.is_point_in_box() compares against.
+        return (
+            box[0],
+            box[1],
+            box[2],
+            box[6] * 0.5,
+            box[7] * 0.5,
+            box[8] * 0.5,
+        )
+
+    def _cell(self, x: float, z: float) -> tuple[int, int]:
+        return (
+            math.floor((x - self._min_x) * self._scale),
+            math.floor((z - self._min_z) * self._scale),
+        )
+
+    def get_move(self, pos: Sequence[float]) -> tuple[int, int] | None:
+        """Return which way (left-right, up-down) to walk at a spot.
+
+        Returns None where bots should go about their normal business.
+        """
+        x, y, z = pos[0], pos[1], pos[2]
+        column, row = self._cell(x, z)
+        if 0 <= column < self._columns and 0 <= row < self._rows:
+            cell = self._cells[row * self._columns + column]
+            for box, exclude, left_right, up_down in cell:
+                if (
+                    abs(x - box[0]) <= box[3]
+                    and abs(y - box[1]) <= box[4]
+                    and abs(z - box[2]) <= box[5]
+                ) and not (
+                    exclude is not None
+                    and abs(x - exclude[0]) <= exclude[3]
+                    and abs(y - exclude[1]) <= exclude[4]
+                    and abs(z - exclude[2]) <= exclude[5]
+                ):
+                    return left_right, up_down
+        if x == 0.0 and y == 0.0 and z == 0.0:
+            # Default to walking right if we're still in the walking area.
+            return 1, 0
+        return None
+
+
+def get_bot_route(maptype: type[bs.Map], row: int) -> BotRoute:
+    """Return the route bots of a row take around a map.
+
+    Category: **Gameplay Functions**
+
+    Routes are compiled once per map type and row.
+    """
+    key = (maptype, row)
+    route = _bot_routes.get(key)
+    if route is None:
+        route = _bot_routes[key] = BotRoute(maptype.defs.boxes, row)
+    return route
+
+
 class Player(bs.Player['Team']):
     """Our player type for this game."""
 
@@ -182,6 +317,8 @@ class RunaroundGame(bs.CoopGameActivity[Player, Team]):
         self._have_tnt: bool | None = None
         self._waves: list[Wave] | None = None
         self._bots = SpazBotSet()
+        # Waves keep spawning the same few bot types; recycle them.
+        self._bots.use_pool = True
         self._tntspawner: TNTSpawner | None = None
         self._lives_bg: bs.NodeActor | None = None
         self._start_lives = 10
@@ -195,6 +332,7 @@ class RunaroundGame(bs.CoopGameActivity[Player, Team]):
         self._wave_text: bs.NodeActor | None = None
         self._flawless_bonus: int | None = None
         self._wave_update_timer: bs.Timer | None = None
+        self._routes: dict[int, BotRoute] = {}
 
     @override
     def on_transition_in(self) -> None:
@@ -217,6 +355,8 @@ class RunaroundGame(bs.CoopGameActivity[Player, Team]):
     @override
     def on_begin(self) -> None:
         super().on_begin()
+        for row in (1, 2, 3):
+            self._routes[row] = get_bot_route(type(self.map), row)
         player_count = len(self.players)
         hard = self._preset not in {Preset.PRO_EASY, Preset.UBER_EASY}
 
@@ -1260,76 +1400,30 @@ class RunaroundGame(bs.CoopGameActivity[Player, Team]):
         self._scoreboard.set_team_value(self.teams[0], score, max_score=None)
 
     def _update_bot(self, bot: SpazBot) -> bool:
-        # Yup; that's a lot of return statements right there.
-        # pylint: disable=too-many-return-statements
-
         if not bool(bot):
             return True
 
-        assert bot.node
+        node = bot.node
+        assert node
 
         # FIXME: Do this in a type safe way.
         r_walk_speed: float = getattr(bot, 'r_walk_speed')
         r_walk_row: int = getattr(bot, 'r_walk_row')
 
-        speed = r_walk_speed
-        pos = bot.node.position
-        boxes = self.map.defs.boxes
-
-        # Bots in row 1 attempt the high road..
-        if r_walk_row == 1:
-            if bs.is_point_in_box(pos, boxes['b4']):
-                bot.node.move_up_down = speed
-                bot.node.move_left_right = 0
-                bot.node.run = 0.0
-                return True
-
-        # Row 1 and 2 bots attempt the middle road..
-        if r_walk_row in [1, 2]:
-            if bs.is_point_in_box(pos, boxes['b1']):
-                bot.node.move_up_down = speed
-                bot.node.move_left_right = 0
-                bot.node.run = 0.0
-                return True
-
-        # All bots settle for the third row.
-        if bs.is_point_in_box(pos, boxes['b7']):
-            bot.node.move_up_down = speed
-            bot.node.move_left_right = 0
-            bot.node.run = 0.0
-            return True
-        if bs.is_point_in_box(pos, boxes['b2']):
-            bot.node.move_up_down = -speed
-            bot.node.move_left_right = 0
-            bot.node.run = 0.0
-            return True
-        if bs.is_point_in_box(pos, boxes['b3']):
-            bot.node.move_up_down = -speed
-            bot.node.move_left_right = 0
-            bot.node.run = 0.0
-            return True
-        if bs.is_point_in_box(pos, boxes['b5']):
-            bot.node.move_up_down = -speed
-            bot.node.move_left_right = 0
-            bot.node.run = 0.0
-            return True
-        if bs.is_point_in_box(pos, boxes['b6']):
-            bot.node.move_up_down = speed
-            bot.node.move_left_right = 0
-            bot.node.run = 0.0
-            return True
-        if (
-            bs.is_point_in_box(pos, boxes['b8'])
-            and not bs.is_point_in_box(pos, boxes['b9'])
-        ) or pos == (0.0, 0.0, 0.0):
-            # Default to walking right if we're still in the walking area.
-            bot.node.move_left_right = speed
-            bot.node.move_up_down = 0
-            bot.node.run = 0.0
-            return True
-
-        # Revert to normal bot behavior otherwise..
-        return False
+        route = self._routes.get(r_walk_row)
+        if route is None:
+            route = self._routes[r_walk_row] = get_bot_route(
+                type(self.map), r_walk_row
+            )
+        move = route.get_move(node.position)
+
+        # Revert to normal bot behavior outside of the route.
+        if move is None:
+            return False
+        node.move_left_right = move[0] * r_walk_speed
+        node.move_up_down = move[1] * r_walk_speed
+        node.run = 0.0
+        return True
 
     @override
     def handlemessage(self, msg: Any) -> Any:
@@ -57,7 +57,7 @@ class MainMenuActivity(bs.Activity[bs.Player, bs.Team]):
         from bascenev1lib.actor import spaz
         self.spaz = spaz.Spaz(start_invincible=False, color=(0.5, 0.5, 0.5), highlight=(0.13, 0.13, 0.13))
         self.spaz.impact_scale = 0.1
-        self.spaz._hp_text.delete()
+        self.spaz.health_hud.delete()
         self.spaz.node.attack_sounds = []
         self.spaz.node.jump_sounds = []
         self.spaz.node.attack_sounds = []
@@ -12,7 +12,7 @@ import bascenev1 as bs
 from bascenev1lib.gameutils import SharedObjects
 
 if TYPE_CHECKING:
-    from typing import Any
+    from typing import Any, Callable
 
 
 class HockeyStadium(bs.Map):
@@ -117,6 +117,7 @@ class FootballStadium(bs.Map):
     from bascenev1lib.mapdata import football_stadium as defs
 
     name = 'Football Stadium'
+    edge_boxes = ('edge_box',)
 
     @override
     @classmethod
@@ -171,14 +172,6 @@ class FootballStadium(bs.Map):
         gnode.vr_camera_offset = (0, -0.8, -1.1)
         gnode.vr_near_clip = 0.5
 
-    @override
-    def is_point_near_edge(self, point: bs.Vec3, running: bool = False) -> bool:
-        box_position = self.defs.boxes['edge_box'][0:3]
-        box_scale = self.defs.boxes['edge_box'][6:9]
-        xpos = (point.x - box_position[0]) / box_scale[0]
-        zpos = (point.z - box_position[2]) / box_scale[2]
-        return xpos < -0.5 or xpos > 0.5 or zpos < -0.5 or zpos > 0.5
-
 
 class Bridgit(bs.Map):
     """Map with a narrow bridge in the middle."""
@@ -822,7 +815,6 @@ class ThePad(bs.Map):
         gnode.vignette_inner = (0.95, 0.95, 0.93)
 
 
-
 class DoomShroom(bs.Map):
     """A giant mushroom. Of doom!"""
 
@@ -912,15 +904,18 @@ class DoomShroom(bs.Map):
         gnode.vignette_inner = (0.95, 0.95, 0.99)
 
     @override
-    def is_point_near_edge(self, point: bs.Vec3, running: bool = False) -> bool:
-        xpos = point.x
-        zpos = point.z
-        x_adj = xpos * 0.125
-        z_adj = (zpos + 3.7) * 0.2
-        if running:
-            x_adj *= 1.4
-            z_adj *= 1.4
-        return x_adj * x_adj + z_adj * z_adj > 1.0
+    @classmethod
+    def compile_edge_test(cls) -> Callable[[float, float, bool], bool]:
+        # An ellipse around the mushroom's cap.
+        def _near_edge(xpos: float, zpos: float, running: bool) -> bool:
+            x_adj = xpos * 0.125
+            z_adj = (zpos + 3.7) * 0.2
+            if running:
+                x_adj *= 1.4
+                z_adj *= 1.4
+            return x_adj * x_adj + z_adj * z_adj > 1.0
+
+        return _near_edge
 
 
 class LakeFrigid(bs.Map):
@@ -1197,6 +1192,7 @@ class TowerD(bs.Map):
     from bascenev1lib.mapdata import tower_d as defs
 
     name = 'Tower D'
+    edge_boxes = ('edge_box', 'edge_box2')
 
     @override
     @classmethod
@@ -1299,23 +1295,6 @@ class TowerD(bs.Map):
         gnode.vignette_outer = (0.7, 0.73, 0.7)
         gnode.vignette_inner = (0.95, 0.95, 0.95)
 
-    @override
-    def is_point_near_edge(self, point: bs.Vec3, running: bool = False) -> bool:
-        # see if we're within edge_box
-        boxes = self.defs.boxes
-        box_position = boxes['edge_box'][0:3]
-        box_scale = boxes['edge_box'][6:9]
-        box_position2 = boxes['edge_box2'][0:3]
-        box_scale2 = boxes['edge_box2'][6:9]
-        xpos = (point.x - box_position[0]) / box_scale[0]
-        zpos = (point.z - box_position[2]) / box_scale[2]
-        xpos2 = (point.x - box_position2[0]) / box_scale2[0]
-        zpos2 = (point.z - box_position2[2]) / box_scale2[2]
-        # if we're outside of *both* boxes we're near the edge
-        return (xpos < -0.5 or xpos > 0.5 or zpos < -0.5 or zpos > 0.5) and (
-            xpos2 < -0.5 or xpos2 > 0.5 or zpos2 < -0.5 or zpos2 > 0.5
-        )
-
 
 class HappyThoughts(bs.Map):
     """Flying map."""
@@ -1527,6 +1506,7 @@ class Courtyard(bs.Map):
     from bascenev1lib.mapdata import courtyard as defs
 
     name = 'Courtyard'
+    edge_boxes = ('edge_box',)
 
     @override
     @classmethod
@@ -1630,16 +1610,6 @@ class Courtyard(bs.Map):
         gnode.vignette_outer = (0.6, 0.6, 0.64)
         gnode.vignette_inner = (0.95, 0.95, 0.93)
 
-    @override
-    def is_point_near_edge(self, point: bs.Vec3, running: bool = False) -> bool:
-        # count anything off our ground level as safe (for our platforms)
-        # see if we're within edge_box
-        box_position = self.defs.boxes['edge_box'][0:3]
-        box_scale = self.defs.boxes['edge_box'][6:9]
-        xpos = (point.x - box_position[0]) / box_scale[0]
-        zpos = (point.z - box_position[2]) / box_scale[2]
-        return xpos < -0.5 or xpos > 0.5 or zpos < -0.5 or zpos > 0.5
-
 
 class Rampage(bs.Map):
     """Wee little map with ramps on the sides."""
@@ -1647,6 +1617,7 @@ class Rampage(bs.Map):
     from bascenev1lib.mapdata import rampage as defs
 
     name = 'Rampage'
+    edge_boxes = ('edge_box',)
 
     @override
     @classmethod
@@ -1739,13 +1710,6 @@ class Rampage(bs.Map):
         gnode.vignette_outer = (0.62, 0.64, 0.69)
         gnode.vignette_inner = (0.97, 0.95, 0.93)
 
-    @override
-    def is_point_near_edge(self, point: bs.Vec3, running: bool = False) -> bool:
-        box_position = self.defs.boxes['edge_box'][0:3]
-        box_scale = self.defs.boxes['edge_box'][6:9]
-        xpos = (point.x - box_position[0]) / box_scale[0]
-        zpos = (point.z - box_position[2]) / box_scale[2]
-        return xpos < -0.5 or xpos > 0.5 or zpos < -0.5 or zpos > 0.5
 
 class TestingMap(bs.Map):
     """MELEEEEEEEEEEEEEEEEE""" 
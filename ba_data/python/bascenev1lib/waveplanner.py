@@ -0,0 +1,404 @@
+# Released under the MIT License. See LICENSE for details.
+#
+"""Plans endless Onslaught waves ahead of time from a seed."""
+
+from __future__ import annotations
+
+import random
+import functools
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import bascenev1 as bs
+
+from bascenev1lib.actor import spazbot
+
+if TYPE_CHECKING:
+    from typing import Any
+    from concurrent.futures import Future
+
+    from bascenev1lib.actor.spazbot import SpazBot
+
+# Bot types waves pick from at any level...
+_BOT_TYPES: list[type[SpazBot]] = [
+    spazbot.BomberBot,
+    spazbot.BrawlerBot,
+    spazbot.TriggerBot,
+    spazbot.ChargerBot,
+    spazbot.BomberBotPro,
+    spazbot.BrawlerBotPro,
+    spazbot.TriggerBotPro,
+    spazbot.BomberBotProShielded,
+    spazbot.ExplodeyBot,
+    spazbot.ChargerBotProShielded,
+    spazbot.StickyBot,
+    spazbot.BrawlerBotProShielded,
+    spazbot.TriggerBotProShielded,
+]
+
+# ...and ones added on top past some levels, to make nasty ones likelier.
+_LEVEL_BOT_TYPES: list[tuple[int, list[type[SpazBot]]]] = [
+    (
+        5,
+        [
+            spazbot.ExplodeyBot,
+            spazbot.TriggerBotProShielded,
+            spazbot.BrawlerBotProShielded,
+            spazbot.ChargerBotProShielded,
+        ],
+    ),
+    (
+        7,
+        [
+            spazbot.ExplodeyBot,
+            spazbot.TriggerBotProShielded,
+            spazbot.BrawlerBotProShielded,
+            spazbot.ChargerBotProShielded,
+        ],
+    ),
+    (10, [spazbot.TriggerBotProShielded] * 4),
+    (13, [spazbot.TriggerBotProShielded] * 4),
+]
+
+
+@dataclass(frozen=True)
+class PlannedSpawn:
+    """A bot spawn in a WavePlan.
+
+    Category: **Gameplay Classes**
+    """
+
+    bottype: str
+    """Name of the bs.SpazBot class to spawn."""
+
+    spacing: float
+
+    def get_bot_type(self) -> type[SpazBot]:
+        """Return the bot class we spawn."""
+        bottype = getattr(spazbot, self.bottype, None)
+        if not (
+            isinstance(bottype, type) and issubclass(bottype, spazbot.SpazBot)
+        ):
+            raise ValueError(f'Unknown bot type: {self.bottype!r}')
+        return bottype
+
+
+@dataclass(frozen=True)
+class PlannedSpacing:
+    """Empty space in a WavePlan.
+
+    Category: **Gameplay Classes**
+    """
+
+    spacing: float
+
+
+@dataclass(frozen=True)
+class WavePlan:
+    """What an endless Onslaught wave consists of.
+
+    Category: **Gameplay Classes**
+
+    Plain data; the same level and seed always give the same plan, so
+    a run can be reproduced from its seed (or from its plans saved
+    with to_dict()).
+    """
+
+    level: int
+    seed: int
+    base_angle: float
+    entries: tuple[PlannedSpawn | PlannedSpacing, ...]
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the plan as json-friendly data."""
+        return {
+            'level': self.level,
+            'seed': self.seed,
+            'base_angle': self.base_angle,
+            'entries': [
+                (
+                    ['spawn', entry.bottype, entry.spacing]
+                    if isinstance(entry, PlannedSpawn)
+                    else ['spacing', entry.spacing]
+                )
+                for entry in self.entries
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> WavePlan:
+        """Make a plan out of to_dict() data."""
+        entries: list[PlannedSpawn | PlannedSpacing] = []
+        for entry in data['entries']:
+            if entry[0] == 'spawn':
+                entries.append(PlannedSpawn(entry[1], float(entry[2])))
+            elif entry[0] == 'spacing':
+                entries.append(PlannedSpacing(float(entry[1])))
+            else:
+                raise ValueError(f'Invalid wave plan entry: {entry!r}')
+        return cls(
+            level=int(data['level']),
+            seed=int(data['seed']),
+            base_angle=float(data['base_angle']),
+            entries=tuple(entries),
+        )
+
+
+@functools.lru_cache(maxsize=256)
+def plan_wave(level: int, seed: int) -> WavePlan:
+    """Plan endless wave ``level`` of the run with the given seed.
+
+    Category: **Gameplay Functions**
+
+    Doesn't touch the engine, so it can run in any thread. Plans are
+    cached by level and seed.
+    """
+    rng = random.Random(f'onslaught:{seed}:{level}')
+    bot_levels = _get_bot_levels(level)
+
+    target_points = level * 3 - 2
+    min_dudes = min(1 + level // 3, 10)
+    max_dudes = min(10, level + 1)
+    max_level = (
+        4 if level > 6 else (3 if level > 3 else (2 if level > 2 else 1))
+    )
+    group_count = 3
+    distribution = _get_distribution(
+        rng, target_points, min_dudes, max_dudes, group_count, max_level
+    )
+    entries: list[PlannedSpawn | PlannedSpacing] = []
+    for group in distribution:
+        _add_entries_for_distribution_group(rng, group, bot_levels, entries)
+    angle_rand = rng.random()
+    if angle_rand > 0.75:
+        base_angle = 130.0
+    elif angle_rand > 0.5:
+        base_angle = 210.0
+    elif angle_rand > 0.25:
+        base_angle = 20.0
+    else:
+        base_angle = -30.0
+    base_angle += (0.5 - rng.random()) * 20.0
+    return WavePlan(level, seed, base_angle, tuple(entries))
+
+
+class WavePlanner:
+    """Plans the waves of an endless run a wave ahead, in the background.
+
+    Category: **Gameplay Classes**
+
+    Call prefetch() for a wave while the one before it (or the join
+    screen) is up, and get() once it starts. Planning happens in the
+    app thread-pool; get() only waits on it if it's not done yet.
+    """
+
+    def __init__(self, seed: int | None = None):
+        self.seed = random.randrange(2**31) if seed is None else seed
+        """What all our plans are made from."""
+
+        self.plans: list[WavePlan] = []
+        """Plans handed out by get() so far, in order."""
+
+        self._pending: dict[int, Future[WavePlan]] = {}
+
+    def prefetch(self, level: int) -> None:
+        """Start planning a wave in the background."""
+        if level not in self._pending:
+            self._pending[level] = bs.app.threadpool.submit(
+                plan_wave, level, self.seed
+            )
+
+    def get(self, level: int) -> WavePlan:
+        """Return the plan for a wave."""
+        future = self._pending.pop(level, None)
+        if future is None:
+            plan = plan_wave(level, self.seed)
+        else:
+            plan = future.result()
+        self.plans.append(plan)
+        return plan
+
+
+def _get_bot_levels(level: int) -> list[list[str]]:
+    bot_types = list(_BOT_TYPES)
+    for min_level, extra_types in _LEVEL_BOT_TYPES:
+        if level > min_level:
+            bot_types += extra_types
+    bot_levels = [
+        [b.__name__ for b in bot_types if b.points_mult == mult]
+        for mult in (1, 2, 3, 4)
+    ]
+
+    # Make sure all lists have something in them
+    if not all(bot_levels):
+        raise RuntimeError('Got empty bot level')
+    return bot_levels
+
+
+def _get_dist_grp_totals(grps: list[list[tuple[int, int]]]) -> tuple[int, int]:
+    totalpts = 0
+    totaldudes = 0
+    for grp in grps:
+        for grpentry in grp:
+            dudes = grpentry[1]
+            totalpts += grpentry[0] * dudes
+            totaldudes += dudes
+    return totalpts, totaldudes
+
+
+def _get_distribution(
+    rng: random.Random,
+    target_points: int,
+    min_dudes: int,
+    max_dudes: int,
+    group_count: int,
+    max_level: int,
+) -> list[list[tuple[int, int]]]:
+    """Calculate a distribution of bad guys given some params."""
+    max_iterations = 10 + max_dudes * 2
+
+    groups: list[list[tuple[int, int]]] = []
+    for _g in range(group_count):
+        groups.append([])
+    types = [1]
+    if max_level > 1:
+        types.append(2)
+    if max_level > 2:
+        types.append(3)
+    if max_level > 3:
+        types.append(4)
+    for iteration in range(max_iterations):
+        diff = _add_dist_entry_if_possible(
+            rng, groups, max_dudes, target_points, types
+        )
+
+        total_points, total_dudes = _get_dist_grp_totals(groups)
+        full = total_points >= target_points
+
+        if full:
+            # Every so often, delete a random entry just to
+            # shake up our distribution.
+            if rng.random() < 0.2 and iteration != max_iterations - 1:
+                _delete_random_dist_entry(rng, groups)
+
+            # If we don't have enough dudes, kill the group with
+            # the biggest point value.
+            elif total_dudes < min_dudes and iteration != max_iterations - 1:
+                _delete_biggest_dist_entry(groups)
+
+            # If we've got too many dudes, kill the group with the
+            # smallest point value.
+            elif total_dudes > max_dudes and iteration != max_iterations - 1:
+                _delete_smallest_dist_entry(groups)
+
+            # Close enough.. we're done.
+            else:
+                if diff == 0:
+                    break
+
+    return groups
+
+
+def _add_dist_entry_if_possible(
+    rng: random.Random,
+    groups: list[list[tuple[int, int]]],
+    max_dudes: int,
+    target_points: int,
+    types: list[int],
+) -> int:
+    # See how much we're off our target by.
+    total_points, total_dudes = _get_dist_grp_totals(groups)
+    diff = target_points - total_points
+    dudes_diff = max_dudes - total_dudes
+
+    # Add an entry if one will fit.
+    value = types[rng.randrange(len(types))]
+    group = groups[rng.randrange(len(groups))]
+    if not group:
+        max_count = rng.randint(1, 6)
+    else:
+        max_count = 2 * rng.randint(1, 3)
+    max_count = min(max_count, dudes_diff)
+    count = min(max_count, diff // value)
+    if count > 0:
+        group.append((value, count))
+        total_points += value * count
+        total_dudes += count
+        diff = target_points - total_points
+    return diff
+
+
+def _delete_smallest_dist_entry(groups: list[list[tuple[int, int]]]) -> None:
+    smallest_value = 9999
+    smallest_entry = None
+    smallest_entry_group = None
+    for group in groups:
+        for entry in group:
+            if entry[0] < smallest_value or smallest_entry is None:
+                smallest_value = entry[0]
+                smallest_entry = entry
+                smallest_entry_group = group
+    assert smallest_entry is not None
+    assert smallest_entry_group is not None
+    smallest_entry_group.remove(smallest_entry)
+
+
+def _delete_biggest_dist_entry(groups: list[list[tuple[int, int]]]) -> None:
+    biggest_value = 9999
+    biggest_entry = None
+    biggest_entry_group = None
+    for group in groups:
+        for entry in group:
+            if entry[0] > biggest_value or biggest_entry is None:
+                biggest_value = entry[0]
+                biggest_entry = entry
+                biggest_entry_group = group
+    if biggest_entry is not None:
+        assert biggest_entry_group is not None
+        biggest_entry_group.remove(biggest_entry)
+
+
+def _delete_random_dist_entry(
+    rng: random.Random, groups: list[list[tuple[int, int]]]
+) -> None:
+    entry_count = 0
+    for group in groups:
+        for _ in group:
+            entry_count += 1
+    if entry_count > 1:
+        del_entry = rng.randrange(entry_count)
+        entry_count = 0
+        for group in groups:
+            for entry in group:
+                if entry_count == del_entry:
+                    group.remove(entry)
+                    break
+                entry_count += 1
+
+
+def _add_entries_for_distribution_group(
+    rng: random.Random,
+    group: list[tuple[int, int]],
+    bot_levels: list[list[str]],
+    all_entries: list[PlannedSpawn | PlannedSpacing],
+) -> None:
+    entries: list[PlannedSpawn | PlannedSpacing] = []
+    for entry in group:
+        bot_level = bot_levels[entry[0] - 1]
+        bot_type = bot_level[rng.randrange(len(bot_level))]
+        rval = rng.random()
+        if rval < 0.5:
+            spacing = 10.0
+        elif rval < 0.9:
+            spacing = 20.0
+        else:
+            spacing = 40.0
+        split = rng.random() > 0.3
+        for i in range(entry[1]):
+            if split and i % 2 == 0:
+                entries.insert(0, PlannedSpawn(bot_type, spacing))
+            else:
+                entries.append(PlannedSpawn(bot_type, spacing))
+    if entries:
+        all_entries += entries
+        all_entries.append(PlannedSpacing(40.0 if rng.random() < 0.5 else 80.0))
@@ -0,0 +1,552 @@
+"""Monte-Carlo balance simulator for the bombgeon roster.
+
+Builds a ``CombatModel`` out of every registered character (spawning
+each one once to read its real, modifier-applied stats), then pits
+every character against every other one a lot of times in an abstract
+duel: both sides punch whenever their punch is ready and use their
+cooldown-shown skills whenever they're ready. Damage goes through the
+same armor/shield/hitpoint math spazzes use in-game
+(``damageresolver.absorb``), shields regenerate like ``Spaz`` ones do
+and B9000's armor drains like it does in-game.
+
+Skills the simulator knows how to play, and how closely:
+
+- GrabDash (B9000): a landed grab holds both sides for its drain and
+  deals ``grab_damage`` flat damage per tick, giving B9000
+  ``grab_recovery`` armor per tick.
+- Dash (Snake Shadow): counts as one ``SimConfig.blast_damage`` hit;
+  real blasts fall off with distance.
+- TimeTravel (Snake Shadow): used once hurt; rewinds hitpoints,
+  shields and armor to what they were before, like the real one.
+
+Anything else (e.g. UndergroundDive, which only moves B9000 around
+invincibly) is left out rather than guessed at; see
+``CombatModel.unmodelled``. Zoe's heals only reach teammates, so they
+never come up in a duel. Movement and positioning are abstracted into
+a hit chance that depends on both sides' speed, so knocking someone
+off the map doesn't happen either.
+
+Run it without the game through the headless stand-ins, which also lets
+it spread the work over a process pool::
+
+    python -m baheadless -c "import bombgeon.balance as b; b.main()"
+
+In-game (dev console) ``run()`` works too, but stays in-process.
+"""
+
+from __future__ import annotations
+
+import argparse
+import bisect
+import heapq
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Optional
+
+from bascenev1lib.actor.damageresolver import absorb
+from bombgeon.characters.internal import (
+    BombgeonCharBase,
+    BombgeonCharacterEntry,
+    get_bombgeon_roster,
+)
+
+TTK_BIN = 0.5
+"""Width of the time-to-kill histogram bins, in seconds."""
+
+SHIELD_REGEN_TICK = 0.5
+"""How often shields regenerate (see ``Spaz._shield_regen_tick``)."""
+
+GRAB_DELAY = 0.2
+"""Time from using GrabDash to the grab itself."""
+
+REWIND_DELAY = 2.5
+"""Time from using TimeTravel to the rewind (25 ticks of 0.1s)."""
+
+REWIND_SPAN = 3.9
+"""How far back a rewind goes (39 saved states, 0.1s apart)."""
+
+
+@dataclass(frozen=True)
+class SimConfig:
+    """Knobs of the abstract duel."""
+
+    punch_damage: float = 300.0
+    """Damage of a vanilla (power scale 1.0) punch."""
+    blast_damage: float = 250.0
+    """Damage of a blast skill going off next to the other side."""
+    damage_spread: tuple[float, float] = (0.6, 1.2)
+    """Random range every hit's damage gets multiplied by."""
+    accuracy: float = 0.6
+    """Chance of landing a hit between two equally fast characters."""
+    speed_weight: float = 0.5
+    """How much faster characters hit (and dodge) more often."""
+    time_limit: float = 60.0
+    """Duels lasting longer than this are draws."""
+
+
+@dataclass(frozen=True)
+class SkillModel:
+    """A cooldown-shown skill the simulator knows how to play."""
+
+    kind: str
+    """``"grab"``, ``"blast"`` or ``"rewind"``."""
+    cooldown: float
+
+
+@dataclass(frozen=True)
+class CombatModel:
+    """What the simulator knows about a character."""
+
+    name: str
+    hitpoints: float
+    shields: float
+    armor: int
+    speed: float
+    punch_interval: float
+    punch_power: float
+    shield_regen: float = 0.0
+    """Shields regained per second, once not hurt for a while."""
+    shield_regen_delay: float = 0.0
+    armor_drain: float = 0.0
+    """Armor lost per drain tick."""
+    armor_drain_interval: float = 1.0
+    armor_drain_floor: float = 0.0
+    grab_damage: float = 0.0
+    grab_ticks: int = 0
+    grab_interval: float = 0.0
+    grab_recovery: float = 0.0
+    skills: tuple[SkillModel, ...] = ()
+    unmodelled: tuple[str, ...] = ()
+    """Cooldown-shown skills left out of the duel."""
+
+
+def _skill_kind(skill: type) -> Optional[str]:
+    from bombgeon.characters.b9000 import GrabDash
+    from bombgeon.characters.ninja import Dash, TimeTravel
+
+    if issubclass(skill, GrabDash):
+        return "grab"
+    if issubclass(skill, Dash):
+        return "blast"
+    if issubclass(skill, TimeTravel):
+        return "rewind"
+    return None
+
+
+def _model_from_spawn(entry: BombgeonCharacterEntry) -> CombatModel:
+    import bascenev1 as bs
+    from bascenev1lib.actor.spaz import Spaz
+
+    spaz = Spaz(character=entry.name, start_invincible=False)
+    assert isinstance(spaz, BombgeonCharBase)
+    try:
+        cls = type(spaz)
+        punch = cls.skill_punch
+        punch_interval = spaz._punch_cooldown / 1000
+        if punch is not None:
+            punch_interval = max(punch_interval, punch.cooldown_time)
+        skills: list[SkillModel] = []
+        unmodelled: list[str] = []
+        for skill in (cls.skill_grab, cls.skill_bomb, cls.skill_jump):
+            if skill is None or not skill.show_cooldown:
+                continue
+            kind = _skill_kind(skill)
+            if kind is None:
+                unmodelled.append(skill.__name__)
+            else:
+                skills.append(SkillModel(kind, skill.cooldown_time))
+        has_grab = any(skill.kind == "grab" for skill in skills)
+        return CombatModel(
+            name=entry.name,
+            hitpoints=spaz.hitpoints_max,
+            shields=spaz.shieldHP_max,
+            armor=spaz.armorHP_max,
+            speed=spaz.speed,
+            punch_interval=punch_interval,
+            punch_power=spaz._punch_power_scale,
+            shield_regen=spaz.shield_regen_rate,
+            shield_regen_delay=spaz.shield_regen_delay,
+            armor_drain=getattr(spaz, "armor_drain_rate", 0.0),
+            armor_drain_interval=getattr(spaz, "armor_drain_interval", 1.0),
+            armor_drain_floor=getattr(spaz, "armor_drain_floor", 0.0),
+            grab_damage=spaz.grab_damage if has_grab else 0.0,
+            grab_ticks=spaz.grab_repeats if has_grab else 0,
+            grab_interval=spaz.grab_delay if has_grab else 0.0,
+            grab_recovery=spaz.grab_recovery if has_grab else 0.0,
+            skills=tuple(skills),
+            unmodelled=tuple(unmodelled),
+        )
+    finally:
+        spaz.handlemessage(bs.DieMessage(immediate=True))
+
+
+def build_models() -> list[CombatModel]:
+    """Build a model of every character in the roster.
+
+    Spawns each character for a moment, so this must be run in the
+    context of a running activity.
+    """
+    return [_model_from_spawn(entry) for entry in get_bombgeon_roster()]
+
+
+@dataclass
+class MatchupResult:
+    """Outcome of a bunch of duels between two characters."""
+
+    wins: int = 0
+    losses: int = 0
+    draws: int = 0
+    ttk: list[int] = field(default_factory=list)
+    """Histogram of how long wins took, in TTK_BIN wide bins."""
+
+    @property
+    def duels(self) -> int:
+        """How many duels were fought."""
+        return self.wins + self.losses + self.draws
+
+    @property
+    def win_rate(self) -> float:
+        """Share of duels won (draws count as half)."""
+        if not self.duels:
+            return 0.0
+        return (self.wins + self.draws * 0.5) / self.duels
+
+    def merge(self, other: MatchupResult) -> None:
+        """Add another result's duels to ours."""
+        self.wins += other.wins
+        self.losses += other.losses
+        self.draws += other.draws
+        if len(other.ttk) > len(self.ttk):
+            self.ttk.extend([0] * (len(other.ttk) - len(self.ttk)))
+        for i, count in enumerate(other.ttk):
+            self.ttk[i] += count
+
+    def ttk_percentile(self, percent: float) -> Optional[float]:
+        """Return the time (upper bin edge) ``percent`` of wins took."""
+        total = sum(self.ttk)
+        if not total:
+            return None
+        cumulative = []
+        running = 0
+        for count in self.ttk:
+            running += count
+            cumulative.append(running)
+        index = bisect.bisect_left(cumulative, total * percent / 100)
+        return (index + 1) * TTK_BIN
+
+
+class _Fighter:
+    __slots__ = (
+        "model",
+        "hp",
+        "shield",
+        "armor",
+        "ready",
+        "last_hit",
+        "next_regen",
+        "next_drain",
+        "rewound_at",
+        "history_times",
+        "history",
+    )
+
+    def __init__(self, model: CombatModel) -> None:
+        self.model = model
+        self.hp = model.hitpoints
+        self.shield = model.shields
+        self.armor = model.armor
+        # when the punch (index 0) and each skill are ready next
+        self.ready = [0.0] * (1 + len(model.skills))
+        self.last_hit = 0.0
+        self.next_regen = SHIELD_REGEN_TICK
+        self.next_drain = (
+            model.armor_drain_interval if model.armor_drain else float("inf")
+        )
+        self.rewound_at = 0.0
+        # (hp, shield, armor) as of each time they changed
+        self.history_times = [0.0]
+        self.history = [(self.hp, self.shield, self.armor)]
+
+    def remember(self, now: float) -> None:
+        """Note our current values, for rewinds."""
+        self.history_times.append(now)
+        self.history.append((self.hp, self.shield, self.armor))
+
+    def hurt(self, damage: float, now: float) -> None:
+        """Take a hit."""
+        self.armor, self.shield, self.hp = absorb(
+            damage, self.armor, self.shield, self.hp
+        )
+        self.last_hit = now
+        self.remember(now)
+
+    def catch_up(self, now: float) -> None:
+        """Run shield regen and armor drain ticks up to ``now``."""
+        model = self.model
+        while self.next_regen <= now:
+            if (
+                self.shield < model.shields
+                and self.next_regen - self.last_hit >= model.shield_regen_delay
+            ):
+                self.shield = min(
+                    model.shields,
+                    self.shield + int(model.shield_regen * SHIELD_REGEN_TICK),
+                )
+                self.remember(self.next_regen)
+            self.next_regen += SHIELD_REGEN_TICK
+        while self.next_drain <= now:
+            if self.armor >= model.armor_drain_floor:
+                self.armor = int(max(0, self.armor - model.armor_drain))
+                self.remember(self.next_drain)
+            self.next_drain += model.armor_drain_interval
+
+    def rewind(self, now: float) -> None:
+        """Go back to our values of REWIND_SPAN ago (or our last rewind)."""
+        since = max(now - REWIND_SPAN, self.rewound_at)
+        index = max(0, bisect.bisect_right(self.history_times, since) - 1)
+        self.hp, self.shield, self.armor = self.history[index]
+        self.rewound_at = now
+        self.remember(now)
+
+
+def _duel(
+    first: CombatModel,
+    second: CombatModel,
+    config: SimConfig,
+    rng: random.Random,
+) -> tuple[int, float]:
+    """Fight one duel; return the winner (0, 1 or -1 for a draw) and
+    how long it took.
+    """
+    # pylint: disable=too-many-locals
+    # pylint: disable=too-many-branches
+    fighters = (_Fighter(first), _Fighter(second))
+    # random first strike
+    fighters[rng.random() < 0.5].ready[0] = rng.random() * 0.1
+    low, high = config.damage_spread
+    # skill effects landing later: (time, order, side, kind)
+    pending: list[tuple[float, int, int, str]] = []
+    order = 0
+    while True:
+        # the earliest action of either fighter goes next...
+        side, action, now = 0, 0, float("inf")
+        for i, fighter in enumerate(fighters):
+            for j, ready in enumerate(fighter.ready):
+                if ready < now:
+                    side, action, now = i, j, ready
+        # ...unless a skill effect lands before it.
+        effect = None
+        if pending and pending[0][0] <= now:
+            now, _, side, effect = heapq.heappop(pending)
+        if now > config.time_limit:
+            return -1, config.time_limit
+        for fighter in fighters:
+            fighter.catch_up(now)
+
+        attacker = fighters[side]
+        defender = fighters[1 - side]
+        model = attacker.model
+
+        if effect == "grab":
+            defender.hurt(model.grab_damage, now)
+            attacker.armor += model.grab_recovery
+            attacker.remember(now)
+            if defender.hp <= 0:
+                return side, now
+            continue
+        if effect == "rewind":
+            attacker.rewind(now)
+            continue
+
+        if action == 0:
+            attacker.ready[0] = now + model.punch_interval
+            kind = "punch"
+        else:
+            skill = model.skills[action - 1]
+            kind = skill.kind
+            if kind == "rewind" and attacker.hp >= model.hitpoints:
+                # nothing to rewind yet; check again in a bit.
+                attacker.ready[action] = now + 0.1
+                continue
+            attacker.ready[action] = now + skill.cooldown
+            if kind == "rewind":
+                order += 1
+                heapq.heappush(
+                    pending, (now + REWIND_DELAY, order, side, "rewind")
+                )
+                continue
+
+        chance = config.accuracy * (
+            (model.speed / defender.model.speed) ** config.speed_weight
+        )
+        if rng.random() >= min(max(chance, 0.05), 0.95):
+            continue
+
+        if kind == "grab":
+            # nobody acts until the drain is over.
+            start = now + GRAB_DELAY
+            for tick in range(model.grab_ticks):
+                order += 1
+                heapq.heappush(
+                    pending,
+                    (start + tick * model.grab_interval, order, side, "grab"),
+                )
+            held_until = start + model.grab_ticks * model.grab_interval
+            for fighter in fighters:
+                fighter.ready = [max(r, held_until) for r in fighter.ready]
+            continue
+
+        if kind == "punch":
+            damage = config.punch_damage * model.punch_power
+        else:
+            damage = config.blast_damage
+        defender.hurt(damage * rng.uniform(low, high), now)
+        if defender.hp <= 0:
+            return side, now
+
+
+def simulate_matchup(
+    first: CombatModel,
+    second: CombatModel,
+    duels: int,
+    seed: int,
+    config: SimConfig = SimConfig(),
+) -> MatchupResult:
+    """Fight ``duels`` duels between two characters (from the first
+    one's point of view).
+    """
+    rng = random.Random(seed)
+    result = MatchupResult(ttk=[0] * (int(config.time_limit / TTK_BIN) + 1))
+    for _ in range(duels):
+        winner, duration = _duel(first, second, config, rng)
+        if winner == 0:
+            result.wins += 1
+            result.ttk[int(duration / TTK_BIN)] += 1
+        elif winner == 1:
+            result.losses += 1
+        else:
+            result.draws += 1
+    return result
+
+
+@dataclass
+class BalanceReport:
+    """Everything a simulation run found."""
+
+    names: list[str]
+    results: dict[tuple[str, str], MatchupResult]
+
+    def win_rates(self) -> dict[str, dict[str, float]]:
+        """Return ``rates[a][b]``: how often ``a`` beats ``b``."""
+        return {
+            a: {b: self.results[a, b].win_rate for b in self.names if b != a}
+            for a in self.names
+        }
+
+    def format(self) -> str:
+        """Return the win-rate matrix and TTKs as a printable table."""
+        width = max(len(name) for name in self.names) + 2
+        lines = [
+            "win rate (row vs column)",
+            " " * width + "".join(f"{n:>{width}}" for n in self.names),
+        ]
+        rates = self.win_rates()
+        for a in self.names:
+            cells = "".join(
+                f"{'-':>{width}}" if a == b else f"{rates[a][b]:>{width}.1%}"
+                for b in self.names
+            )
+            lines.append(f"{a:<{width}}{cells}")
+        lines.append("")
+        lines.append("time to kill on wins (median / 90th percentile)")
+        for (a, b), result in sorted(self.results.items()):
+            p50 = result.ttk_percentile(50)
+            p90 = result.ttk_percentile(90)
+            if p50 is None or p90 is None:
+                continue
+            lines.append(f"{a} vs {b}: {p50:.1f}s / {p90:.1f}s")
+        return "\n".join(lines)
+
+
+def run(
+    duels: int = 100_000,
+    models: Optional[list[CombatModel]] = None,
+    workers: Optional[int] = None,
+    chunk: int = 20_000,
+    seed: int = 0,
+    config: SimConfig = SimConfig(),
+) -> BalanceReport:
+    """Fight ``duels`` duels for every ordered pair of characters.
+
+    Without ``models``, the current roster gets modelled (which must
+    be done in an activity; see ``build_models``). Work is spread over
+    a process pool of ``workers`` (default: one per cpu) when running
+    headless, and stays in-process in the game or with ``workers=0``.
+    """
+    import baheadless
+
+    if models is None:
+        models = build_models()
+    jobs = []
+    job_seed = seed
+    for a in models:
+        for b in models:
+            if a is b:
+                continue
+            for start in range(0, duels, chunk):
+                jobs.append((a, b, min(chunk, duels - start), job_seed))
+                job_seed += 1
+
+    results = {
+        (a.name, b.name): MatchupResult()
+        for a in models
+        for b in models
+        if a is not b
+    }
+    if workers == 0 or not baheadless.is_installed():
+        for a, b, count, job_seed in jobs:
+            results[a.name, b.name].merge(
+                simulate_matchup(a, b, count, job_seed, config)
+            )
+    else:
+        import multiprocessing
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            # Fresh workers have no engine either; this has to happen
+            # before they import us to unpickle their jobs.
+            initializer=baheadless.install,
+        ) as pool:
+            futures = [
+                (a.name, b.name, pool.submit(simulate_matchup, *job, config))
+                for job in jobs
+                for a, b in [job[:2]]
+            ]
+            for a_name, b_name, future in futures:
+                results[a_name, b_name].merge(future.result())
+    return BalanceReport([m.name for m in models], results)
+
+
+def main() -> None:
+    """Headless entry point; models the roster and prints a report."""
+    import baheadless
+    import bascenev1 as bs
+
+    parser = argparse.ArgumentParser(prog="bombgeon.balance")
+    parser.add_argument("--duels", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    class _BalanceActivity(bs.Activity[bs.Player, bs.Team]):
+        pass
+
+    activity = baheadless.new_activity(_BalanceActivity)
+    with activity.context:
+        models = build_models()
+    for model in models:
+        print(model)
+    report = run(args.duels, models, args.workers, seed=args.seed)
+    print(report.format())
@@ -0,0 +1,461 @@
+"""Quick benchmarks for bombgeon internals.
+
+Run these from the dev console (or any python context that can import
+the game modules), e.g.::
+
+    import bombgeon.benchmarks as b; b.run_all()
+
+or without the game, through the headless stand-ins::
+
+    python -m baheadless -c "import bombgeon.benchmarks as b; b.run_headless()"
+"""
+
+from __future__ import annotations
+
+import time
+from inspect import isfunction
+from types import MethodType
+from typing import Any, Callable
+
+from bombgeon.characters.internal import (
+    DASH_IMPULSE_REPEATS,
+    BombgeonCharBase,
+    apply_dash,
+    get_bombgeon_roster,
+    get_character_class,
+)
+
+
+def _timeit(call: Callable[[], Any], iterations: int) -> float:
+    """Return the average cost of ``call`` in microseconds."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        call()
+    return (time.perf_counter() - start) / iterations * 1_000_000
+
+
+def _legacy_graft(obj: BombgeonCharBase, character: str) -> None:
+    """The old per-spawn path: scan the roster and bind every
+    character function onto the instance.
+    """
+    for char in get_bombgeon_roster():
+        if not character == char.name:
+            continue
+        for name, method in char.character.__dict__.items():
+            if name.startswith("__"):
+                continue
+            if isfunction(method):
+                setattr(obj, name, MethodType(method, obj))
+            else:
+                setattr(obj, name, method)
+        return
+    raise NameError(character)
+
+
+def _bare(base: type[BombgeonCharBase]) -> BombgeonCharBase:
+    """Make an uninitialized character that dies quietly."""
+    obj = object.__new__(base)
+    # Looks expired to Actor.__del__, so it doesn't try to kill us.
+    obj.__dict__["_activity"] = lambda: None
+    return obj
+
+
+def bench_character_spawn(
+    iterations: int = 10000, base: type[BombgeonCharBase] = BombgeonCharBase
+) -> dict[str, dict[str, float]]:
+    """Compare the character binding cost of a spawn, old vs new.
+
+    Only the character setup part of a spawn is measured (spaz node
+    creation and the like is the same for both paths).
+    """
+    results: dict[str, dict[str, float]] = {}
+    for entry in get_bombgeon_roster():
+        name = entry.name
+
+        def _old() -> BombgeonCharBase:
+            obj = _bare(base)
+            _legacy_graft(obj, name)
+            return obj
+
+        def _new() -> BombgeonCharBase:
+            obj = _bare(base)
+            obj.__class__ = get_character_class(base, name)
+            return obj
+
+        results[name] = {
+            "legacy_us": _timeit(_old, iterations),
+            "compiled_us": _timeit(_new, iterations),
+            "legacy_dict_len": len(_old().__dict__),
+            "compiled_dict_len": len(_new().__dict__),
+        }
+    return results
+
+
+def bench_health_hud_nodes(count: int = 32) -> dict[str, int]:
+    """Count the scene nodes ``count`` spazzes cost with each
+    health readout mode.
+
+    Must be run in the context of a running activity.
+    """
+    import bascenev1 as bs
+    from bascenev1lib.actor.spaz import Spaz
+
+    activity = bs.getactivity()
+    old_mode = activity.compact_health_hud
+    results: dict[str, int] = {}
+    for label, compact in (("layered", False), ("compact", True)):
+        activity.compact_health_hud = compact
+        before = len(bs.getnodes())
+        spazzes = [Spaz(start_invincible=False) for _ in range(count)]
+        for spaz in spazzes:
+            # pylint: disable=protected-access
+            spaz._update_health_text()
+        results[label] = len(bs.getnodes()) - before
+        for spaz in spazzes:
+            spaz.handlemessage(bs.DieMessage(immediate=True))
+    activity.compact_health_hud = old_mode
+    return results
+
+
+def bench_popups(count: int = 100) -> dict[str, float]:
+    """Time ``count`` damage popups as separate actors and through the
+    shared pool, and count the nodes they leave up.
+
+    Must be run in the context of a running activity.
+    """
+    import bascenev1 as bs
+    from bascenev1lib.actor.popuptext import PopupText, PopupTextPool
+
+    # Lift the rate limit for our own pool so nothing gets dropped.
+    pool = PopupTextPool()
+    pool.MAX_PER_SECOND = count
+    results: dict[str, float] = {}
+    before = len(bs.getnodes())
+    start = time.perf_counter()
+    popups = [PopupText(f"{i}%") for i in range(count)]
+    results["actor_us"] = (time.perf_counter() - start) / count * 1_000_000
+    results["actor_nodes"] = len(bs.getnodes()) - before
+    for popup in popups:
+        popup.handlemessage(bs.DieMessage())
+
+    before = len(bs.getnodes())
+    start = time.perf_counter()
+    for i in range(count):
+        pool.show(f"{i}%")
+    results["pooled_us"] = (time.perf_counter() - start) / count * 1_000_000
+    results["pooled_nodes"] = len(bs.getnodes()) - before
+    return results
+
+
+def _legacy_dash(spaz: BombgeonCharBase, strength: float, lift: float) -> None:
+    """The old dash: a lift impulse and then one impulse per repeat."""
+    node = spaz.node
+    node.handlemessage(
+        "impulse", *node.position, 0, 25, 0, lift, 0.05, 0, 0, 0, 8000, 0
+    )
+    v = node.velocity
+    for _ in range(DASH_IMPULSE_REPEATS):
+        node.handlemessage(
+            "impulse",
+            *node.position,
+            0,
+            25,
+            0,
+            strength,
+            0.05,
+            0,
+            0,
+            v[0] * 30,
+            0,
+            v[2] * 30,
+        )
+
+
+def bench_dash(
+    iterations: int = 200, strength: float = 55, lift: float = 2
+) -> dict[str, float]:
+    """Time a dash the old way and through ``apply_dash``.
+
+    Only measures call cost; the headless stand-ins have no physics,
+    so nothing is said about how far either one moves a spaz.
+    Must be run in the context of a running activity.
+    """
+    import bascenev1 as bs
+    from bascenev1lib.actor.spaz import Spaz
+
+    spaz = Spaz(start_invincible=False)
+    spaz.handlemessage(bs.StandMessage((0, 5, 0), 0))
+    results = {
+        "legacy_us": _timeit(
+            lambda: _legacy_dash(spaz, strength, lift), iterations
+        ),
+        "helper_us": _timeit(
+            lambda: apply_dash(spaz, None, strength, lift), iterations
+        ),
+    }
+    spaz.handlemessage(bs.DieMessage(immediate=True))
+    return results
+
+
+def _legacy_bot_target(
+    pts: list[tuple[Any, Any]], position: Any
+) -> tuple[Any, Any]:
+    """The old per-bot target search: a Vec3 scan over every player."""
+    import bascenev1 as bs
+
+    botpt = bs.Vec3(position)
+    closest_dist = None
+    closest = None
+    for plpt, plvel in pts:
+        dist = (plpt - botpt).length()
+        if (closest_dist is None or dist < closest_dist) and (
+            plpt[1] > botpt[1] - 5.0
+        ):
+            closest_dist = dist
+            closest = (plpt, plvel)
+    if closest is None:
+        return None, None
+    return bs.Vec3(*closest[0]), bs.Vec3(*closest[1])
+
+
+def bench_bot_targets(
+    bots: int = 200, players: int = 32, size: float = 30.0
+) -> dict[str, float]:
+    """Time one bot-set update's worth of target searches for ``bots``
+    bots among ``players`` players spread over a ``size`` wide map,
+    the old way and through a shared PlayerPointGrid.
+    """
+    import random
+
+    import bascenev1 as bs
+    from bascenev1lib.actor.spazbot import PlayerPointGrid
+
+    rng = random.Random(0)
+
+    def _point() -> tuple[float, float, float]:
+        return (
+            rng.uniform(-size / 2, size / 2),
+            rng.uniform(0.0, 4.0),
+            rng.uniform(-size / 2, size / 2),
+        )
+
+    raw = [(_point(), (0.0, 0.0, 0.0)) for _ in range(players)]
+    bot_pts = [_point() for _ in range(bots)]
+
+    def _legacy() -> None:
+        pts = [(bs.Vec3(pos), bs.Vec3(vel)) for pos, vel in raw]
+        for pos in bot_pts:
+            _legacy_bot_target(pts, pos)
+
+    def _grid() -> None:
+        grid = PlayerPointGrid(raw)
+        for pos in bot_pts:
+            grid.nearest(pos)
+
+    return {
+        "legacy_us": _timeit(_legacy, 20),
+        "grid_us": _timeit(_grid, 20),
+    }
+
+
+def _legacy_runaround_move(
+    boxes: dict[str, Any], row: int, pos: tuple[float, float, float]
+) -> tuple[int, int] | None:
+    """The old Runaround bot steering: go through every box in order."""
+    from bascenev1 import is_point_in_box
+
+    if row == 1 and is_point_in_box(pos, boxes["b4"]):
+        return 0, 1
+    if row in [1, 2] and is_point_in_box(pos, boxes["b1"]):
+        return 0, 1
+    if is_point_in_box(pos, boxes["b7"]):
+        return 0, 1
+    if is_point_in_box(pos, boxes["b2"]):
+        return 0, -1
+    if is_point_in_box(pos, boxes["b3"]):
+        return 0, -1
+    if is_point_in_box(pos, boxes["b5"]):
+        return 0, -1
+    if is_point_in_box(pos, boxes["b6"]):
+        return 0, 1
+    if (
+        is_point_in_box(pos, boxes["b8"])
+        and not is_point_in_box(pos, boxes["b9"])
+    ) or pos == (0.0, 0.0, 0.0):
+        return 1, 0
+    return None
+
+
+def bench_runaround_routes(bots: int = 200) -> dict[str, float]:
+    """Time one update's worth of Runaround steering for ``bots`` bots
+    spread over Tower D, going through every box and through a
+    compiled BotRoute; also count where the two disagree.
+    """
+    import random
+
+    from bascenev1lib.maps import TowerD
+    from bascenev1lib.game.runaround import get_bot_route
+
+    rng = random.Random(0)
+    boxes = TowerD.defs.boxes
+    bounds = boxes["b8"]
+    spots = [
+        (
+            rng.choice((1, 2, 3)),
+            (
+                bounds[0] + rng.uniform(-0.5, 0.5) * bounds[6],
+                bounds[1] + rng.uniform(-0.5, 0.5) * bounds[7],
+                bounds[2] + rng.uniform(-0.5, 0.5) * bounds[8],
+            ),
+        )
+        for _ in range(bots)
+    ]
+    routes = {row: get_bot_route(TowerD, row) for row in (1, 2, 3)}
+
+    def _legacy() -> None:
+        for row, pos in spots:
+            _legacy_runaround_move(boxes, row, pos)
+
+    def _route() -> None:
+        for row, pos in spots:
+            routes[row].get_move(pos)
+
+    mismatches = sum(
+        _legacy_runaround_move(boxes, row, pos) != routes[row].get_move(pos)
+        for row, pos in spots
+    )
+    return {
+        "legacy_us": _timeit(_legacy, 50),
+        "route_us": _timeit(_route, 50),
+        "mismatches": mismatches,
+    }
+
+
+def bench_blast_fx(count: int = 50) -> dict[str, Any]:
+    """Count the scene nodes ``count`` blasts at once leave up without
+    and with the activity's fx budget.
+
+    Must be run in the context of a running activity.
+    """
+    import bascenev1 as bs
+    from bascenev1lib.actor.bomb import Blast, BlastFXBudget
+
+    activity = bs.getactivity()
+    # pylint: disable=protected-access
+    storename = BlastFXBudget._STORENAME
+    old_budget = activity.customdata.get(storename)
+    results: dict[str, Any] = {}
+    for label in ("unbudgeted", "budgeted"):
+        budget = activity.customdata[storename] = BlastFXBudget()
+        if label == "unbudgeted":
+            budget.max_particles = budget.max_lights = 1_000_000
+        before = len(bs.getnodes())
+        blasts = [
+            Blast(position=(i * 0.1, 1.0, 0.0), blast_type="tnt")
+            for i in range(count)
+        ]
+        results[label] = len(bs.getnodes()) - before
+        results[f"{label}_stats"] = budget.get_stats()
+        for blast in blasts:
+            blast.handlemessage(bs.DieMessage())
+    if old_budget is None:
+        del activity.customdata[storename]
+    else:
+        activity.customdata[storename] = old_budget
+    return results
+
+
+def run_all() -> None:
+    """Run every benchmark and print out the results."""
+    for name, result in bench_character_spawn().items():
+        print(
+            f"spawn {name}: legacy {result['legacy_us']:.2f}us"
+            f" ({int(result['legacy_dict_len'])} attrs),"
+            f" compiled {result['compiled_us']:.2f}us"
+            f" ({int(result['compiled_dict_len'])} attrs)"
+        )
+
+    try:
+        nodes = bench_health_hud_nodes()
+    except Exception as exc:
+        print(f"health hud nodes: skipped ({exc})")
+    else:
+        print(
+            f"health hud nodes (32 spazzes): layered {nodes['layered']},"
+            f" compact {nodes['compact']}"
+        )
+
+    try:
+        dash = bench_dash()
+    except Exception as exc:
+        print(f"dash: skipped ({exc})")
+    else:
+        print(
+            f"dash per use: legacy {dash['legacy_us']:.2f}us,"
+            f" apply_dash {dash['helper_us']:.2f}us"
+        )
+
+    try:
+        popups = bench_popups()
+    except Exception as exc:
+        print(f"popups: skipped ({exc})")
+    else:
+        print(
+            f"popups per show: actor {popups['actor_us']:.2f}us"
+            f" ({int(popups['actor_nodes'])} nodes),"
+            f" pooled {popups['pooled_us']:.2f}us"
+            f" ({int(popups['pooled_nodes'])} nodes)"
+        )
+
+    try:
+        targets = bench_bot_targets()
+    except Exception as exc:
+        print(f"bot targets: skipped ({exc})")
+    else:
+        print(
+            f"bot targets per update (200 bots, 32 players):"
+            f" legacy {targets['legacy_us']:.0f}us,"
+            f" grid {targets['grid_us']:.0f}us"
+        )
+
+    try:
+        routes = bench_runaround_routes()
+    except Exception as exc:
+        print(f"runaround routes: skipped ({exc})")
+    else:
+        print(
+            f"runaround steering per update (200 bots):"
+            f" legacy {routes['legacy_us']:.0f}us,"
+            f" route {routes['route_us']:.0f}us"
+            f" ({int(routes['mismatches'])} mismatches)"
+        )
+
+    try:
+        fx = bench_blast_fx()
+    except Exception as exc:
+        print(f"blast fx: skipped ({exc})")
+    else:
+        stats = fx["budgeted_stats"]
+        print(
+            f"blast nodes (50 tnt blasts): unbudgeted {fx['unbudgeted']},"
+            f" budgeted {fx['budgeted']} ({stats['quality']} quality,"
+            f" {stats['skipped_lights']} lights skipped)"
+        )
+
+
+def run_headless() -> None:
+    """Run every benchmark in a headless activity.
+
+    Needs the headless stand-ins (``baheadless``) installed.
+    """
+    import baheadless
+    import bascenev1 as bs
+
+    assert baheadless.is_installed()
+
+    class _BenchActivity(bs.Activity[bs.Player, bs.Team]):
+        pass
+
+    activity = baheadless.new_activity(_BenchActivity)
+    with activity.context:
+        run_all()
@@ -11,11 +11,15 @@ from .internal import (
     BombgeonAppearance,
     BombgeonCharacterEntry,
     CharacterSkill,
+    ChannelledSkill,
+    ModifiedStat,
+    apply_dash,
 )
 
 from bascenev1lib.actor.spazfactory import SpazFactory
 from bascenev1lib.actor.bomb import Bomb
 from bascenev1lib.actor.spaz import PunchHitMessage, Spaz, PickupMessage
+from bascenev1lib.actor.ticker import ActorTicker
 
 import random
 
@@ -64,114 +68,105 @@ class Jump(CharacterSkill):
         spaz.node.jump_pressed = False
 
 
-class UndergroundDive(CharacterSkill):
+class UndergroundDive(ChannelledSkill):
     """bbombp"""
 
     cooldown_time = 16
     show_cooldown = True
+    tick_interval = 0.1
+    tick_count = 45
+    icon = "shrapnel1Color"
+    sounds = {"gravel": ("gravelSkid",)}
 
     def __init__(self):
         super().__init__()
-        # Gotta define it here or else problems
-        self.texture_icon = bs.gettexture("shrapnel1Color")
+        self.gravelsound: bs.Node | None = None
+        self.smoke: bs.Node | None = None
 
     def perform(self, spaz: BombgeonCharBase) -> None:
+        spaz.actionable = False
+        spaz.node.jump_pressed = True
+        spaz.node.jump_pressed = False
+        bs.timer(0.3, bs.Call(self.getin, spaz))
 
-        def getout():
-            spaz.actionable = True
-            spaz.node.jump_pressed = True
-            spaz.node.jump_pressed = False
-
-            spaz.node.head_mesh = bs.getmesh("cyborgHead")
-            spaz.node.torso_mesh = bs.getmesh("cyborgTorso")
-            spaz.node.pelvis_mesh = bs.getmesh("cyborgPelvis")
-            spaz.node.upper_arm_mesh = bs.getmesh("cyborgUpperArm")
-            spaz.node.forearm_mesh = bs.getmesh("cyborgForeArm")
-            spaz.node.hand_mesh = bs.getmesh("cyborgHand")
-            spaz.node.upper_leg_mesh = bs.getmesh("cyborgUpperLeg")
-            spaz.node.lower_leg_mesh = bs.getmesh("cyborgLowerLeg")
-            spaz.node.toes_mesh = bs.getmesh("cyborgToes")
-            spaz.node.invincible = False
-            spaz.gravelsound.delete()
-            spaz.smoke.delete()
-            spaz.node.run = 0.0
-
-        def getin():
-            if not spaz.is_alive():
-                return
-            spaz.node.head_mesh = None
-            spaz.node.torso_mesh = None
-            spaz.node.pelvis_mesh = None
-            spaz.node.upper_arm_mesh = None
-            spaz.node.forearm_mesh = None
-            spaz.node.hand_mesh = None
-            spaz.node.upper_leg_mesh = None
-            spaz.node.lower_leg_mesh = None
-            spaz.node.toes_mesh = None
-            spaz.node.invincible = True
-            spaz.gravelsound = bs.newnode(
-                "sound",
-                attrs={"sound": bs.getsound("gravelSkid"), "volume": 0.75},
-            )
-            spaz.smoke = bs.newnode(
-                "flash",
-                attrs={
-                    "position": spaz.node.position,
-                    "size": 0.3,
-                    "color": spaz.node.color,
-                },
-            )
-            _ = 0.1
-            times = 45
-            for i in range(times):
-                bs.timer(_ * i, tick)
-
-            bs.timer(_ * times, getout)
+    def getin(self, spaz: BombgeonCharBase) -> None:
+        if not spaz.is_alive():
+            return
+        spaz.node.head_mesh = None
+        spaz.node.torso_mesh = None
+        spaz.node.pelvis_mesh = None
+        spaz.node.upper_arm_mesh = None
+        spaz.node.forearm_mesh = None
+        spaz.node.hand_mesh = None
+        spaz.node.upper_leg_mesh = None
+        spaz.node.lower_leg_mesh = None
+        spaz.node.toes_mesh = None
+        spaz.node.invincible = True
+        self.gravelsound = bs.newnode(
+            "sound",
+            attrs={"sound": self.get_sounds("gravel")[0], "volume": 0.75},
+        )
+        self.smoke = bs.newnode(
+            "flash",
+            attrs={
+                "position": spaz.node.position,
+                "size": 0.3,
+                "color": spaz.node.color,
+            },
+        )
+        self.channel(spaz)
+
+    def getout(self, spaz: BombgeonCharBase) -> None:
+        if self.gravelsound:
+            self.gravelsound.delete()
+        if self.smoke:
+            self.smoke.delete()
+        self.gravelsound = self.smoke = None
+        spaz.actionable = True
+        if not spaz.node:
+            return
 
-        def tick():
-            if not spaz.is_alive():
-                spaz.gravelsound.delete()
-                spaz.smoke.delete()
-                return
-            spaz.node.run = 1.0
-            bs.emitfx(
-                position=spaz.node.position,
-                velocity=(0, 2, 0),
-                count=int(4.0 + random.random() * 8),
-                scale=1,
-                spread=1.0,
-                chunk_type="rock",
-            )
-            spaz.armor_drain_rate *= 1.1
-            def undrain():
-                spaz.armor_drain_rate /= 1.1
-            bs.timer(0.5, undrain)
-
-            for _ in range(50):
-                v = spaz.node.velocity
-                spaz.node.handlemessage(
-                    "impulse",
-                    spaz.node.position[0],
-                    spaz.node.position[1],
-                    spaz.node.position[2],
-                    0,
-                    25,
-                    0,
-                    -15,
-                    0.05,
-                    0,
-                    0,
-                    0,
-                    20 * 400,
-                    0,
-                )
+        spaz.node.head_mesh = bs.getmesh("cyborgHead")
+        spaz.node.torso_mesh = bs.getmesh("cyborgTorso")
+        spaz.node.pelvis_mesh = bs.getmesh("cyborgPelvis")
+        spaz.node.upper_arm_mesh = bs.getmesh("cyborgUpperArm")
+        spaz.node.forearm_mesh = bs.getmesh("cyborgForeArm")
+        spaz.node.hand_mesh = bs.getmesh("cyborgHand")
+        spaz.node.upper_leg_mesh = bs.getmesh("cyborgUpperLeg")
+        spaz.node.lower_leg_mesh = bs.getmesh("cyborgLowerLeg")
+        spaz.node.toes_mesh = bs.getmesh("cyborgToes")
+        spaz.node.invincible = False
+        spaz.node.run = 0.0
+
+    def on_tick(self, spaz: BombgeonCharBase, index: int) -> None:
+        spaz.node.run = 1.0
+        bs.emitfx(
+            position=spaz.node.position,
+            velocity=(0, 2, 0),
+            count=int(4.0 + random.random() * 8),
+            scale=1,
+            spread=1.0,
+            chunk_type="rock",
+        )
+        spaz.add_modifier(
+            "armor_drain_rate",
+            "underground_dive",
+            mult=1.1,
+            duration=0.5,
+            stacking=True,
+        )
+        apply_dash(spaz, (0, 20 * 400, 0), -15)
 
-            spaz.smoke.position = spaz.node.position
+        if self.smoke:
+            self.smoke.position = spaz.node.position
 
-        spaz.actionable = False
+    def on_complete(self, spaz: BombgeonCharBase) -> None:
+        self.getout(spaz)
         spaz.node.jump_pressed = True
         spaz.node.jump_pressed = False
-        bs.timer(0.3, getin)
+
+    def on_interrupt(self, spaz: BombgeonCharBase) -> None:
+        self.getout(spaz)
 
 
 class GrabDash(CharacterSkill):
@@ -179,11 +174,20 @@ class GrabDash(CharacterSkill):
 
     cooldown_time = 9
     show_cooldown = True
+    icon = "achievementSuperPunch"
+    sounds = {
+        "explode": (
+            "explosion01",
+            "explosion02",
+            "explosion03",
+            "explosion04",
+            "explosion05",
+        ),
+        "debris": ("debrisFall",),
+    }
 
     def __init__(self):
         super().__init__()
-        # Gotta define it here or else problems
-        self.texture_icon = bs.gettexture("achievementSuperPunch")
         # handled by "Punch" class
         self.has_punched = False
 
@@ -216,42 +220,7 @@ class GrabDash(CharacterSkill):
             spaz.node.pickup_pressed = False
 
         def dash():
-            xforce = 55
-            yforce = 2
-            spaz.node.handlemessage(
-                "impulse",
-                spaz.node.position[0],
-                spaz.node.position[1],
-                spaz.node.position[2],
-                0,
-                25,
-                0,
-                yforce,
-                0.05,
-                0,
-                0,
-                0,
-                20 * 400,
-                0,
-            )
-            v = spaz.node.velocity
-            for _ in range(50):
-                spaz.node.handlemessage(
-                    "impulse",
-                    spaz.node.position[0],
-                    spaz.node.position[1],
-                    spaz.node.position[2],
-                    0,
-                    25,
-                    0,
-                    xforce,
-                    0.05,
-                    0,
-                    0,
-                    v[0] * 15 * 2,
-                    0,
-                    v[2] * 15 * 2,
-                )
+            apply_dash(spaz, None, 55, lift=2)
 
         dash()
         bs.timer(0.2, grab)
@@ -262,23 +231,55 @@ class GrabDash(CharacterSkill):
         random.choice(SpazFactory.get().foot_impact_sounds).play(
             position=spaz.node.position
         )
-        explode_sounds = (
-            bs.getsound("explosion01"),
-            bs.getsound("explosion02"),
-            bs.getsound("explosion03"),
-            bs.getsound("explosion04"),
-            bs.getsound("explosion05"),
+        random.choice(self.get_sounds("explode")).play(
+            position=spaz.node.position
         )
-        debris_fall_sound = bs.getsound("debrisFall")
+        self.get_sounds("debris")[0].play(position=spaz.node.position)
+
+class HealthDrain(ChannelledSkill):
+    """B9000's grab; steals hp from whoever we're holding each tick.
+    Not bound to an input, see ``B9000Character.drain_hp``.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.target: Spaz | None = None
+
+    def should_interrupt(self, spaz: BombgeonCharBase) -> bool:
+        # dont grab if we punched earlier
+        return ChannelledSkill.should_interrupt(self, spaz) or any(
+            skill.has_punched for skill in spaz.get_skills_from_type(GrabDash)
+        )
+
+    def on_tick(self, spaz: BombgeonCharBase, index: int) -> None:
+        assert self.target is not None
+        spaz.armorHP += spaz.grab_recovery
+        self.target.handlemessage(
+            bs.HitMessage(spaz.node, flat_damage=spaz.grab_damage)
+        )
+
+    def release(self, spaz: BombgeonCharBase) -> None:
+        """Let go of our target."""
+        if self.target is not None:
+            self.target.stunned = False
+            self.target = None
+        if spaz.node:
+            spaz.node.hold_node = None
+            spaz.node.invincible = False
+        spaz.actionable = True
+
+    def on_complete(self, spaz: BombgeonCharBase) -> None:
+        self.release(spaz)
+
+    def on_interrupt(self, spaz: BombgeonCharBase) -> None:
+        self.release(spaz)
 
-        random.choice(explode_sounds).play(position=spaz.node.position)
-        debris_fall_sound.play(position=spaz.node.position)
 
 class B9000Character(BombgeonCharBase):
     """B9000 character."""
 
     # Rule of thumb: Don't use ``super().*``; instead, run ``BombgeonCharBase.*(self)``.
-    # We inject character-based functions on runtime and python doesn't like that a lot.
+    # Our functions get copied onto precompiled classes and python doesn't like that a lot.
     health = 100
     shields = 0
     armor = 5850
@@ -290,11 +291,19 @@ class B9000Character(BombgeonCharBase):
     skill_bomb = UndergroundDive
     skill_grab = GrabDash
 
+    sounds = {"die": ("b900Die1", "b900Die2")}
+
+    armor_drain_rate = ModifiedStat()
+    armor_drain_interval = 1.0
+    """Seconds between armor drain ticks."""
+    armor_drain_floor = 500
+    """Armor doesn't drain below this."""
+
     def __init__(self):
         # To define character specific variables, do ``def __init__(self)``
         # without calling anything but your own variables, and the system
         # will handle it accordingly.
-        self._punch_power_scale *= 0.85
+        self.add_modifier("_punch_power_scale", "character", mult=0.85)
         # self.bomb_type = 'normal_modified'
 
         self.grab_damage = 120
@@ -303,15 +312,18 @@ class B9000Character(BombgeonCharBase):
         self.grab_delay = 0.33
 
         self.armor_drain_rate = 80
+        self._health_drain = HealthDrain()
 
-        self._armor_drain_timer = bs.Timer(1.0, bs.WeakCall(self._armor_drain_tick), repeat=True)
+        self._armor_drain_handle = ActorTicker.get().register(
+            self._armor_drain_tick, self.armor_drain_interval
+        )
 
 
     def _armor_drain_tick(self):
         # eh, dont do it if we stunned
         if not self.is_alive() or self.stunned:
             return
-        if self.armorHP < 500:
+        if self.armorHP < self.armor_drain_floor:
             return
         self.armorHP = int(max(0, self.armorHP - self.armor_drain_rate))
 
@@ -322,10 +334,13 @@ class B9000Character(BombgeonCharBase):
 
             # ow
             if node.getdelegate(Spaz) and (node not in self._punched_nodes):
-                self.armor_drain_rate *= 1.8
-                def undrain():
-                    self.armor_drain_rate /= 1.8
-                bs.timer(1.0, undrain)
+                self.add_modifier(
+                    "armor_drain_rate",
+                    "punch_hit",
+                    mult=1.8,
+                    duration=1.0,
+                    stacking=True,
+                )
 
             return False
 
@@ -372,8 +387,8 @@ class B9000Character(BombgeonCharBase):
     def handle_death(self, msg) -> None:
 
         if not self._dead:
-            self._safe_play_sound(bs.getsound("b900Die1"), 2)
-            self._safe_play_sound(bs.getsound("b900Die2"), 2)
+            for sound in self.get_sounds("die"):
+                self._safe_play_sound(sound, 2)
             SpazFactory.get().splatter_sound.play(
                 1.0,
                 position=self.node.position,
@@ -402,42 +417,12 @@ class B9000Character(BombgeonCharBase):
 
     def drain_hp(self, target_spaz: Spaz) -> None:
         """Drain the health of whoever we are grabbing."""
-        def actionable():
-            target_spaz.stunned = False
-            self.node.hold_node = None
-            self.actionable = True
-            self.node.invincible = False
-
-        def hurt():
-            if have_we_punched():
-                # dont grab if we punched earlier
-                actionable()
-                return
-
-            self.armorHP += self.grab_recovery
-           
-            target_spaz.handlemessage(
-                bs.HitMessage(self.node, flat_damage=self.grab_damage)
-            )
-
-        def have_we_punched() -> bool:
-            # this is very janky
-            grabs = self.get_skills_from_type(GrabDash)
-            for skill in grabs:
-                if skill.has_punched:
-                    return True
-            return False
-
-        if have_we_punched():
-            # dont grab if we punched earlier
-            actionable()
-            return
-        time = self.grab_delay
-        itr = self.grab_repeats
-        for i in range(itr):
-            bs.timer(time * i, hurt)
-
-        bs.timer(time * itr, actionable)
+        if self._health_drain.channelling:
+            self._health_drain.interrupt()
+        self._health_drain.target = target_spaz
+        self._health_drain.tick_interval = self.grab_delay
+        self._health_drain.tick_count = self.grab_repeats
+        self._health_drain.channel(self)
 
 
 # Registering character for usage
@@ -3,11 +3,10 @@
 from __future__ import annotations
 
 import functools
+import weakref
 from enum import Enum
 from abc import abstractmethod
 from dataclasses import dataclass, field
-from inspect import isfunction
-from types import MethodType
 from typing import Any, Callable, Optional, Sequence, Type, TypeVar, Union, override
 
 import bascenev1 as bs
@@ -15,7 +14,14 @@ from bascenev1lib.actor import spaz
 from bascenev1lib.actor.spazappearance import Appearance
 
 from bascenev1lib.actor.spazfactory import SpazFactory
+from bascenev1lib.actor.ticker import ActorTicker, TickHandle
 from bombgeon.utils import AVAILABLE_STYLES
+from bombgeon.characters.internal.cooldownhud import CooldownHUD
+from bombgeon.characters.internal.modifiers import (
+    ModifiedStat,
+    ModifierStack,
+    StatModifier,
+)
 
 
 class _ChrBtn(Enum):
@@ -26,6 +32,9 @@ class _ChrBtn(Enum):
 
 T = TypeVar('T')
 
+_BILLBOARD_SLOTS = {_ChrBtn.GRAB: 1, _ChrBtn.BOMB: 2, _ChrBtn.JUMP: 3}
+"""Mini billboard each input shows its cooldown on."""
+
 class BombgeonCharBase(spaz.Spaz):
     """Bombgeon character with unique qualities."""
 
@@ -44,32 +53,19 @@ class BombgeonCharBase(spaz.Spaz):
     retain_vanilla: bool = True
     """if True, any unassigned skills with fallback to vanilla spaz moves."""
 
-    def _character_method_override(self, character: str):
-        """Get functions and variables from an extenral class
-        according to the character we are currently using.
-        """
-        # it's a pretty ugly fix but it gets the job done.
-        for char in get_bombgeon_roster():
-            if not character == char.name:
-                continue
-            has_init: bool = False
-            for name, method in char.character.__dict__.items():
-                if name.startswith("__"):
-                    if name == "__init__":
-                        has_init = True
-                    continue
-                if isfunction(method):
-                    setattr(self, name, MethodType(method, self))
-                else:
-                    setattr(self, name, method)
-            if has_init:
-                initmethod = char.character.__dict__.get("__init__")
-                assert isinstance(initmethod, Callable)
-                initmethod(self)
-            return
-        raise NameError(
-            f'no bombgeon charbase matches for character "{character}"'
-        )
+    sounds: dict[str, tuple[str, ...]] = {}
+    """Named groups of sounds we use, see ``get_sounds``."""
+
+    _character_init: Optional[Callable[[BombgeonCharBase], None]] = None
+    """Character specific ``__init__``; set on precompiled character classes."""
+
+    _character_compiled: bool = False
+    """True on the precompiled per-character classes."""
+
+    _character_attrs: tuple[str, ...] = ()
+    """Names the precompiled character class carries."""
+
+    _punch_power_scale = ModifiedStat()
 
     def __init__(
         self,
@@ -82,6 +78,11 @@ class BombgeonCharBase(spaz.Spaz):
         powerups_expire: bool = False,
         demo_mode: bool = False,
     ):
+        self.modifiers = ModifierStack()
+        self._channels: list[ChannelledSkill] = []
+        # our character's punch power while boxing gloves replace it.
+        self._gloved_punch: Optional[StatModifier] = None
+
         super().__init__(
             color,
             highlight,
@@ -92,12 +93,30 @@ class BombgeonCharBase(spaz.Spaz):
             powerups_expire,
             demo_mode,
         )
-        self._character_method_override(character)
+        # Now that base init is done, swap ourselves over to the
+        # precompiled class of the character we are using; methods and
+        # stats come with it, nothing to bind.
+        if not self._character_compiled:
+            self.__class__ = get_character_class(type(self), character)
+            # Spaz init sets some of its stats (speed, ...) on the
+            # instance, which would hide the character's ones; the
+            # character wins, as it did when it got grafted on here.
+            for name in self._character_attrs:
+                self.__dict__.pop(name, None)
+
+        self._run_character_init()
+        if self._has_boxing_gloves:
+            self._suspend_character_punch()
 
         self.hitpoints = self.hitpoints_max = self.health
         self.shieldHP = self.shieldHP_max = self.shields
         self.armorHP = self.armorHP_max = self.armor
 
+        self.cooldowns = CooldownHUD(self)
+        self._character_tick_handle = ActorTicker.get().register(
+            self._character_tick, 0.1
+        )
+
         # actionable check
         self.actionable = True
 
@@ -179,35 +198,46 @@ class BombgeonCharBase(spaz.Spaz):
         # Anyway show icons
 
         if skill.can_perform():
+            now = bs.time()
             skill.perform(self)
-            if skill.show_cooldown:
-                try:
-                    match skill_input:
-                        case _ChrBtn.GRAB:
-                            self.node.mini_billboard_1_texture = skill.texture_icon
-                            self.node.mini_billboard_1_start_time = bs.time() * 1000
-                            self.node.mini_billboard_1_end_time = (
-                                bs.time() * 1000
-                            ) + (skill.cooldown_time * 1000)
-                        case _ChrBtn.BOMB:
-                            self.node.mini_billboard_2_texture = skill.texture_icon
-                            self.node.mini_billboard_2_start_time = bs.time() * 1000
-                            self.node.mini_billboard_2_end_time = (
-                                bs.time() * 1000
-                            ) + (skill.cooldown_time * 1000)
-                        case _ChrBtn.JUMP:
-                            self.node.mini_billboard_3_texture = skill.texture_icon
-                            self.node.mini_billboard_3_start_time = bs.time() * 1000
-                            self.node.mini_billboard_3_end_time = (
-                                bs.time() * 1000
-                            ) + (skill.cooldown_time * 1000)
-                    
-                    bs.timer(
-                        skill.cooldown_time,
-                        bs.Call(super()._flash_billboard, skill.texture_icon),
-                    )
-                except bs.NodeNotFoundError:
-                    pass
+            self.cooldowns.start(
+                skill_input,
+                skill.cooldown_time,
+                skill.texture_icon,
+                _BILLBOARD_SLOTS.get(skill_input) if skill.show_cooldown else None,
+                now,
+            )
+
+    def add_modifier(
+        self,
+        stat: str,
+        name: str,
+        add: float = 0.0,
+        mult: float = 1.0,
+        duration: Optional[float] = None,
+        stacking: bool = False,
+    ) -> Any:
+        """Modify one of our stats, optionally for ``duration`` seconds.
+        See ``ModifierStack.add``.
+        """
+        return self.modifiers.add(
+            stat,
+            name,
+            add=add,
+            mult=mult,
+            duration=duration,
+            now=bs.time(),
+            stacking=stacking,
+        )
+
+    def _character_tick(self) -> None:
+        now = bs.time()
+        self.modifiers.expire(now)
+        self.cooldowns.tick(now)
+
+    def get_sounds(self, name: str) -> tuple[bs.Sound, ...]:
+        """Get one of our sound groups, resolved for this activity."""
+        return SkillAssets.get().get_sounds(type(self), name)
 
     def get_skills_from_type(self, skill_type: Type[T]) -> list[T]:
         """Return a list with the character skills of the matching type provided."""
@@ -219,8 +249,66 @@ class BombgeonCharBase(spaz.Spaz):
 
     def _handle_movement(self) -> None: ...
 
+    @override
+    def equip_boxing_gloves(self) -> None:
+        super().equip_boxing_gloves()
+        self._suspend_character_punch()
+
+    @override
+    def _gloves_wear_off(self) -> None:
+        super()._gloves_wear_off()
+        if self._gloved_punch is not None:
+            self.add_modifier(
+                "_punch_power_scale", "character", mult=self._gloved_punch.mult
+            )
+            self._gloved_punch = None
+
+    def _suspend_character_punch(self) -> None:
+        # Gloves punch as hard as they do for everyone; they replace
+        # our character's punch power instead of stacking with it.
+        mod = self.modifiers.remove("_punch_power_scale", "character")
+        if mod is not None:
+            self._gloved_punch = mod
+
+    def interrupt_channels(self) -> None:
+        """Interrupt every channelled skill we have going."""
+        for channel in list(self._channels):
+            channel.interrupt()
+
+    def _revive(self, state: dict[str, Any]) -> None:
+        # (puts our base punch power back)
+        if self._has_boxing_gloves:
+            self._gloves_wear_off()
+        self.interrupt_channels()
+        self.modifiers.clear()
+        # the character registers its ticks again below.
+        for handle in self._character_handles:
+            handle.cancel()
+        super()._revive(state)
+        # character variables may hold nodes and timers of our last
+        # life, so define them anew.
+        self._run_character_init()
+        if self._has_boxing_gloves:
+            self._suspend_character_punch()
+        self.cooldowns = CooldownHUD(self)
+        self._skills = dict.fromkeys(_ChrBtn)
+        self._define_skills()
+
+    def _run_character_init(self) -> None:
+        self._character_handles: list[TickHandle] = []
+        if self._character_init is None:
+            return
+        before = dict(vars(self))
+        self._character_init()
+        self._character_handles = [
+            value
+            for key, value in vars(self).items()
+            if isinstance(value, TickHandle) and before.get(key) is not value
+        ]
+
     def on_expire(self) -> None:
         """Additional expire logic."""
+        self.interrupt_channels()
         # clear our skills to prevent any funny business.
         self._skills = {}
         return super().on_expire()
@@ -231,6 +319,9 @@ class BombgeonCharBase(spaz.Spaz):
     def handlemessage(self, msg):
         if self.custom_handlemessage(msg):
             return
+        if isinstance(msg, bs.DieMessage):
+            # dead men don't channel.
+            self.interrupt_channels()
         return super().handlemessage(msg)
 
 
@@ -244,6 +335,10 @@ class CharacterSkill:
 
     cooldown_time: float = 1.0
     """Cooldown time in seconds."""
+    icon: Optional[str] = None
+    """Name of the texture to use as our icon."""
+    sounds: dict[str, tuple[str, ...]] = {}
+    """Named groups of sounds we use, see ``get_sounds``."""
     texture_icon: bs.Texture = None
     """The icon to show"""
     show_cooldown: bool = False
@@ -251,6 +346,12 @@ class CharacterSkill:
 
     def __init__(self) -> None:
         self._last_use: float = -9999.9
+        if self.icon is not None:
+            self.texture_icon = SkillAssets.get().texture(self.icon)
+
+    def get_sounds(self, name: str) -> tuple[bs.Sound, ...]:
+        """Get one of our sound groups, resolved for this activity."""
+        return SkillAssets.get().get_sounds(type(self), name)
 
     def can_perform(self) -> bool:
         """A character has requested to use this ability, check
@@ -268,12 +369,233 @@ class CharacterSkill:
         """Perform this skill."""
 
 
+class SkillAssets:
+    """Textures and sounds declared by skills and characters,
+    resolved once per activity.
+
+    Skills list theirs in ``icon`` and ``sounds``; characters in
+    ``sounds``. The first ``SkillAssets.get()`` of an activity
+    resolves everything the roster declares, so skills never have to
+    look anything up when used.
+    """
+
+    _STORENAME = bs.storagename()
+
+    def __init__(self) -> None:
+        self._textures: dict[str, bs.Texture] = {}
+        self._sounds: dict[str, bs.Sound] = {}
+        self._groups: dict[tuple[type, str], tuple[bs.Sound, ...]] = {}
+        for entry in get_bombgeon_roster():
+            self.preload(entry.character)
+
+    @classmethod
+    def get(cls) -> SkillAssets:
+        """Return the shared asset cache, creating it if necessary."""
+        activity = bs.getactivity()
+        assets = activity.customdata.get(cls._STORENAME)
+        if assets is None:
+            assets = activity.customdata[cls._STORENAME] = SkillAssets()
+        assert isinstance(assets, SkillAssets)
+        return assets
+
+    def preload(self, character: type[BombgeonCharBase]) -> None:
+        """Resolve everything a character and its skills declare."""
+        owners: list[type] = [character]
+        for skill in (
+            character.skill_punch,
+            character.skill_grab,
+            character.skill_bomb,
+            character.skill_jump,
+        ):
+            if skill is not None:
+                owners.append(skill)
+        for owner in owners:
+            icon = getattr(owner, "icon", None)
+            if icon is not None:
+                self.texture(icon)
+            for name in owner.sounds:
+                self.get_sounds(owner, name)
+
+    def texture(self, name: str) -> bs.Texture:
+        """Get a texture by name."""
+        tex = self._textures.get(name)
+        if tex is None:
+            tex = self._textures[name] = bs.gettexture(name)
+        return tex
+
+    def sound(self, name: str) -> bs.Sound:
+        """Get a sound by name."""
+        sound = self._sounds.get(name)
+        if sound is None:
+            sound = self._sounds[name] = bs.getsound(name)
+        return sound
+
+    def get_sounds(self, owner: type, name: str) -> tuple[bs.Sound, ...]:
+        """Get a sound group declared by a skill or character type."""
+        key = (owner, name)
+        group = self._groups.get(key)
+        if group is None:
+            group = self._groups[key] = tuple(
+                self.sound(sound) for sound in owner.sounds[name]
+            )
+        return group
+
+
+DASH_IMPULSE_REPEATS = 50
+"""How many stacked impulses a dash is made of."""
+
+
+def _impulse(
+    node: bs.Node,
+    pos: Sequence[float],
+    magnitude: float,
+    velocity_magnitude: float,
+    direction: Sequence[float],
+) -> None:
+    node.handlemessage(
+        "impulse",
+        pos[0],
+        pos[1],
+        pos[2],
+        0,
+        25,
+        0,
+        magnitude,
+        velocity_magnitude,
+        0,
+        0,
+        direction[0],
+        direction[1],
+        direction[2],
+    )
+
+
+def apply_dash(
+    spaz: BombgeonCharBase,
+    direction: Optional[Sequence[float]],
+    strength: float,
+    lift: float = 0.0,
+    repeats: int = DASH_IMPULSE_REPEATS,
+) -> None:
+    """Shove a character around with ``repeats`` impulses of ``strength``.
+
+    ``lift`` gives a single upward hop first. A ``direction`` of None
+    follows the character's current horizontal velocity. The impulses
+    are sent one by one, exactly like the loops this replaced; whether
+    fewer, stronger impulses move a spaz the same way is up to the
+    engine's physics and hasn't been measured.
+    """
+    node = spaz.node
+    pos = node.position
+    if lift:
+        _impulse(node, pos, lift, 0.05, (0, 20 * 400, 0))
+    if direction is None:
+        vel = node.velocity
+        direction = (vel[0] * 15 * 2, 0, vel[2] * 15 * 2)
+    for _ in range(repeats):
+        _impulse(node, pos, strength, 0.05, direction)
+
+
+class ChannelledSkill(CharacterSkill):
+    """A skill that plays out over several ticks.
+
+    Driven by a single repeating timer: ``on_tick`` runs right away
+    and then every ``tick_interval`` seconds for ``tick_count`` ticks,
+    after which ``on_complete`` runs. If the caster dies, expires or
+    ``should_interrupt`` says so, ``on_interrupt`` runs instead and
+    the timer is dropped on the spot.
+    By default ``perform`` starts channelling right away.
+    """
+
+    tick_interval: float = 0.1
+    """Time between ticks in seconds."""
+    tick_count: int = 1
+    """How many ticks to run before completing."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._caster: Optional[weakref.ref[BombgeonCharBase]] = None
+        self._tick_index: int = 0
+        self._channel_timer: Optional[bs.Timer] = None
+
+    @property
+    def channelling(self) -> bool:
+        """Whether we're currently channelling."""
+        return self._channel_timer is not None
+
+    def perform(self, spaz: BombgeonCharBase) -> None:
+        self.channel(spaz)
+
+    def channel(self, spaz: BombgeonCharBase) -> None:
+        """Start channelling on a caster (interrupting any channel
+        already going)."""
+        if self.channelling:
+            self.interrupt()
+        self._caster = weakref.ref(spaz)
+        self._tick_index = 0
+        self._channel_timer = bs.Timer(
+            self.tick_interval, bs.WeakCall(self._step), repeat=True
+        )
+        spaz._channels.append(self)
+        self.on_start(spaz)
+        self._step()
+
+    def interrupt(self) -> None:
+        """Stop channelling early."""
+        spaz = self._stop()
+        if spaz is not None:
+            self.on_interrupt(spaz)
+
+    def should_interrupt(self, spaz: BombgeonCharBase) -> bool:
+        """Return whether the channel should be cut short."""
+        return not spaz.is_alive()
+
+    def on_start(self, spaz: BombgeonCharBase) -> None:
+        """Called when channelling starts, before the first tick."""
+
+    def on_tick(self, spaz: BombgeonCharBase, index: int) -> None:
+        """Called once per tick."""
+
+    def on_interrupt(self, spaz: BombgeonCharBase) -> None:
+        """Called when the channel is cut short."""
+
+    def on_complete(self, spaz: BombgeonCharBase) -> None:
+        """Called after the last tick went through."""
+
+    def _stop(self) -> Optional[BombgeonCharBase]:
+        if self._channel_timer is None:
+            return None
+        self._channel_timer = None
+        spaz = self._caster() if self._caster is not None else None
+        self._caster = None
+        if spaz is not None and self in spaz._channels:
+            spaz._channels.remove(self)
+        return spaz
+
+    def _step(self) -> None:
+        spaz = self._caster() if self._caster is not None else None
+        if spaz is None or spaz.expired or self.should_interrupt(spaz):
+            self.interrupt()
+            return
+        if self._tick_index >= self.tick_count:
+            self._stop()
+            self.on_complete(spaz)
+            return
+        index = self._tick_index
+        self._tick_index += 1
+        self.on_tick(spaz, index)
+
+
 # Write to BombSquad's spaz character with our own
 spaz.Spaz = BombgeonCharBase
 
 _LOGGING = True
 
 _BOMBGEON_CHARACTER_ENTRIES: list[BombgeonCharacterEntry] = []
+_BOMBGEON_CHARACTER_INDEX: dict[str, BombgeonCharacterEntry] = {}
+_BOMBGEON_CHARACTER_CLASSES: dict[
+    tuple[type[BombgeonCharBase], str], type[BombgeonCharBase]
+] = {}
 
 
 @dataclass
@@ -319,6 +641,8 @@ class BombgeonCharacterEntry:
             raise ValueError(f'"{self}" already registered.')
 
         _BOMBGEON_CHARACTER_ENTRIES.append(self)
+        # first come, first served (same as the old roster scan)
+        _BOMBGEON_CHARACTER_INDEX.setdefault(self.name, self)
         if _LOGGING:
             print('registered bombgeon char: "%s"', self)
 
@@ -328,11 +652,53 @@ def get_bombgeon_roster() -> list[BombgeonCharacterEntry]:
     return _BOMBGEON_CHARACTER_ENTRIES
 
 
+def get_bombgeon_character(name: str) -> BombgeonCharacterEntry:
+    """Get a registered bombgeon character by name."""
+    entry = _BOMBGEON_CHARACTER_INDEX.get(name)
+    if entry is None:
+        raise NameError(f'no bombgeon charbase matches for character "{name}"')
+    return entry
+
+
+def _compile_character_class(
+    base: type[BombgeonCharBase], entry: BombgeonCharacterEntry
+) -> type[BombgeonCharBase]:
+    """Build a real subclass of ``base`` carrying our character's
+    functions and variables.
+    """
+    attrs: dict[str, Any] = {}
+    for name, value in entry.character.__dict__.items():
+        if name.startswith("__"):
+            continue
+        attrs[name] = value
+    attrs["_character_attrs"] = tuple(attrs)
+    attrs["_character_init"] = entry.character.__dict__.get("__init__")
+    attrs["_character_compiled"] = True
+    attrs["__module__"] = entry.character.__module__
+    attrs["__doc__"] = entry.character.__doc__
+    return type(f"{entry.character.__name__}_{base.__name__}", (base,), attrs)
+
+
+def get_character_class(
+    base: type[BombgeonCharBase], character: str
+) -> type[BombgeonCharBase]:
+    """Get the precompiled class of a character for the provided base
+    (``PlayerSpaz``, a ``SpazBot`` type, etc.), building it once if needed.
+    """
+    key = (base, character)
+    cls = _BOMBGEON_CHARACTER_CLASSES.get(key)
+    if cls is None:
+        cls = _BOMBGEON_CHARACTER_CLASSES[key] = _compile_character_class(
+            base, get_bombgeon_character(character)
+        )
+    return cls
+
+
 def apply_bombgeon_roster():
     """Apply our bombgeon roster to the character roster."""
     assert bs.app.classic
     # bs.app.classic.spaz_appearances = {}
 
     for entry in get_bombgeon_roster():
-        assert entry.appearance is Appearance
+        assert isinstance(entry.appearance, (Appearance, BombgeonAppearance))
         bs.app.classic.spaz_appearances[entry.name] = entry.appearance
@@ -0,0 +1,102 @@
+"""Skill cooldown tracking and billboards for bombgeon characters."""
+
+from __future__ import annotations
+
+import heapq
+import weakref
+from typing import TYPE_CHECKING, Hashable, Optional
+
+import bascenev1 as bs
+
+if TYPE_CHECKING:
+    from bascenev1lib.actor.spaz import Spaz
+
+
+class CooldownHUD:
+    """Keeps track of a character's skill cooldowns and shows them on
+    its three mini billboards.
+
+    Cooldown ends are kept in a min-heap, so ``tick()`` (ran from the
+    character's regular tick) only has to peek at the top to flash the
+    billboard of whatever just came off cooldown; no timer per use.
+    Our spaz is only weakly referenced, since it holds on to us.
+    """
+
+    SLOTS = (1, 2, 3)
+    """Mini billboard slots our spaz node has."""
+
+    def __init__(self, spaz: Spaz) -> None:
+        self._spaz = weakref.ref(spaz)
+        self._ready_at: dict[Hashable, float] = {}
+        self._textures: dict[Hashable, Optional[bs.Texture]] = {}
+        self._pending: list[tuple[float, int, Hashable]] = []
+        self._counter = 0
+
+    def start(
+        self,
+        key: Hashable,
+        duration: float,
+        texture: Optional[bs.Texture] = None,
+        slot: Optional[int] = None,
+        now: Optional[float] = None,
+    ) -> None:
+        """Put ``key`` on cooldown for ``duration`` seconds.
+
+        With a ``slot``, the cooldown is also drawn on that mini
+        billboard and the billboard flashes ``texture`` once it's over.
+        """
+        if now is None:
+            now = bs.time()
+        ready_at = now + duration
+        self._ready_at[key] = ready_at
+        self._textures[key] = texture
+        if slot is None:
+            return
+        assert slot in self.SLOTS
+        self._counter += 1
+        heapq.heappush(self._pending, (ready_at, self._counter, key))
+        spaz = self._spaz()
+        if spaz is None or not spaz.node:
+            return
+        node = spaz.node
+        start_ms = now * 1000
+        setattr(node, f"mini_billboard_{slot}_texture", texture)
+        setattr(node, f"mini_billboard_{slot}_start_time", start_ms)
+        setattr(
+            node, f"mini_billboard_{slot}_end_time", start_ms + duration * 1000
+        )
+
+    def remaining(self, key: Hashable, now: Optional[float] = None) -> float:
+        """Return how many seconds ``key`` is still on cooldown for."""
+        ready_at = self._ready_at.get(key)
+        if ready_at is None:
+            return 0.0
+        if now is None:
+            now = bs.time()
+        return max(0.0, ready_at - now)
+
+    def is_ready(self, key: Hashable, now: Optional[float] = None) -> bool:
+        """Return whether ``key`` is off cooldown."""
+        return self.remaining(key, now) <= 0.0
+
+    def get_state(self, now: Optional[float] = None) -> dict[Hashable, float]:
+        """Return the remaining cooldown of everything we've tracked."""
+        if now is None:
+            now = bs.time()
+        return {key: self.remaining(key, now) for key in self._ready_at}
+
+    def tick(self, now: float) -> None:
+        """Flash the billboards of everything that came off cooldown."""
+        spaz = self._spaz()
+        if spaz is None:
+            return
+        pending = self._pending
+        while pending and pending[0][0] <= now:
+            ready_at, _, key = heapq.heappop(pending)
+            # the cooldown might've been restarted since.
+            if self._ready_at.get(key) != ready_at:
+                continue
+            texture = self._textures.get(key)
+            if texture is not None and spaz.node:
+                # pylint: disable=protected-access
+                spaz._flash_billboard(texture)
@@ -0,0 +1,146 @@
+"""Stat modifiers for bombgeon characters."""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+from dataclasses import dataclass
+from typing import Any, Hashable, Optional
+
+
+@dataclass
+class StatModifier:
+    """A single change to a stat.
+
+    The effective value of a stat is ``(base + sum(add)) * prod(mult)``.
+    """
+
+    add: float = 0.0
+    mult: float = 1.0
+    expires_at: Optional[float] = None
+
+
+class ModifierStack:
+    """Named additive/multiplicative modifiers on top of base stats.
+
+    Modifiers with a duration are kept in a min-heap by expiry time, so
+    expiring them is just peeking at the top of the heap. Effective
+    values are cached and only recalculated (from the base value, so
+    nothing drifts) when a stat's modifiers change.
+    """
+
+    def __init__(self) -> None:
+        self._base: dict[str, float] = {}
+        self._modifiers: dict[str, dict[Hashable, StatModifier]] = {}
+        self._effective: dict[str, float] = {}
+        self._expiry: list[tuple[float, int, str, Hashable]] = []
+        self._counter = itertools.count()
+
+    def get(self, stat: str) -> float:
+        """Return the effective value of a stat."""
+        value = self._effective.get(stat)
+        if value is None:
+            value = self._effective[stat] = self._calculate(stat)
+        return value
+
+    def get_base(self, stat: str) -> float:
+        """Return the base value of a stat."""
+        return self._base[stat]
+
+    def set_base(self, stat: str, value: float) -> None:
+        """Set the base value of a stat."""
+        self._base[stat] = value
+        self._effective.pop(stat, None)
+
+    def add(
+        self,
+        stat: str,
+        name: str,
+        add: float = 0.0,
+        mult: float = 1.0,
+        duration: Optional[float] = None,
+        now: float = 0.0,
+        stacking: bool = False,
+    ) -> Hashable:
+        """Add a modifier to a stat and return its key.
+
+        Adding a modifier with a name already in use replaces it,
+        unless ``stacking`` is set, in which case every application
+        counts separately. ``duration`` (seconds from ``now``) makes it
+        expire on its own; otherwise it stays until removed.
+        """
+        key: Hashable = (name, next(self._counter)) if stacking else name
+        expires_at = None if duration is None else now + duration
+        self._modifiers.setdefault(stat, {})[key] = StatModifier(
+            add, mult, expires_at
+        )
+        if expires_at is not None:
+            heapq.heappush(
+                self._expiry, (expires_at, next(self._counter), stat, key)
+            )
+        self._effective.pop(stat, None)
+        return key
+
+    def remove(self, stat: str, key: Hashable) -> Optional[StatModifier]:
+        """Remove a modifier by the key ``add()`` returned.
+
+        Returns the removed modifier, or None if it wasn't applied.
+        """
+        mods = self._modifiers.get(stat)
+        mod = mods.pop(key, None) if mods else None
+        if mod is not None:
+            self._effective.pop(stat, None)
+        return mod
+
+    def has(self, stat: str, key: Hashable) -> bool:
+        """Return whether a modifier is currently applied."""
+        return key in self._modifiers.get(stat, ())
+
+    def clear(self) -> None:
+        """Drop every modifier; base values stay as they are."""
+        self._modifiers.clear()
+        self._effective.clear()
+        self._expiry.clear()
+
+    def expire(self, now: float) -> None:
+        """Drop every modifier that has run out by ``now``."""
+        expiry = self._expiry
+        while expiry and expiry[0][0] <= now:
+            expires_at, _, stat, key = heapq.heappop(expiry)
+            mods = self._modifiers.get(stat)
+            if not mods:
+                continue
+            mod = mods.get(key)
+            # it might've been removed or re-applied in the meantime
+            if mod is None or mod.expires_at != expires_at:
+                continue
+            del mods[key]
+            self._effective.pop(stat, None)
+
+    def _calculate(self, stat: str) -> float:
+        value = self._base[stat]
+        mods = self._modifiers.get(stat)
+        if not mods:
+            return value
+        mult = 1.0
+        for mod in mods.values():
+            value += mod.add
+            mult *= mod.mult
+        return value * mult
+
+
+class ModifiedStat:
+    """Class attribute routing a character stat through its modifier
+    stack; reading gives the effective value, writing sets the base.
+    """
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+
+    def __get__(self, obj: Any, objtype: Optional[type] = None) -> Any:
+        if obj is None:
+            return self
+        return obj.modifiers.get(self.name)
+
+    def __set__(self, obj: Any, value: float) -> None:
+        obj.modifiers.set_base(self.name, value)
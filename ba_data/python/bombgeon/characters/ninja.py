@@ -4,11 +4,13 @@ from typing import Any
 import bascenev1 as bs
 
 from bascenev1lib.actor.bomb import Blast
+from bascenev1lib.actor.ticker import ActorTicker
 from .internal import (
     BombgeonCharBase,
     BombgeonAppearance,
     BombgeonCharacterEntry,
     CharacterSkill,
+    apply_dash,
 )
 
 import random
@@ -47,10 +49,10 @@ class TimeTravel(CharacterSkill):
 
     cooldown_time = 20
     show_cooldown = True
+    icon = 'backIcon'
 
     def __init__(self):
         super().__init__()
-        self.texture_icon = bs.gettexture('backIcon')
         self.ticks: int = 0
         self.tick_timer: bs.Timer = None
 
@@ -79,10 +81,10 @@ class Dash(CharacterSkill):
     def __init__(self):
         super().__init__()
         self.pos: list[float, float, float] = None
-        self.texture_icon = bs.gettexture('buttonBomb')
 
     cooldown_time = 5.3
     show_cooldown = True
+    icon = 'buttonBomb'
 
     def perform(self, spaz: BombgeonCharBase) -> None:
         def boom():
@@ -96,50 +98,14 @@ class Dash(CharacterSkill):
 
         self.pos = spaz.node.position
         bs.timer(0.3, boom)
-        xforce = 35
-        yforce = 5
-        spaz.node.handlemessage(
-                "impulse",
-                spaz.node.position[0],
-                spaz.node.position[1],
-                spaz.node.position[2],
-                0,
-                25,
-                0,
-                yforce,
-                0.05,
-                0,
-                0,
-                0,
-                20 * 400,
-                0,
-        )
-        v = spaz.node.velocity
-        for _ in range(50):
-            spaz.node.handlemessage(
-                    "impulse",
-                    spaz.node.position[0],
-                    spaz.node.position[1],
-                    spaz.node.position[2],
-                    0,
-                    25,
-                    0,
-                    xforce,
-                    0.05,
-                    0,
-                    0,
-                    v[0] * 15 * 2,
-                    0,
-                    v[2] * 15 * 2,
-            )
-
+        apply_dash(spaz, None, 35, lift=5)
 
 
 class NinjaCharacter(BombgeonCharBase):
     """Spaz character."""
 
     # Rule of thumb: Don't use ``super().*``; instead, run ``BombgeonCharBase.*(self)``.
-    # We inject character-based functions on runtime and python doesn't like that a lot.
+    # Our functions get copied onto precompiled classes and python doesn't like that a lot.
     health = 450
     shields = 200
     armor = 50
@@ -155,11 +121,13 @@ class NinjaCharacter(BombgeonCharBase):
         # To define character specific variables, do ``def __init__(self)``
         # without calling anything but your own variables, and the system
         # will handle it accordingly.
-        self._punch_power_scale *= 1.1
+        self.add_modifier("_punch_power_scale", "character", mult=1.1)
         # pos, hp, shields, and armor
         self.positions: list[tuple[float, float, float], int, int, int] = []
         self.stepping_timer: bs.Timer | None = None
-        bs.timer(0.1, self.save_position, repeat=True)
+        self._save_position_handle = ActorTicker.get().register(
+            self.save_position, 0.1
+        )
 
     def teleport(self):
         if not self.positions or not self.exists() or self.stepping_timer:
@@ -76,7 +76,7 @@ class SpazCharacter(BombgeonCharBase):
     """Spaz character."""
 
     # Rule of thumb: Don't use ``super().*``; instead, run ``BombgeonCharBase.*(self)``.
-    # We inject character-based functions on runtime and python doesn't like that a lot.
+    # Our functions get copied onto precompiled classes and python doesn't like that a lot.
     health = 1000
     shields = 400
     armor = 150
@@ -92,7 +92,7 @@ class SpazCharacter(BombgeonCharBase):
         # To define character specific variables, do ``def __init__(self)``
         # without calling anything but your own variables, and the system
         # will handle it accordingly.
-        self._punch_power_scale *= 0.8
+        self.add_modifier("_punch_power_scale", "character", mult=0.8)
         self.bomb_type = "normal_modified"
 
     def handle_death(self, msg) -> None:
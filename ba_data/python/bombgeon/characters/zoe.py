@@ -70,7 +70,7 @@ class ZoeCharacter(BombgeonCharBase):
     """Zoe character."""
 
     # Rule of thumb: Don't use ``super().*``; instead, run ``BombgeonCharBase.*(self)``.
-    # We inject character-based functions on runtime and python doesn't like that a lot.
+    # Our functions get copied onto precompiled classes and python doesn't like that a lot.
     health = 1000
     shields = 200
     armor = 0
@@ -86,7 +86,7 @@ class ZoeCharacter(BombgeonCharBase):
         # To define character specific variables, do ``def __init__(self)``
         # without calling anything but your own variables, and the system
         # will handle it accordingly.
-        self._punch_power_scale *= 0.7
+        self.add_modifier("_punch_power_scale", "character", mult=0.7)
         self.bomb_type = 'healing_bomb'
         self.bomb_count = 5
 